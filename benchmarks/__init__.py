@@ -0,0 +1,6 @@
+"""
+Benchmarks de GimmeLetter sobre bibliotecas sintéticas
+
+    python -m benchmarks.bench_data                      # 1k, 10k y 100k canciones
+    python -m benchmarks.bench_data --sizes 1000,10000 --save-baseline
+"""
@@ -0,0 +1,131 @@
+"""
+Benchmarks de la capa de datos sobre bibliotecas sintéticas de 1k, 10k y 100k canciones
+
+Mide la apertura de la base (migraciones y análisis pendiente), las
+lecturas de canciones y sets, las búsquedas por acordes y progresiones, la
+exportación, la importación (sin conflictos: el costo es buscar títulos
+parecidos en toda la biblioteca) y la transposición.
+
+    python -m benchmarks.bench_data
+    python -m benchmarks.bench_data --sizes 1000,10000 --save-baseline
+    python -m benchmarks.bench_data --sizes 1000,10000      # compara con la línea base
+
+Sale con código 1 si alguna mediana empeoró más que la tolerancia.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+from types import SimpleNamespace
+
+from src.database.db_manager import DatabaseManager
+from src.ui.import_export_handler import ImportExportHandler
+from src.utils.chord_transposer import ChordTransposer
+from src.utils.import_export import export_songs_to_json, export_sets_to_json, save_json_to_file
+
+from . import timing
+from .synthetic_library import DEFAULT_SEED, SIZES, copy_library, songs_payload, sets_payload
+
+
+SUITE = "data"
+SET_SAMPLE = 50
+TRANSPOSE_SAMPLE = 500
+# La importación compara cada título con toda la biblioteca: lotes chicos para que 100k sea viable
+IMPORT_SONGS = 10
+IMPORT_SETS = 1
+
+
+def open_db(path: str) -> DatabaseManager:
+    db = DatabaseManager(path)
+    db.query_stats.slow_query_ms = float('inf')  # Sin registro de consultas lentas en ~/gimmeletter_logs
+    return db
+
+
+def run_size(song_count: int, seed: int, directory: str) -> dict:
+    """Todas las mediciones sobre una biblioteca"""
+    path = copy_library(song_count, directory, seed)
+    results = {}
+
+    def record(name, func, **kwargs):
+        results[name] = timing.measure(func, **kwargs)
+        print(f"  {name:<32} {results[name]['median_ms']:>10.2f} ms  ({results[name]['runs']} veces)")
+
+    record("db_init", lambda: open_db(path).close())
+
+    db = open_db(path)
+    songs = db.get_all_songs()
+    sets = db.get_all_sets()
+    rng = random.Random(seed)
+
+    record("get_all_songs", db.get_all_songs)
+    record("get_all_sets", db.get_all_sets)
+    sample_sets = rng.sample(sets, min(SET_SAMPLE, len(sets)))
+    record(f"get_set_songs_x{len(sample_sets)}", lambda: [db.get_set_songs(s.id) for s in sample_sets])
+
+    record("search_all_chords", lambda: db.find_songs_with_all_chords(["Am", "F", "C", "G"]))
+    record("search_all_chords_any_key", lambda: db.find_songs_with_all_chords(["Am", "F", "C"], any_key=True))
+    record("search_only_chords_any_key",
+           lambda: db.find_songs_with_only_chords(["C", "Dm", "Em", "F", "G", "Am"], any_key=True))
+    record("search_progression", lambda: db.find_songs_by_progression("I V vi IV"))
+
+    export_path = os.path.join(directory, "export.json")
+    record("export_songs", lambda: save_json_to_file(export_songs_to_json(db.get_all_songs()), export_path))
+    record("export_sets", lambda: save_json_to_file(export_sets_to_json(db.get_all_sets(), db), export_path))
+
+    sample_songs = rng.sample(songs, min(TRANSPOSE_SAMPLE, len(songs)))
+    record(f"transpose_text_x{len(sample_songs)}", lambda: [
+        ChordTransposer.transpose_text(song.lyrics_with_chords, 2, song.notation == "latin", song.line_kinds)
+        for song in sample_songs
+    ])
+    record(f"transpose_text_classify_x{len(sample_songs)}", lambda: [
+        ChordTransposer.transpose_text(song.lyrics_with_chords, 2, song.notation == "latin")
+        for song in sample_songs
+    ])
+
+    db.close()
+
+    # Importaciones: cada ejecución sobre una copia recién restaurada de la biblioteca (si no,
+    # crecería entre ejecuciones). El manejador solo necesita la lista de canciones de la
+    # ventana principal, leída de esa copia.
+    new_songs = songs_payload(IMPORT_SONGS, seed)
+    new_sets = sets_payload(IMPORT_SETS, songs, seed)
+    fresh = {}
+
+    def restore_library():
+        copy_library(song_count, directory, seed)
+        fresh['db'] = open_db(path)
+        fresh['handler'] = ImportExportHandler(SimpleNamespace(songs=fresh['db'].get_all_songs()), fresh['db'])
+
+    def close_library(_):
+        fresh.pop('db').close()
+
+    record(f"import_songs_x{IMPORT_SONGS}", lambda: fresh['handler'].add_imported_songs(new_songs),
+           setup=restore_library, teardown=close_library, max_runs=3)
+    record(f"import_sets_x{IMPORT_SETS}", lambda: fresh['handler'].add_imported_sets(new_sets),
+           setup=restore_library, teardown=close_library, max_runs=3)
+
+    os.remove(path)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(str(size) for size in SIZES),
+                        help="Tamaños de biblioteca separados por comas")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    timing.add_arguments(parser, SUITE)
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = timing.new_results(SUITE, seed=args.seed, sizes=sizes)
+    with tempfile.TemporaryDirectory(prefix="gimmeletter_bench_") as directory:
+        for size in sizes:
+            print(f"Biblioteca de {size} canciones")
+            results['results'][str(size)] = run_size(size, args.seed, directory)
+    return timing.finish(results, args, SUITE)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
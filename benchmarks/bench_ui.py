@@ -0,0 +1,271 @@
+"""
+Benchmarks de la interfaz sin pantalla (plataforma offscreen de Qt)
+
+Abre MainWindow, SetManagerDialog, SongPreviewDialog y PlayerWindow sobre
+las mismas bibliotecas sintéticas que bench_data y mide lo que espera el
+usuario: desde crear una ventana hasta que se pinta, repoblar las listas
+(load_data), cada tecla del buscador (filter_songs) y el cambio de canción
+en el reproductor (con los maquetados preparados en tiempo ocioso y sin
+ellos; si el cambio sin preparar resulta más rápido, avisa que la medición
+no es confiable).
+
+La aplicación corre con un home temporal: la biblioteca se copia como su
+base de datos y la configuración no toca la del usuario.
+
+    python -m benchmarks.bench_ui --sizes 1000,10000
+    python -m benchmarks.bench_ui --save-baseline
+
+Sale con código 1 si alguna mediana empeoró más que la tolerancia.
+"""
+
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse
+import gc
+import shutil
+import sys
+import tempfile
+import time
+
+from PyQt6.QtCore import QCoreApplication, QEvent, QEventLoop, QObject, QSettings
+from PyQt6.QtWidgets import QApplication, QWidget
+
+from src.ui.main_window import MainWindow
+from src.ui.player_window import PlayerWindow
+from src.ui.set_manager import SetManagerDialog
+from src.ui.song_preview import SongPreviewDialog
+from src.utils.timing_map import TimingMap
+
+from . import timing
+from .synthetic_library import DEFAULT_SEED, SIZES, cached_library
+
+
+SUITE = "ui"
+# Lo que se escribe en el buscador (y se borra), una medición por tecla
+SEARCH_QUERY = "luna"
+SEARCH_PASSES = 3
+# Cambios de canción por variante y tiempo ocioso entre uno y otro (para el prefetch)
+SONG_SWITCHES = 12
+IDLE_MS = 150
+PAINT_TIMEOUT_S = 60
+
+
+class PaintProbe(QObject):
+    """Avisa cuando un widget recibió su primer evento de pintado"""
+
+    def __init__(self, widget: QWidget):
+        super().__init__(widget)
+        self.painted = False
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            self.painted = True
+        return False
+
+
+def wait_for_paint(probe: PaintProbe):
+    deadline = time.perf_counter() + PAINT_TIMEOUT_S
+    while not probe.painted:
+        if time.perf_counter() > deadline:
+            raise TimeoutError("La ventana no se pintó")
+        QApplication.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 10)
+
+
+def process_for(milliseconds: int):
+    """Deja correr el event loop (tiempo ocioso)"""
+    deadline = time.perf_counter() + milliseconds / 1000
+    while time.perf_counter() < deadline:
+        QApplication.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 10)
+
+
+def show_painted(widget: QWidget, painted: QWidget = None) -> QWidget:
+    """Muestra la ventana y espera hasta que se pinte (painted: el widget que tiene que aparecer)"""
+    probe = PaintProbe(painted or widget)
+    widget.show()
+    wait_for_paint(probe)
+    return widget
+
+
+def dispose(widget: QWidget):
+    widget.close()
+    widget.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+
+
+def use_library(home: str, song_count: int, seed: int):
+    """Pone la biblioteca como base de datos del home temporal"""
+    shutil.copyfile(cached_library(song_count, seed), os.path.join(home, "gimmeletter.db"))
+
+
+def open_main_window() -> MainWindow:
+    window = MainWindow()
+    window.db.query_stats.slow_query_ms = float('inf')  # Sin registro de consultas lentas
+    return window
+
+
+def run_size(song_count: int, seed: int, home: str) -> dict:
+    """Todas las mediciones sobre una biblioteca"""
+    use_library(home, song_count, seed)
+    results = {}
+
+    def record(name, result):
+        results[name] = result
+        print(f"  {name:<32} {result['median_ms']:>10.2f} ms  ({result['runs']} veces)")
+
+    def first_main_window():
+        window = open_main_window()
+        return show_painted(window, window.songs_list.viewport())
+
+    record("main_window_first_paint", timing.measure(first_main_window, teardown=dispose, max_runs=3))
+
+    window = show_painted(open_main_window())
+    process_for(IDLE_MS)
+
+    record("load_data", timing.measure(lambda: (window.load_data(), QApplication.processEvents())))
+
+    keystrokes = []
+    for _ in range(SEARCH_PASSES):
+        texts = [SEARCH_QUERY[:length] for length in range(1, len(SEARCH_QUERY) + 1)]
+        texts += [SEARCH_QUERY[:length] for length in range(len(SEARCH_QUERY) - 1, -1, -1)]
+        for text in texts:
+            start = time.perf_counter()
+            window.song_search.setText(text)
+            QApplication.processEvents()
+            keystrokes.append((time.perf_counter() - start) * 1000)
+    record("filter_songs_keystroke", timing.summarize(keystrokes))
+
+    set_obj = max(window.sets, key=lambda s: len(window.db.get_set_song_entries(s.id)))
+    record("set_dialog_new_open", timing.measure(
+        lambda: show_painted(SetManagerDialog(window, window.db)), teardown=dispose
+    ))
+    record("set_dialog_edit_open", timing.measure(
+        lambda: show_painted(SetManagerDialog(window, window.db, set_obj)), teardown=dispose
+    ))
+
+    song = window.db.get_song(window.songs[len(window.songs) // 2].id)
+    record("song_preview_open", timing.measure(
+        lambda: show_painted(SongPreviewDialog(window, song, window.settings)), teardown=dispose
+    ))
+
+    # Reproductor con el set más largo (mismas entradas que arma MainWindow.play_set)
+    set_songs = [
+        {
+            'song_id': row['song_id'],
+            'title': row['title'],
+            'artist': row['artist'],
+            'scroll_speed': row['scroll_speed'],
+            'transposition': row['transposition'],
+            'set_song_id': row['set_song_id'],
+            'timing_map': TimingMap.decode(row['timing_map'])
+        }
+        for row in window.db.get_set_song_entries(set_obj.id)
+    ]
+
+    def open_player():
+        player = PlayerWindow(window, set_songs, set_obj.name, window.settings, window.db.get_song)
+        return show_painted(player, player.lyrics_display.viewport())
+
+    record("player_first_paint", timing.measure(open_player, teardown=dispose, max_runs=3))
+
+    player = open_player()
+    warm = switch_songs(player)
+    record("player_song_switch", warm)
+    player.prefetcher.pause()
+    cold = switch_songs(player, cold=True)
+    record("player_song_switch_cold", cold)
+    dispose(player)
+    if cold['median_ms'] < warm['median_ms']:
+        # Con las siguientes ya preparadas, cambiar no puede costar más que armarlas en el momento
+        print(f"  AVISO: el cambio sin preparar ({cold['median_ms']:.2f} ms) fue más rápido que "
+              f"con el prefetch ({warm['median_ms']:.2f} ms); la medición no es confiable",
+              file=sys.stderr)
+
+    dispose(window)
+    return results
+
+
+def switch_songs(player: PlayerWindow, cold: bool = False) -> dict:
+    """
+    Tiempo desde pedir la siguiente canción hasta que se pinta
+
+    Normalmente hay tiempo ocioso entre cambios para que el prefetch prepare la
+    siguiente (se espera a que termine); con cold=True se descartan los textos, los
+    maquetados y las canciones cargadas (salvo la actual), así cada cambio lee la
+    canción de la base, la transpone y la maqueta en el momento.
+
+    La preparación de las vecinas, que arranca después del paint, queda fuera de
+    la medición: el prefetch se pausa mientras se mide y se retoma al terminar.
+    """
+    prefetcher = player.prefetcher
+    times = []
+    for _ in range(SONG_SWITCHES):
+        if cold:
+            prefetcher.clear()
+            for index, song_config in enumerate(player.set_songs):
+                if index != player.current_index:
+                    song_config.pop('song', None)
+        else:
+            process_for(IDLE_MS)
+            wait_for_prefetch(prefetcher)
+        was_paused = prefetcher.paused
+        prefetcher.pause()
+        probe = PaintProbe(player.lyrics_display.viewport())
+        start = time.perf_counter()
+        if player.current_index == len(player.set_songs) - 1:
+            player.current_index = 0
+            player.load_song()
+        else:
+            player.next_song()
+        wait_for_paint(probe)
+        times.append((time.perf_counter() - start) * 1000)
+        probe.deleteLater()
+        if not was_paused:
+            prefetcher.resume()
+    return timing.summarize(times)
+
+
+def wait_for_prefetch(prefetcher):
+    """Deja correr el event loop hasta que el prefetch preparó todo lo pendiente"""
+    deadline = time.perf_counter() + PAINT_TIMEOUT_S
+    while not prefetcher.idle:
+        if time.perf_counter() > deadline:
+            raise TimeoutError("El prefetch no terminó")
+        QApplication.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 10)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(str(size) for size in SIZES),
+                        help="Tamaños de biblioteca separados por comas")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    timing.add_arguments(parser, SUITE)
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = timing.new_results(
+        SUITE, seed=args.seed, sizes=sizes, qt_platform=os.environ.get("QT_QPA_PLATFORM")
+    )
+    home = tempfile.mkdtemp(prefix="gimmeletter_bench_ui_")
+    os.environ["HOME"] = home
+    QSettings.setPath(QSettings.Format.NativeFormat, QSettings.Scope.UserScope, home)
+    QSettings.setPath(QSettings.Format.IniFormat, QSettings.Scope.UserScope, home)
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    try:
+        for size in sizes:
+            print(f"Biblioteca de {size} canciones")
+            results['results'][str(size)] = run_size(size, args.seed, home)
+    finally:
+        # Los QSettings de las ventanas escriben al destruirse: antes de borrar el home se
+        # liberan las conexiones de PyQt (se borran con deleteLater) y con ellas las ventanas
+        QApplication.processEvents()
+        QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+        gc.collect()
+        shutil.rmtree(home, ignore_errors=True)
+    return timing.finish(results, args, SUITE)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""
+Generador de bibliotecas sintéticas (reproducible con una semilla)
+
+Las canciones imitan las reales: secciones marcadas de distintas formas,
+líneas de acordes alineadas sobre la letra, progresiones diatónicas en las
+12 tonalidades (mayores y menores), séptimas, sus y bajos, y un tercio en
+notación latina. Los sets tienen entre 8 y 20 canciones con su velocidad y
+transposición.
+
+Como generar 100k canciones lleva un rato, cada biblioteca se guarda en
+benchmarks/.cache y las mediciones trabajan sobre copias.
+"""
+
+import os
+import random
+import shutil
+from typing import Dict, Iterator, List
+
+from src.database.db_manager import DatabaseManager
+from src.database.models import Song, Set, SetSong
+from src.utils.chord_transposer import ChordTransposer
+from src.utils.song_analysis import ANALYSIS_VERSION
+
+
+# Cambiar si cambia lo que se genera, para no reutilizar bibliotecas viejas del caché
+GENERATOR_VERSION = 1
+DEFAULT_SEED = 1234
+SIZES = (1_000, 10_000, 100_000)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+LATIN_SHARE = 0.3
+MINOR_SHARE = 0.3
+
+# Grados (semitonos desde la tónica, es menor) de las progresiones habituales
+MAJOR_PROGRESSIONS = (
+    ((0, False), (7, False), (9, True), (5, False)),    # I V vi IV
+    ((9, True), (5, False), (0, False), (7, False)),    # vi IV I V
+    ((0, False), (9, True), (5, False), (7, False)),    # I vi IV V
+    ((2, True), (7, False), (0, False), (0, False)),    # ii V I I
+    ((0, False), (5, False), (7, False), (5, False)),   # I IV V IV
+    ((0, False), (4, True), (5, False), (7, False)),    # I iii IV V
+)
+MINOR_PROGRESSIONS = (
+    ((0, True), (8, False), (3, False), (10, False)),   # i VI III VII
+    ((0, True), (5, True), (7, True), (0, True)),       # i iv v i
+    ((0, True), (10, False), (8, False), (7, False)),   # i VII VI V
+    ((0, True), (3, False), (10, False), (5, True)),    # i III VII iv
+)
+EXTENSIONS = ("", "", "", "", "7", "maj7", "sus4", "add9")
+
+WORDS = (
+    "amor corazón noche luna sol camino tiempo vida mar cielo fuego viento "
+    "calle ciudad sueño silencio canción guitarra lluvia estrella puerto río "
+    "quiero siento vuelvo canto espero busco llevo miro nunca siempre "
+    "contigo sin ti hoy mañana ayer aquí lejos cerca todo nada "
+    "love night heart road home light fire rain dream river "
+    "never always tonight forever again away alone together"
+).split()
+SECTION_NAMES = ("Intro", "Verso 1", "Pre-coro", "Coro", "Verso 2", "Coro", "Puente", "Coro", "Outro")
+FIRST_NAMES = "Ana Luis Carla Diego Sofía Martín Lucía Pablo Julia Tomás Elena Bruno".split()
+LAST_NAMES = "García Pérez Torres Ríos Vega Molina Castro Rojas Suárez Navarro Silva Ortiz".split()
+SYLLABLES = "ka zu vor mel thi ran qua dox lep vin sor gal bex tum nir wof".split()
+
+
+def _chord(rng: random.Random, key: int, degree: int, minor: bool, use_latin: bool) -> str:
+    notes = ChordTransposer.NOTES_LATIN if use_latin else ChordTransposer.NOTES_ENGLISH
+    root = (key + degree) % 12
+    name = notes[root] + ("m" if minor else "")
+    extension = rng.choice(EXTENSIONS)
+    if minor and extension in ("maj7", "sus4"):
+        extension = "7"
+    name += extension
+    if rng.random() < 0.05:
+        name += "/" + notes[(root + 4 if not minor else root + 3) % 12]
+    return name
+
+
+def _lyric_line(rng: random.Random) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(5, 9))]
+    words[0] = words[0].capitalize()
+    return " ".join(words)
+
+
+def _chords_over(rng: random.Random, lyric: str, chords: List[str]) -> str:
+    """Línea de acordes con cada acorde sobre el comienzo de una palabra de la letra"""
+    starts = [0] + [i + 1 for i, char in enumerate(lyric) if char == " "]
+    positions = sorted(rng.sample(starts, min(len(chords), len(starts))))
+    line = ""
+    for position, chord in zip(positions, chords):
+        line += " " * max(position - len(line), 1 if line else 0) + chord
+    return line
+
+
+def _section_header(rng: random.Random, name: str) -> str:
+    style = rng.random()
+    if style < 0.6:
+        return f"[{name}]"
+    if style < 0.85:
+        return f"{name}:"
+    return f"({name})"
+
+
+def generate_song(rng: random.Random, index: int, artists: List[str]) -> Song:
+    """Una canción con letra y acordes"""
+    use_latin = rng.random() < LATIN_SHARE
+    minor = rng.random() < MINOR_SHARE
+    key = rng.randrange(12)
+    progressions = MINOR_PROGRESSIONS if minor else MAJOR_PROGRESSIONS
+    verse = rng.choice(progressions)
+    chorus = rng.choice(progressions)
+
+    lines = []
+    for name in SECTION_NAMES:
+        if name in ("Pre-coro", "Puente") and rng.random() < 0.5:
+            continue
+        lines.append(_section_header(rng, name))
+        progression = chorus if name == "Coro" else verse
+        chords = [_chord(rng, key, degree, is_minor, use_latin) for degree, is_minor in progression]
+        if name in ("Intro", "Outro"):
+            lines.append("   ".join(chords))
+        else:
+            for line_index in range(4):
+                lyric = _lyric_line(rng)
+                half = chords[:2] if line_index % 2 == 0 else chords[2:]
+                lines.append(_chords_over(rng, lyric, half))
+                lines.append(lyric)
+        lines.append("")
+
+    notes = ChordTransposer.NOTES_LATIN if use_latin else ChordTransposer.NOTES_ENGLISH
+    title_words = [rng.choice(WORDS) for _ in range(rng.randint(2, 4))]
+    return Song(
+        title=" ".join(title_words).capitalize(),
+        artist=artists[index % len(artists)],
+        original_key=notes[key] + ("m" if minor else ""),
+        lyrics_with_chords="\n".join(lines),
+        bpm=rng.randint(60, 180),
+        default_scroll_speed=rng.randint(30, 90)
+    )
+
+
+def generate_artists(rng: random.Random, count: int = 500) -> List[str]:
+    return [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}" for _ in range(count)]
+
+
+def generate_songs(count: int, seed: int = DEFAULT_SEED) -> Iterator[Song]:
+    rng = random.Random(seed)
+    artists = generate_artists(rng)
+    for index in range(count):
+        yield generate_song(rng, index, artists)
+
+
+def set_count_for(song_count: int) -> int:
+    """Cantidad de sets de una biblioteca (uno cada 50 canciones, al menos 10)"""
+    return max(10, song_count // 50)
+
+
+def build_library(path: str, song_count: int, seed: int = DEFAULT_SEED) -> str:
+    """Crea la base de datos de una biblioteca sintética con sus canciones y sets"""
+    if os.path.exists(path):
+        os.remove(path)
+    db = DatabaseManager(path)
+    # Solo para generar: sin fsync en cada commit
+    db.connection.execute("PRAGMA synchronous = OFF")
+    db.connection.execute("PRAGMA journal_mode = MEMORY")
+    song_ids = [db.add_song(song) for song in generate_songs(song_count, seed)]
+
+    rng = random.Random(seed + 1)
+    for set_index in range(set_count_for(song_count)):
+        set_obj = Set(name=f"Set {set_index + 1}: {rng.choice(WORDS)} {rng.choice(WORDS)}")
+        set_id = set_obj.id = db.add_set(set_obj)
+        chosen = rng.sample(song_ids, rng.randint(8, 20))
+        db.update_set(set_obj, [
+            SetSong(
+                set_id=set_id,
+                song_id=song_id,
+                order=order,
+                scroll_speed=rng.randint(30, 90),
+                transposition=rng.randint(-3, 3)
+            )
+            for order, song_id in enumerate(chosen)
+        ])
+    db.close()
+    return path
+
+
+def cached_library(song_count: int, seed: int = DEFAULT_SEED) -> str:
+    """Ruta de la biblioteca en el caché (la genera si no existe)"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    name = f"library_{song_count}_s{seed}_g{GENERATOR_VERSION}_a{ANALYSIS_VERSION}.db"
+    path = os.path.join(CACHE_DIR, name)
+    if not os.path.exists(path):
+        partial = path + ".partial"
+        build_library(partial, song_count, seed)
+        os.replace(partial, path)
+    return path
+
+
+def copy_library(song_count: int, directory: str, seed: int = DEFAULT_SEED) -> str:
+    """Copia de trabajo de la biblioteca (las mediciones que escriben no tocan el caché)"""
+    path = os.path.join(directory, f"library_{song_count}.db")
+    shutil.copyfile(cached_library(song_count, seed), path)
+    return path
+
+
+def unique_title(rng: random.Random) -> str:
+    """Título inventado que no se parece a los de la biblioteca (las importaciones no generan conflictos)"""
+    return " ".join(
+        "".join(rng.choice(SYLLABLES) for _ in range(3)) for _ in range(3)
+    ).capitalize()
+
+
+def songs_payload(count: int, seed: int = DEFAULT_SEED) -> List[Dict]:
+    """Canciones nuevas como las trae un archivo exportado"""
+    rng = random.Random(seed + 2)
+    payload = []
+    for song in generate_songs(count, seed + 3):
+        payload.append({
+            'title': unique_title(rng),
+            'artist': song.artist,
+            'lyrics_with_chords': song.lyrics_with_chords,
+            'bpm': song.bpm,
+            'original_key': song.original_key,
+            'default_scroll_speed': song.default_scroll_speed
+        })
+    return payload
+
+
+def sets_payload(set_count: int, existing: List[Song], seed: int = DEFAULT_SEED) -> List[Dict]:
+    """Sets exportados: la mitad de sus canciones ya están en la biblioteca y la otra mitad son nuevas"""
+    rng = random.Random(seed + 4)
+    new_songs = iter(songs_payload(set_count * 10, seed + 5))
+    payload = []
+    for set_index in range(set_count):
+        songs = []
+        for order in range(10):
+            if order % 2 == 0:
+                song = rng.choice(existing)
+                song_dict = {
+                    'title': song.title,
+                    'artist': song.artist,
+                    'lyrics_with_chords': song.lyrics_with_chords,
+                    'bpm': song.bpm,
+                    'original_key': song.original_key,
+                    'default_scroll_speed': song.default_scroll_speed
+                }
+            else:
+                song_dict = next(new_songs)
+            songs.append({
+                **song_dict,
+                'scroll_speed': rng.randint(30, 90),
+                'transposition': rng.randint(-3, 3),
+                'song_order': order
+            })
+        payload.append({'name': f"Importado {set_index + 1}", 'songs': songs})
+    return payload
@@ -0,0 +1,146 @@
+"""
+Medición, resultados en JSON y comparación contra una línea base
+"""
+
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+# Una medición se repite hasta MAX_RUNS veces o hasta gastar BUDGET_S segundos (al menos MIN_RUNS)
+MIN_RUNS = 1
+MAX_RUNS = 7
+BUDGET_S = 2.0
+# Por defecto, más de un 25 % y más de 1 ms por encima de la línea base es una regresión
+DEFAULT_TOLERANCE = 0.25
+NOISE_FLOOR_MS = 1.0
+
+
+def measure(func: Callable[[], object], setup: Optional[Callable[[], None]] = None,
+            teardown: Optional[Callable[[object], None]] = None,
+            max_runs: int = MAX_RUNS, budget_s: float = BUDGET_S) -> Dict[str, float]:
+    """
+    Tiempos de varias ejecuciones de func
+
+    setup corre antes de cada una y teardown (con lo que devolvió func) después,
+    los dos fuera de la medición.
+    """
+    times: List[float] = []
+    started = time.perf_counter()
+    while len(times) < max_runs and (len(times) < MIN_RUNS or time.perf_counter() - started < budget_s):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        result = func()
+        times.append((time.perf_counter() - start) * 1000)
+        if teardown is not None:
+            teardown(result)
+    return summarize(times)
+
+
+def summarize(times: List[float]) -> Dict[str, float]:
+    """Resumen de una serie de tiempos en ms"""
+    return {
+        'median_ms': round(statistics.median(times), 3),
+        'min_ms': round(min(times), 3),
+        'runs': len(times),
+    }
+
+
+def new_results(suite: str, **info) -> Dict:
+    """Resultados vacíos con los datos de la máquina (para saber si una comparación tiene sentido)"""
+    return {
+        'suite': suite,
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'machine': platform.node(),
+        **info,
+        'results': {},
+    }
+
+
+def default_output(suite: str) -> str:
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    return os.path.join(RESULTS_DIR, f"{suite}_{datetime.now():%Y%m%d-%H%M%S}.json")
+
+
+def save(results: Dict, path: str):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+def load(path: str) -> Optional[Dict]:
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def compare(current: Dict, baseline: Dict,
+            tolerance: float = DEFAULT_TOLERANCE) -> Tuple[List[str], List[str]]:
+    """
+    Compara las medianas contra la línea base
+
+    Returns:
+        (líneas del informe, mediciones que empeoraron)
+    """
+    lines = [f"Línea base: {baseline.get('date')} en {baseline.get('machine')} ({baseline.get('platform')})"]
+    regressions = []
+    for size, benchmarks in current['results'].items():
+        for name, result in benchmarks.items():
+            reference = baseline['results'].get(size, {}).get(name)
+            label = f"{size:>7} {name}"
+            if reference is None:
+                lines.append(f"  {label:<40} {result['median_ms']:>10.2f} ms   (sin línea base)")
+                continue
+            ratio = result['median_ms'] / reference['median_ms'] if reference['median_ms'] else 1.0
+            worse = (ratio > 1 + tolerance
+                     and result['median_ms'] - reference['median_ms'] > NOISE_FLOOR_MS)
+            if worse:
+                regressions.append(label.strip())
+            lines.append(
+                f"  {label:<40} {result['median_ms']:>10.2f} ms   "
+                f"{reference['median_ms']:>10.2f} ms   {ratio:>5.2f}x{'   ← REGRESIÓN' if worse else ''}"
+            )
+    return lines, regressions
+
+
+def add_arguments(parser, suite: str):
+    """Opciones comunes de las suites"""
+    parser.add_argument("--output", help="Archivo de resultados (por defecto benchmarks/results/)")
+    parser.add_argument(
+        "--baseline", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), f"baseline_{suite}.json"),
+        help="Línea base contra la que comparar"
+    )
+    parser.add_argument("--save-baseline", action="store_true", help="Guarda estos resultados como línea base")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Empeoramiento tolerado (0.25 = 25 %%)")
+
+
+def finish(results: Dict, args, suite: str) -> int:
+    """Guarda los resultados, compara con la línea base y devuelve el código de salida (1 si hay regresiones)"""
+    output = args.output or default_output(suite)
+    save(results, output)
+    print(f"\nResultados en {output}")
+    if args.save_baseline:
+        save(results, args.baseline)
+        print(f"Línea base guardada en {args.baseline}")
+        return 0
+    baseline = load(args.baseline)
+    if baseline is None:
+        print(f"No hay línea base en {args.baseline} (crearla con --save-baseline)")
+        return 0
+    lines, regressions = compare(results, baseline, args.tolerance)
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} regresiones: {', '.join(regressions)}")
+        return 1
+    return 0
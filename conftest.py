@@ -0,0 +1,42 @@
+"""Fixtures compartidas por las pruebas: directorios, bases de datos y configuración temporales"""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+from PyQt6.QtCore import QSettings
+
+from src.database.db_manager import DatabaseManager
+
+
+@pytest.fixture
+def temp_dir():
+    """Directorio temporal que se borra al terminar la prueba"""
+    directory = tempfile.mkdtemp(prefix="gimmeletter_test_")
+    yield directory
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def db(temp_dir):
+    """Base temporal sin la canción de ejemplo y sin registro de consultas lentas"""
+    database = DatabaseManager(os.path.join(temp_dir, "test.db"))
+    database.query_stats.slow_query_ms = float('inf')
+    for song in database.get_all_songs():
+        database.delete_song(song.id)
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def user_settings(temp_dir):
+    """Configuración de usuario (QSettings) en el directorio temporal; al terminar vuelve a la de siempre"""
+    formats = (QSettings.Format.NativeFormat, QSettings.Format.IniFormat)
+    for settings_format in formats:
+        QSettings.setPath(settings_format, QSettings.Scope.UserScope, temp_dir)
+    yield temp_dir
+    # Ubicación por defecto de Qt para la configuración del usuario
+    config_dir = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    for settings_format in formats:
+        QSettings.setPath(settings_format, QSettings.Scope.UserScope, config_dir)
@@ -2,14 +2,22 @@
 Gestor de base de datos SQLite
 """
 
+import math
 import sqlite3
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, List, Optional, Tuple, Union
 from datetime import datetime
 
 from .models import Song, Set, SetSong
+from .query_stats import QueryStats, StatsConnection
+from ..utils.chord_transposer import ChordTransposer
+from ..utils.progression import chord_sequence, parse_progression, progression_ngrams, query_ngrams
+from ..utils.song_analysis import ANALYSIS_VERSION, SongAnalysis, analyze_lyrics, chord_vocabulary
+from ..utils.tracing import traced_methods
 
 
+# Solo las operaciones: song_from_row corre una vez por fila de cada consulta
+@traced_methods("db", exclude=("song_from_row",))
 class DatabaseManager:
     """Gestiona todas las operaciones de base de datos"""
     
@@ -24,7 +32,8 @@ class DatabaseManager:
     
     def init_database(self):
         """Inicializa la base de datos y crea las tablas si no existen"""
-        self.connection = sqlite3.connect(self.db_path)
+        # Todas las sentencias pasan por StatsConnection (estadísticas y registro de consultas lentas)
+        self.connection = sqlite3.connect(self.db_path, factory=StatsConnection)
         self.connection.row_factory = sqlite3.Row
         cursor = self.connection.cursor()
         # Tabla de canciones
@@ -46,6 +55,22 @@ class DatabaseManager:
             self.connection.commit()
         except sqlite3.OperationalError:
             pass
+        # Migración: columnas derivadas del análisis de la letra
+        for column_def in (
+            "line_kinds BLOB",
+            "notation TEXT",
+            "line_count INTEGER DEFAULT 0",
+            "chord_count INTEGER DEFAULT 0",
+            "content_hash TEXT",
+            "analysis_version INTEGER DEFAULT 0",
+            "key_confidence REAL",
+            "sections TEXT",
+        ):
+            try:
+                cursor.execute(f"ALTER TABLE songs ADD COLUMN {column_def}")
+            except sqlite3.OperationalError:
+                pass
+        self.connection.commit()
         # Tabla de sets
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS sets (
@@ -67,7 +92,42 @@ class DatabaseManager:
                 FOREIGN KEY (song_id) REFERENCES songs (id) ON DELETE CASCADE
             )
         """)
+        # Migración: mapa de tiempos por línea grabado en el ensayo (ver utils/timing_map)
+        try:
+            cursor.execute("ALTER TABLE set_songs ADD COLUMN timing_map BLOB")
+            self.connection.commit()
+        except sqlite3.OperationalError:
+            pass
+        # Índice invertido de acordes por canción (se llena al guardar)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS song_chords (
+                song_id INTEGER NOT NULL,
+                root INTEGER NOT NULL,
+                quality TEXT NOT NULL,
+                occurrences INTEGER NOT NULL DEFAULT 1,
+                PRIMARY KEY (song_id, root, quality),
+                FOREIGN KEY (song_id) REFERENCES songs (id) ON DELETE CASCADE
+            ) WITHOUT ROWID
+        """)
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_song_chords_chord ON song_chords (root, quality, song_id)"
+        )
+        # Índice invertido de n-gramas de intervalos (progresiones en cualquier tonalidad)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS song_progressions (
+                gram INTEGER NOT NULL,
+                song_id INTEGER NOT NULL,
+                occurrences INTEGER NOT NULL DEFAULT 1,
+                PRIMARY KEY (gram, song_id),
+                FOREIGN KEY (song_id) REFERENCES songs (id) ON DELETE CASCADE
+            ) WITHOUT ROWID
+        """)
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_song_progressions_song ON song_progressions (song_id)"
+        )
         self.connection.commit()
+        # Recalcular el análisis de canciones antiguas o con análisis desactualizado
+        self.refresh_song_analysis()
         # Si no hay canciones, agregar una por defecto
         cursor.execute("SELECT COUNT(*) FROM songs")
         count = cursor.fetchone()[0]
@@ -85,12 +145,20 @@ class DatabaseManager:
     
     # OPERACIONES DE CANCIONES
     
+    @property
+    def query_stats(self) -> QueryStats:
+        """Estadísticas por sentencia SQL de esta conexión"""
+        return self.connection.query_stats
+    
     def add_song(self, song: Song) -> int:
         """Agrega una canción y retorna su ID"""
+        analysis = self._apply_analysis(song)
         cursor = self.connection.cursor()
         cursor.execute("""
-            INSERT INTO songs (title, artist, original_key, lyrics_with_chords, bpm, default_scroll_speed, created_date)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
+            INSERT INTO songs (title, artist, original_key, lyrics_with_chords, bpm, default_scroll_speed, created_date,
+                               key_confidence, line_kinds, notation, line_count, chord_count, content_hash,
+                               sections, analysis_version)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (
             song.title,
             song.artist,
@@ -98,10 +166,20 @@ class DatabaseManager:
             song.lyrics_with_chords,
             song.bpm,
             song.default_scroll_speed,
-            datetime.now().isoformat()
+            datetime.now().isoformat(),
+            song.key_confidence,
+            analysis.line_kinds,
+            analysis.notation,
+            analysis.line_count,
+            analysis.chord_count,
+            analysis.content_hash,
+            analysis.sections,
+            ANALYSIS_VERSION
         ))
+        song_id = cursor.lastrowid
+        self._index_song(cursor, song_id, analysis)
         self.connection.commit()
-        return cursor.lastrowid
+        return song_id
     
     def get_song(self, song_id: int) -> Optional[Song]:
         """Obtiene una canción por ID"""
@@ -110,22 +188,7 @@ class DatabaseManager:
         row = cursor.fetchone()
         
         if row:
-            # Manejar columnas que pueden no existir en bases de datos antiguas
-            try:
-                default_scroll_speed = row['default_scroll_speed']
-            except (KeyError, IndexError):
-                default_scroll_speed = 50
-            
-            return Song(
-                id=row['id'],
-                title=row['title'],
-                artist=row['artist'],
-                original_key=row['original_key'],
-                lyrics_with_chords=row['lyrics_with_chords'],
-                bpm=row['bpm'],
-                default_scroll_speed=default_scroll_speed,
-                created_date=row['created_date']
-            )
+            return self.song_from_row(row)
         return None
     
     def get_all_songs(self) -> List[Song]:
@@ -134,34 +197,47 @@ class DatabaseManager:
         cursor.execute("SELECT * FROM songs ORDER BY title")
         rows = cursor.fetchall()
         
-        songs = []
-        for row in rows:
-            # Manejar columnas que pueden no existir en bases de datos antiguas
-            try:
-                default_scroll_speed = row['default_scroll_speed']
-            except (KeyError, IndexError):
-                default_scroll_speed = 50
-            
-            songs.append(Song(
-                id=row['id'],
-                title=row['title'],
-                artist=row['artist'],
-                original_key=row['original_key'],
-                lyrics_with_chords=row['lyrics_with_chords'],
-                bpm=row['bpm'],
-                default_scroll_speed=default_scroll_speed,
-                created_date=row['created_date']
-            ))
+        return [self.song_from_row(row) for row in rows]
+    
+    @staticmethod
+    def song_from_row(row: sqlite3.Row) -> Song:
+        """Construye una canción desde una fila de songs (o de get_set_songs)"""
+        keys = row.keys()
         
-        return songs
+        # Manejar columnas que pueden no existir en bases de datos antiguas
+        def column(name, default=None):
+            return row[name] if name in keys and row[name] is not None else default
+        
+        return Song(
+            id=row['id'],
+            title=row['title'],
+            artist=row['artist'],
+            original_key=row['original_key'],
+            lyrics_with_chords=row['lyrics_with_chords'],
+            bpm=row['bpm'],
+            default_scroll_speed=column('default_scroll_speed', 50),
+            created_date=column('created_date'),
+            key_confidence=column('key_confidence'),
+            line_kinds=column('line_kinds'),
+            notation=column('notation'),
+            line_count=column('line_count', 0),
+            chord_count=column('chord_count', 0),
+            content_hash=column('content_hash'),
+            sections=column('sections')
+        )
     
     def update_song(self, song: Song):
         """Actualiza una canción existente"""
+        analysis = self._apply_analysis(song)
         cursor = self.connection.cursor()
+        cursor.execute("SELECT content_hash FROM songs WHERE id = ?", (song.id,))
+        previous = cursor.fetchone()
         cursor.execute("""
             UPDATE songs
             SET title = ?, artist = ?, original_key = ?, 
-                lyrics_with_chords = ?, bpm = ?, default_scroll_speed = ?
+                lyrics_with_chords = ?, bpm = ?, default_scroll_speed = ?, key_confidence = ?,
+                line_kinds = ?, notation = ?, line_count = ?, chord_count = ?,
+                content_hash = ?, sections = ?, analysis_version = ?
             WHERE id = ?
         """, (
             song.title,
@@ -170,14 +246,293 @@ class DatabaseManager:
             song.lyrics_with_chords,
             song.bpm,
             song.default_scroll_speed,
+            song.key_confidence,
+            analysis.line_kinds,
+            analysis.notation,
+            analysis.line_count,
+            analysis.chord_count,
+            analysis.content_hash,
+            analysis.sections,
+            ANALYSIS_VERSION,
             song.id
         ))
+        self._index_song(cursor, song.id, analysis)
+        # Los mapas de tiempos marcan líneas de la letra anterior: si cambió, ya no sirven
+        if previous is not None and previous['content_hash'] != analysis.content_hash:
+            cursor.execute(
+                "UPDATE set_songs SET timing_map = NULL WHERE song_id = ? AND timing_map IS NOT NULL",
+                (song.id,)
+            )
+        self.connection.commit()
+    
+    def get_songs_missing_key(self) -> List[Tuple[int, str, Optional[bytes], Optional[str]]]:
+        """Obtiene (id, letra, line_kinds, notación) de las canciones con acordes que no tienen tonalidad"""
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            SELECT id, lyrics_with_chords, line_kinds, notation FROM songs
+            WHERE (original_key IS NULL OR TRIM(original_key) = '') AND chord_count > 0
+        """)
+        return [
+            (row['id'], row['lyrics_with_chords'], row['line_kinds'], row['notation'])
+            for row in cursor.fetchall()
+        ]
+    
+    def update_estimated_keys(self, estimates: List[Tuple[int, str, float]]) -> int:
+        """
+        Guarda en bloque tonalidades estimadas con su confianza
+        
+        Nunca pisa una tonalidad escrita por el usuario mientras corría la estimación.
+        
+        Returns:
+            Cantidad de canciones actualizadas
+        """
+        cursor = self.connection.cursor()
+        cursor.executemany("""
+            UPDATE songs SET original_key = ?, key_confidence = ?
+            WHERE id = ? AND (original_key IS NULL OR TRIM(original_key) = '')
+        """, [(key, confidence, song_id) for song_id, key, confidence in estimates])
         self.connection.commit()
+        return cursor.rowcount
+    
+    def refresh_song_analysis(self):
+        """Recalcula las columnas derivadas de las canciones sin análisis o con una versión antigua"""
+        cursor = self.connection.cursor()
+        cursor.execute(
+            "SELECT id, lyrics_with_chords FROM songs WHERE analysis_version IS NULL OR analysis_version < ?",
+            (ANALYSIS_VERSION,)
+        )
+        rows = cursor.fetchall()
+        if not rows:
+            return
+        
+        updates = []
+        for row in rows:
+            analysis = analyze_lyrics(row['lyrics_with_chords'])
+            updates.append((
+                analysis.line_kinds,
+                analysis.notation,
+                analysis.line_count,
+                analysis.chord_count,
+                analysis.content_hash,
+                analysis.sections,
+                ANALYSIS_VERSION,
+                row['id']
+            ))
+            self._index_song(cursor, row['id'], analysis)
+        cursor.executemany("""
+            UPDATE songs
+            SET line_kinds = ?, notation = ?, line_count = ?, chord_count = ?,
+                content_hash = ?, sections = ?, analysis_version = ?
+            WHERE id = ?
+        """, updates)
+        self.connection.commit()
+    
+    def _apply_analysis(self, song: Song) -> SongAnalysis:
+        """Analiza la letra y copia los resultados en la canción"""
+        analysis = analyze_lyrics(song.lyrics_with_chords)
+        song.line_kinds = analysis.line_kinds
+        song.notation = analysis.notation
+        song.line_count = analysis.line_count
+        song.chord_count = analysis.chord_count
+        song.content_hash = analysis.content_hash
+        song.sections = analysis.sections
+        return analysis
+    
+    def _index_song(self, cursor: sqlite3.Cursor, song_id: int, analysis: SongAnalysis):
+        """Reemplaza las entradas de los índices de acordes de una canción"""
+        cursor.execute("DELETE FROM song_chords WHERE song_id = ?", (song_id,))
+        cursor.executemany(
+            "INSERT INTO song_chords (song_id, root, quality, occurrences) VALUES (?, ?, ?, ?)",
+            [(song_id, root, quality, count)
+             for (root, quality), count in chord_vocabulary(analysis.chords).items()]
+        )
+        cursor.execute("DELETE FROM song_progressions WHERE song_id = ?", (song_id,))
+        cursor.executemany(
+            "INSERT INTO song_progressions (gram, song_id, occurrences) VALUES (?, ?, ?)",
+            [(gram, song_id, count)
+             for gram, count in progression_ngrams(chord_sequence(analysis.chords)).items()]
+        )
+    
+    # CONSULTAS POR ACORDES
+    
+    def find_songs_with_all_chords(self, chords: Iterable[Union[str, Tuple[int, str]]],
+                                   any_key: bool = False) -> List[Tuple[int, int]]:
+        """
+        Canciones que contienen todos los acordes indicados
+        
+        Args:
+            chords: Acordes como texto ("Am", "Sib7") o tuplas (nota base, calidad)
+            any_key: Si True, también acepta canciones que los contienen en otra tonalidad
+        
+        Returns:
+            Lista de (song_id, transposición necesaria) ordenada por título
+        """
+        vocabulary = self._parse_chord_vocabulary(chords)
+        if not vocabulary:
+            return []
+        rows = self._query_chord_vocabulary("""
+            SELECT sc.song_id AS song_id, sh.t AS t, COUNT(*) AS matched
+            FROM vocab v
+            CROSS JOIN shifts sh
+            JOIN song_chords sc
+              ON sc.root = (v.root - sh.t + 12) % 12 AND sc.quality = v.quality
+            GROUP BY sc.song_id, sh.t
+            HAVING COUNT(*) = ?
+        """, vocabulary, any_key, (len(vocabulary),))
+        return self._best_transposition_per_song(rows)
+    
+    def find_songs_with_any_chords(self, chords: Iterable[Union[str, Tuple[int, str]]],
+                                   any_key: bool = False) -> List[Tuple[int, int]]:
+        """
+        Canciones que contienen al menos uno de los acordes indicados
+        
+        Returns:
+            Lista de (song_id, transposición) ordenada por cantidad de acordes coincidentes
+        """
+        vocabulary = self._parse_chord_vocabulary(chords)
+        if not vocabulary:
+            return []
+        rows = self._query_chord_vocabulary("""
+            SELECT sc.song_id AS song_id, sh.t AS t, COUNT(*) AS matched
+            FROM vocab v
+            CROSS JOIN shifts sh
+            JOIN song_chords sc
+              ON sc.root = (v.root - sh.t + 12) % 12 AND sc.quality = v.quality
+            GROUP BY sc.song_id, sh.t
+        """, vocabulary, any_key)
+        return self._best_transposition_per_song(rows, by_matches=True)
+    
+    def find_songs_with_only_chords(self, chords: Iterable[Union[str, Tuple[int, str]]],
+                                    any_key: bool = False) -> List[Tuple[int, int]]:
+        """
+        Canciones que se pueden tocar usando solo los acordes indicados
+        
+        Con any_key=True se prueban las 12 transposiciones en una sola consulta.
+        
+        Returns:
+            Lista de (song_id, transposición necesaria) ordenada por título
+        """
+        vocabulary = self._parse_chord_vocabulary(chords)
+        if not vocabulary:
+            return []
+        rows = self._query_chord_vocabulary("""
+            SELECT m.song_id AS song_id, m.t AS t, m.matched AS matched
+            FROM (
+                SELECT sc.song_id AS song_id, sh.t AS t, COUNT(*) AS matched
+                FROM vocab v
+                CROSS JOIN shifts sh
+                JOIN song_chords sc
+                  ON sc.root = (v.root - sh.t + 12) % 12 AND sc.quality = v.quality
+                GROUP BY sc.song_id, sh.t
+            ) m
+            -- Todos los acordes distintos de la canción deben estar en el vocabulario
+            WHERE m.matched = (SELECT COUNT(*) FROM song_chords WHERE song_id = m.song_id)
+        """, vocabulary, any_key)
+        return self._best_transposition_per_song(rows)
+    
+    def get_chord_histograms(self, song_ids: Iterable[int]) -> dict:
+        """
+        Obtiene los acordes de varias canciones desde el índice song_chords
+        
+        Returns:
+            {song_id: [(nota base, calidad, apariciones), ...]}
+        """
+        song_ids = list(song_ids)
+        histograms = {song_id: [] for song_id in song_ids}
+        if not song_ids:
+            return histograms
+        placeholders = ", ".join("?" for _ in song_ids)
+        cursor = self.connection.cursor()
+        cursor.execute(f"""
+            SELECT song_id, root, quality, occurrences
+            FROM song_chords
+            WHERE song_id IN ({placeholders})
+        """, song_ids)
+        for row in cursor.fetchall():
+            histograms[row['song_id']].append((row['root'], row['quality'], row['occurrences']))
+        return histograms
+    
+    def find_songs_by_progression(self, progression: str, limit: int = 50,
+                                  min_score: float = 0.5) -> List[Tuple[int, float]]:
+        """
+        Busca canciones que usan una progresión en cualquier tonalidad
+        
+        Args:
+            progression: Grados o acordes, ej: "I–V–vi–IV", "ii V I", "C G Am F"
+            limit: Cantidad máxima de resultados
+            min_score: Fracción mínima de n-gramas de la progresión que debe contener la canción
+        
+        Returns:
+            Lista de (song_id, puntaje 0-1) ordenada de mayor a menor coincidencia
+        """
+        grams = query_ngrams(parse_progression(progression))
+        placeholders = ", ".join("?" for _ in grams)
+        cursor = self.connection.cursor()
+        cursor.execute(f"""
+            SELECT song_id, COUNT(*) AS matched, SUM(occurrences) AS hits
+            FROM song_progressions
+            WHERE gram IN ({placeholders})
+            GROUP BY song_id
+            HAVING COUNT(*) >= ?
+            ORDER BY matched DESC, hits DESC, song_id
+            LIMIT ?
+        """, (*grams, max(1, math.ceil(len(grams) * min_score)), limit))
+        return [(row['song_id'], row['matched'] / len(grams)) for row in cursor.fetchall()]
+    
+    def _query_chord_vocabulary(self, query: str, vocabulary: List[Tuple[int, str]],
+                                any_key: bool, extra_params: tuple = ()) -> List[sqlite3.Row]:
+        """Ejecuta una consulta sobre song_chords con las CTE vocab(root, quality) y shifts(t)"""
+        vocab_values = ", ".join("(?, ?)" for _ in vocabulary)
+        shifts = range(12) if any_key else (0,)
+        shift_values = ", ".join(f"({t})" for t in shifts)
+        sql = (
+            f"WITH vocab(root, quality) AS (VALUES {vocab_values}), "
+            f"shifts(t) AS (VALUES {shift_values}) "
+            f"SELECT r.song_id, r.t, r.matched FROM ({query}) r "
+            f"JOIN songs s ON s.id = r.song_id ORDER BY s.title"
+        )
+        params = [value for chord in vocabulary for value in chord]
+        cursor = self.connection.cursor()
+        cursor.execute(sql, (*params, *extra_params))
+        return cursor.fetchall()
+    
+    @staticmethod
+    def _best_transposition_per_song(rows: List[sqlite3.Row],
+                                     by_matches: bool = False) -> List[Tuple[int, int]]:
+        """Elige para cada canción la transposición más cercana a 0 (o la de más coincidencias)"""
+        best = {}
+        for row in rows:
+            # Expresar el desplazamiento en el rango -5..+6
+            t = row['t'] if row['t'] <= 6 else row['t'] - 12
+            candidate = (-row['matched'] if by_matches else 0, abs(t), t)
+            if row['song_id'] not in best or candidate < best[row['song_id']]:
+                best[row['song_id']] = candidate
+        results = [(song_id, candidate[2]) for song_id, candidate in best.items()]
+        if by_matches:
+            results.sort(key=lambda item: best[item[0]][0])
+        return results
+    
+    @staticmethod
+    def _parse_chord_vocabulary(chords: Iterable[Union[str, Tuple[int, str]]]) -> List[Tuple[int, str]]:
+        """Convierte una lista de acordes en tuplas (nota base, calidad) sin duplicados"""
+        vocabulary = []
+        for chord in chords:
+            if isinstance(chord, str):
+                parsed = ChordTransposer.parse_chord(chord) or ChordTransposer.parse_chord(chord, use_latin=True)
+                if parsed is None:
+                    raise ValueError(f"Acorde no reconocido: {chord}")
+            else:
+                parsed = (chord[0] % 12, ChordTransposer.normalize_quality(chord[1]))
+            if parsed not in vocabulary:
+                vocabulary.append(parsed)
+        return vocabulary
     
     def delete_song(self, song_id: int):
         """Elimina una canción"""
         cursor = self.connection.cursor()
         cursor.execute("DELETE FROM songs WHERE id = ?", (song_id,))
+        cursor.execute("DELETE FROM song_chords WHERE song_id = ?", (song_id,))
+        cursor.execute("DELETE FROM song_progressions WHERE song_id = ?", (song_id,))
         self.connection.commit()
     
     # OPERACIONES DE SETS
@@ -218,6 +573,21 @@ class DatabaseManager:
             )
         return None
     
+    def update_set(self, set_obj: Set, set_songs: List[SetSong]):
+        """Actualiza el nombre de un set y reemplaza sus canciones, en una sola transacción"""
+        cursor = self.connection.cursor()
+        cursor.execute("UPDATE sets SET name = ? WHERE id = ?", (set_obj.name, set_obj.id))
+        cursor.execute("DELETE FROM set_songs WHERE set_id = ?", (set_obj.id,))
+        cursor.executemany("""
+            INSERT INTO set_songs (set_id, song_id, song_order, scroll_speed, transposition, timing_map)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [
+            (set_obj.id, set_song.song_id, set_song.order, set_song.scroll_speed,
+             set_song.transposition, set_song.timing_map)
+            for set_song in set_songs
+        ])
+        self.connection.commit()
+    
     def delete_set(self, set_id: int):
         """Elimina un set"""
         cursor = self.connection.cursor()
@@ -230,23 +600,43 @@ class DatabaseManager:
         """Agrega una canción a un set"""
         cursor = self.connection.cursor()
         cursor.execute("""
-            INSERT INTO set_songs (set_id, song_id, song_order, scroll_speed, transposition)
-            VALUES (?, ?, ?, ?, ?)
+            INSERT INTO set_songs (set_id, song_id, song_order, scroll_speed, transposition, timing_map)
+            VALUES (?, ?, ?, ?, ?, ?)
         """, (
             set_song.set_id,
             set_song.song_id,
             set_song.order,
             set_song.scroll_speed,
-            set_song.transposition
+            set_song.transposition,
+            set_song.timing_map
         ))
         self.connection.commit()
         return cursor.lastrowid
     
+    def update_set_song_timing(self, set_song_id: int, timing_map: Optional[bytes]):
+        """Guarda (o borra, con None) el mapa de tiempos de una canción del set"""
+        cursor = self.connection.cursor()
+        cursor.execute(
+            "UPDATE set_songs SET timing_map = ? WHERE id = ?",
+            (timing_map or None, set_song_id)
+        )
+        self.connection.commit()
+    
+    def update_set_song_speed(self, set_song_id: int, scroll_speed: int):
+        """Guarda la velocidad de scroll de una canción del set"""
+        cursor = self.connection.cursor()
+        cursor.execute(
+            "UPDATE set_songs SET scroll_speed = ? WHERE id = ?",
+            (scroll_speed, set_song_id)
+        )
+        self.connection.commit()
+    
     def get_set_songs(self, set_id: int) -> List[tuple]:
         """Obtiene todas las canciones de un set con su configuración"""
         cursor = self.connection.cursor()
         cursor.execute("""
-            SELECT s.*, ss.scroll_speed, ss.transposition, ss.song_order
+            SELECT s.*, ss.scroll_speed, ss.transposition, ss.song_order,
+                   ss.id AS set_song_id, ss.timing_map
             FROM songs s
             JOIN set_songs ss ON s.id = ss.song_id
             WHERE ss.set_id = ?
@@ -255,6 +645,24 @@ class DatabaseManager:
         
         return cursor.fetchall()
     
+    def get_set_song_entries(self, set_id: int) -> List[tuple]:
+        """
+        Canciones de un set para el reproductor: configuración, título y artista sin la letra
+        
+        La letra de cada una se lee después con get_song, a medida que hace falta.
+        """
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            SELECT ss.song_id, s.title, s.artist, ss.scroll_speed, ss.transposition,
+                   ss.id AS set_song_id, ss.timing_map
+            FROM set_songs ss
+            JOIN songs s ON s.id = ss.song_id
+            WHERE ss.set_id = ?
+            ORDER BY ss.song_order
+        """, (set_id,))
+        
+        return cursor.fetchall()
+    
     def close(self):
         """Cierra la conexión a la base de datos"""
         if self.connection:
@@ -17,6 +17,14 @@ class Song:
     bpm: Optional[int] = None
     default_scroll_speed: int = 50  # Velocidad por defecto en px/seg
     created_date: Optional[str] = None
+    key_confidence: Optional[float] = None  # Solo si original_key fue estimada automáticamente
+    # Columnas derivadas, calculadas por DatabaseManager al guardar (ver song_analysis)
+    line_kinds: Optional[bytes] = None  # Mapa de bits de líneas de acordes
+    notation: Optional[str] = None  # "latin" o "english"
+    line_count: int = 0
+    chord_count: int = 0
+    content_hash: Optional[str] = None
+    sections: Optional[str] = None  # Marcas de sección [[línea, "nombre"], ...]
     
     def __str__(self):
         return f"{self.title} - {self.artist}"
@@ -42,3 +50,4 @@ class SetSong:
     order: int = 0
     scroll_speed: int = 50  # Velocidad en píxeles por segundo
     transposition: int = 0  # Semitonos para transponer
+    timing_map: Optional[bytes] = None  # Mapa de tiempos por línea (ver utils/timing_map)
@@ -0,0 +1,221 @@
+"""
+Estadísticas por sentencia SQL y registro de consultas lentas
+
+La conexión de DatabaseManager se crea con StatsConnection, así toda
+sentencia (incluidas las de connection.execute y las de cualquier cursor)
+pasa por StatsCursor, que mide cuánto tarda cada ejecución, cuenta las filas
+devueltas (al leerlas con fetchone/fetchmany/fetchall o iterando el cursor)
+o afectadas, y acumula el resultado en un QueryStats agrupado por texto de
+la sentencia.
+
+Las ejecuciones que superan el umbral se registran en slow_queries.log
+(rotativo) junto con su EXPLAIN QUERY PLAN.
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import time
+from dataclasses import dataclass
+from logging.handlers import RotatingFileHandler
+from typing import Dict, List, Optional
+
+from ..utils.app_paths import logs_dir
+
+
+# Umbral por defecto para considerar lenta una sentencia (ms)
+DEFAULT_SLOW_QUERY_MS = 50
+LOG_MAX_BYTES = 1_000_000
+LOG_BACKUPS = 3
+SLOW_QUERY_LOGGER = "gimmeletter.slow_queries"
+
+
+def normalize_sql(sql: str) -> str:
+    """Texto de la sentencia en una sola línea, para agrupar sus ejecuciones"""
+    return re.sub(r'\s+', ' ', sql).strip()
+
+
+def slow_query_logger(path: str) -> logging.Logger:
+    """Logger compartido de consultas lentas, con un único archivo rotativo por ruta
+
+    Todas las conexiones (una por DatabaseManager) escriben en el mismo logger;
+    el handler se agrega solo si todavía no hay uno para ese archivo, así cada
+    consulta lenta queda una sola vez en el registro.
+    """
+    logger = logging.getLogger(SLOW_QUERY_LOGGER)
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    path = os.path.abspath(path)
+    if not any(isinstance(handler, RotatingFileHandler) and handler.baseFilename == path
+               for handler in logger.handlers):
+        handler = RotatingFileHandler(path, maxBytes=LOG_MAX_BYTES,
+                                      backupCount=LOG_BACKUPS, encoding='utf-8')
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        logger.addHandler(handler)
+    return logger
+
+
+@dataclass
+class StatementStats:
+    """Acumulado de una sentencia"""
+    sql: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    rows: int = 0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+class QueryStats:
+    """Acumula estadísticas por sentencia y registra las lentas"""
+
+    def __init__(self, slow_query_ms: float = DEFAULT_SLOW_QUERY_MS):
+        self.slow_query_ms = slow_query_ms
+        self.statements: Dict[str, StatementStats] = {}
+        self.slow_count = 0
+        self._logger: Optional[logging.Logger] = None
+        self._keys: Dict[str, str] = {}  # Texto original -> normalizado (se normaliza una sola vez)
+
+    def record(self, sql: str, elapsed_ms: float, rows: int) -> StatementStats:
+        """Suma una ejecución de una sentencia"""
+        key = self._keys.get(sql)
+        if key is None:
+            key = self._keys[sql] = normalize_sql(sql)
+        stats = self.statements.get(key)
+        if stats is None:
+            stats = self.statements[key] = StatementStats(key)
+        stats.count += 1
+        stats.total_ms += elapsed_ms
+        stats.rows += rows
+        return stats
+
+    def by_total_time(self) -> List[StatementStats]:
+        """Sentencias ordenadas por tiempo total (las más costosas primero)"""
+        return sorted(self.statements.values(), key=lambda stats: stats.total_ms, reverse=True)
+
+    def reset(self):
+        self.statements.clear()
+        self._keys.clear()
+        self.slow_count = 0
+
+    @property
+    def log_path(self) -> str:
+        return os.path.join(logs_dir(), "slow_queries.log")
+
+    def log_slow(self, connection: sqlite3.Connection, sql: str, parameters, elapsed_ms: float):
+        """Registra una ejecución lenta con su plan de consulta"""
+        self.slow_count += 1
+        if self._logger is None:
+            self._logger = slow_query_logger(self.log_path)
+        self._logger.info(
+            "%.1f ms: %s\n  parámetros: %r\n%s",
+            elapsed_ms, normalize_sql(sql), parameters, self.explain(connection, sql, parameters)
+        )
+
+    @staticmethod
+    def explain(connection: sqlite3.Connection, sql: str, parameters) -> str:
+        """EXPLAIN QUERY PLAN de la sentencia (con un cursor común, fuera de las estadísticas)"""
+        if parameters is None:
+            parameters = ()
+        try:
+            cursor = sqlite3.Cursor(connection)
+            plan = cursor.execute(f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+        except sqlite3.Error as error:
+            return f"  (sin plan: {error})"
+        return "\n".join(f"  {row[3]}" for row in plan)
+
+
+class StatsCursor(sqlite3.Cursor):
+    """Cursor que mide cada sentencia y las filas que devuelve"""
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        super().execute(sql, parameters)
+        self._begin(sql, parameters, (time.perf_counter() - start) * 1000)
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        # Se conservan los primeros parámetros para el plan de una ejecución lenta
+        if not isinstance(seq_of_parameters, (list, tuple)):
+            seq_of_parameters = list(seq_of_parameters)
+        start = time.perf_counter()
+        super().executemany(sql, seq_of_parameters)
+        first = seq_of_parameters[0] if seq_of_parameters else None
+        self._begin(sql, first, (time.perf_counter() - start) * 1000)
+        return self
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(1 if row is not None else 0, (time.perf_counter() - start) * 1000)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(len(rows), (time.perf_counter() - start) * 1000)
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(len(rows), (time.perf_counter() - start) * 1000)
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(0, (time.perf_counter() - start) * 1000)
+            raise
+        self._fetched(1, (time.perf_counter() - start) * 1000)
+        return row
+
+    def _begin(self, sql, parameters, elapsed_ms: float):
+        """Registra la ejecución; en una lectura, traer las filas suma a la misma medición"""
+        stats = self.connection.query_stats
+        rows = 0 if self.description is not None else max(0, self.rowcount)
+        self._statement = stats.record(sql, elapsed_ms, rows)
+        self._sql, self._parameters, self._elapsed_ms = sql, parameters, elapsed_ms
+        self._logged = False
+        # Se revisa ya, por si las filas nunca se leen
+        self._check()
+
+    def _fetched(self, rows: int, elapsed_ms: float):
+        if getattr(self, '_statement', None) is None:
+            return
+        # Leer el resultado es parte de la misma ejecución
+        self._statement.total_ms += elapsed_ms
+        self._statement.rows += rows
+        self._elapsed_ms += elapsed_ms
+        self._check()
+
+    def _check(self):
+        """Actualiza el máximo y registra la ejecución si ya superó el umbral (una sola vez)"""
+        stats = self.connection.query_stats
+        self._statement.max_ms = max(self._statement.max_ms, self._elapsed_ms)
+        if self._elapsed_ms >= stats.slow_query_ms and not self._logged:
+            self._logged = True
+            stats.log_slow(self.connection, self._sql, self._parameters, self._elapsed_ms)
+
+
+class StatsConnection(sqlite3.Connection):
+    """Conexión cuyas sentencias pasan todas por StatsCursor"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.query_stats = QueryStats()
+
+    def cursor(self, factory=StatsCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
@@ -4,6 +4,7 @@ GimmeLetter - Aplicación de scroll automático para letras y acordes
 Punto de entrada principal
 """
 
+import multiprocessing
 import sys
 from PyQt6.QtWidgets import QApplication
 from src.ui.main_window import MainWindow
@@ -11,6 +12,8 @@ from src.ui.main_window import MainWindow
 
 def main():
     """Función principal"""
+    # Necesario para los procesos de trabajo en la aplicación empaquetada
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     app.setApplicationName("GimmeLetter")
     app.setOrganizationName("GimmeLetter")
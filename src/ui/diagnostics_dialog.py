@@ -0,0 +1,201 @@
+"""
+Diálogo de diagnóstico: estadísticas de SQL, bloqueos de la interfaz y memoria
+"""
+
+import os
+
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QTabWidget, QTableWidget, QTableWidgetItem, QHeaderView, QWidget, QPlainTextEdit
+)
+from PyQt6.QtCore import Qt
+
+from ..database.db_manager import DatabaseManager
+from ..utils.app_paths import logs_dir
+from ..utils.memory_profiler import MemoryProfiler
+from ..utils.stall_watchdog import StallWatchdog
+from ..utils.tracing import traced
+
+
+def _number_item(value, decimals: int = 0) -> QTableWidgetItem:
+    """Celda numérica alineada a la derecha que se ordena por valor"""
+    item = QTableWidgetItem()
+    item.setData(Qt.ItemDataRole.DisplayRole, round(value, decimals) if decimals else int(value))
+    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+    return item
+
+
+class DiagnosticsDialog(QDialog):
+    """Muestra qué sentencias SQL consumen más tiempo, dónde se bloqueó la interfaz y qué memoria creció"""
+
+    @traced(category="dialog")
+    def __init__(self, parent=None, db: DatabaseManager = None, memory_profiler: MemoryProfiler = None):
+        super().__init__(parent)
+        self.db = db
+        # La línea base tiene que sobrevivir al diálogo, por eso la guarda quien lo abre
+        self.memory_profiler = memory_profiler or MemoryProfiler()
+        self.init_ui()
+        self.refresh()
+
+    def init_ui(self):
+        """Inicializa la interfaz del diálogo"""
+        self.setWindowTitle("Diagnóstico")
+        self.setMinimumSize(900, 500)
+
+        layout = QVBoxLayout(self)
+        tabs = QTabWidget()
+
+        # Sentencias SQL
+        queries_tab = QWidget()
+        queries_layout = QVBoxLayout(queries_tab)
+        self.queries_label = QLabel()
+        queries_layout.addWidget(self.queries_label)
+        self.queries_table = self._create_table(
+            ["Sentencia", "Veces", "Total (ms)", "Promedio (ms)", "Máx (ms)", "Filas"]
+        )
+        queries_layout.addWidget(self.queries_table)
+        tabs.addTab(queries_tab, "🗄 Consultas")
+
+        # Bloqueos de la interfaz (acumulados entre sesiones)
+        stalls_tab = QWidget()
+        stalls_layout = QVBoxLayout(stalls_tab)
+        self.stalls_label = QLabel()
+        stalls_layout.addWidget(self.stalls_label)
+        self.stalls_table = self._create_table(["Punto de llamada", "Veces", "Total (ms)", "Máx (ms)"])
+        self.stalls_table.itemSelectionChanged.connect(self.show_stall_stack)
+        stalls_layout.addWidget(self.stalls_table)
+        self.stall_stack_label = QLabel()
+        self.stall_stack_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        self.stall_stack_label.setStyleSheet("font-family: monospace;")
+        stalls_layout.addWidget(self.stall_stack_label)
+        tabs.addTab(stalls_tab, "⏳ Bloqueos")
+
+        # Memoria: línea base y comparación (los widgets de este diálogo no se cuentan)
+        memory_tab = QWidget()
+        memory_layout = QVBoxLayout(memory_tab)
+        memory_buttons = QHBoxLayout()
+        baseline_btn = QPushButton("📌 Tomar Línea Base")
+        baseline_btn.clicked.connect(self.take_memory_baseline)
+        memory_buttons.addWidget(baseline_btn)
+        self.compare_btn = QPushButton("🔍 Comparar")
+        self.compare_btn.clicked.connect(self.compare_memory)
+        memory_buttons.addWidget(self.compare_btn)
+        self.stop_memory_btn = QPushButton("⏹ Detener")
+        self.stop_memory_btn.setToolTip("Descarta la línea base y deja de rastrear la memoria (tracemalloc)")
+        self.stop_memory_btn.clicked.connect(self.reset_memory_baseline)
+        memory_buttons.addWidget(self.stop_memory_btn)
+        memory_buttons.addStretch()
+        memory_layout.addLayout(memory_buttons)
+        self.memory_output = QPlainTextEdit()
+        self.memory_output.setReadOnly(True)
+        self.memory_output.setStyleSheet("font-family: monospace;")
+        memory_layout.addWidget(self.memory_output)
+        tabs.addTab(memory_tab, "🧠 Memoria")
+
+        layout.addWidget(tabs)
+
+        # Botones
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addStretch()
+
+        reset_btn = QPushButton("🔄 Reiniciar Estadísticas SQL")
+        reset_btn.clicked.connect(self.reset_query_stats)
+        buttons_layout.addWidget(reset_btn)
+
+        refresh_btn = QPushButton("Actualizar")
+        refresh_btn.clicked.connect(self.refresh)
+        buttons_layout.addWidget(refresh_btn)
+
+        close_btn = QPushButton("Cerrar")
+        close_btn.clicked.connect(self.accept)
+        close_btn.setDefault(True)
+        buttons_layout.addWidget(close_btn)
+
+        layout.addLayout(buttons_layout)
+
+    def _create_table(self, headers) -> QTableWidget:
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        table.verticalHeader().setVisible(False)
+        return table
+
+    def refresh(self):
+        """Vuelve a leer las estadísticas"""
+        self.load_query_stats()
+        self.load_stall_sites()
+        self.update_memory_status()
+
+    def load_query_stats(self):
+        """Sentencias de esta sesión, las más costosas primero"""
+        stats = self.db.query_stats
+        self.queries_label.setText(
+            f"Sentencias lentas (≥ {stats.slow_query_ms:g} ms) en esta sesión: {stats.slow_count}. "
+            f"Se registran con su plan en {stats.log_path}"
+        )
+        statements = stats.by_total_time()
+        table = self.queries_table
+        table.setSortingEnabled(False)
+        table.setRowCount(len(statements))
+        for row, statement in enumerate(statements):
+            sql_item = QTableWidgetItem(statement.sql)
+            sql_item.setToolTip(statement.sql)
+            table.setItem(row, 0, sql_item)
+            table.setItem(row, 1, _number_item(statement.count))
+            table.setItem(row, 2, _number_item(statement.total_ms, 2))
+            table.setItem(row, 3, _number_item(statement.mean_ms, 3))
+            table.setItem(row, 4, _number_item(statement.max_ms, 2))
+            table.setItem(row, 5, _number_item(statement.rows))
+        table.setSortingEnabled(True)
+
+    def load_stall_sites(self):
+        """Bloqueos agrupados por punto de llamada, los de más tiempo total primero"""
+        path = os.path.join(logs_dir(), "stall_sites.json")
+        self.sites = StallWatchdog.load_sites(path)
+        self.stalls_label.setText(f"Acumulado de todas las sesiones ({path})")
+        table = self.stalls_table
+        table.setSortingEnabled(False)
+        table.setRowCount(len(self.sites))
+        for row, (site, entry) in enumerate(self.sites.items()):
+            table.setItem(row, 0, QTableWidgetItem(site))
+            table.setItem(row, 1, _number_item(entry['count']))
+            table.setItem(row, 2, _number_item(entry['total_ms']))
+            table.setItem(row, 3, _number_item(entry['max_ms']))
+        table.setSortingEnabled(True)
+        self.stall_stack_label.clear()
+
+    def show_stall_stack(self):
+        """Muestra la última pila registrada del punto de llamada seleccionado"""
+        items = self.stalls_table.selectedItems()
+        if not items:
+            return
+        site = self.stalls_table.item(items[0].row(), 0).text()
+        self.stall_stack_label.setText(self.sites.get(site, {}).get('last_stack', ""))
+
+    def reset_query_stats(self):
+        self.db.query_stats.reset()
+        self.load_query_stats()
+
+    def update_memory_status(self):
+        self.compare_btn.setEnabled(self.memory_profiler.has_baseline)
+        self.stop_memory_btn.setEnabled(self.memory_profiler.has_baseline)
+        if not self.memory_profiler.has_baseline:
+            self.memory_output.setPlainText(
+                "Toma una línea base, usa la aplicación (abrir canciones, sets, el reproductor...) "
+                "y vuelve a este diálogo para comparar."
+            )
+
+    def take_memory_baseline(self):
+        self.memory_profiler.take_baseline(exclude=self)
+        self.memory_output.setPlainText("Línea base tomada.")
+        self.update_memory_status()
+
+    def reset_memory_baseline(self):
+        self.memory_profiler.reset()
+        self.update_memory_status()
+
+    def compare_memory(self):
+        diff = self.memory_profiler.compare(exclude=self)
+        self.memory_output.setPlainText(diff.report())
@@ -0,0 +1,60 @@
+"""
+Ajuste automático del tamaño de letra al ancho disponible
+
+Con fuente monoespaciada, el ancho de una línea es su largo en caracteres
+por el avance de un carácter. La tabla guarda ese avance por familia y
+tamaño (se mide con QFontMetricsF una sola vez), así cada prueba de la
+búsqueda binaria es una multiplicación y no un maquetado.
+"""
+
+from typing import Dict, Tuple
+
+from PyQt6.QtGui import QFont, QFontMetricsF
+
+from .lyrics_view import DOCUMENT_MARGIN
+
+
+# Mismos límites que el control manual de tamaño del reproductor
+MIN_FONT_SIZE = 12
+MAX_FONT_SIZE = 48
+
+
+class FontMetricsTable:
+    """Avance de carácter por (familia, tamaño), medido una sola vez"""
+
+    def __init__(self):
+        self._advances: Dict[Tuple[str, int], float] = {}
+
+    def char_width(self, font: QFont, point_size: int) -> float:
+        """Ancho de un carácter de la familia de font en el tamaño indicado"""
+        key = (font.family(), point_size)
+        advance = self._advances.get(key)
+        if advance is None:
+            sized = QFont(font)
+            sized.setPointSize(point_size)
+            advance = QFontMetricsF(sized).horizontalAdvance('M')
+            self._advances[key] = advance
+        return advance
+
+    def fit_point_size(self, font: QFont, widest: int, width: int,
+                       min_size: int = MIN_FONT_SIZE, max_size: int = MAX_FONT_SIZE) -> int:
+        """
+        Mayor tamaño en el que una línea de widest caracteres entra en width píxeles
+
+        Returns:
+            El tamaño encontrado (min_size si ni siquiera el mínimo entra)
+        """
+        available = width - 2 * DOCUMENT_MARGIN
+        if widest <= 0:
+            return max_size
+
+        low, high = min_size, max_size
+        best = min_size
+        while low <= high:
+            middle = (low + high) // 2
+            if widest * self.char_width(font, middle) <= available:
+                best = middle
+                low = middle + 1
+            else:
+                high = middle - 1
+        return best
@@ -0,0 +1,200 @@
+"""
+Medición de la fluidez del scroll en el reproductor
+
+FrameStats registra, por cada tick del motor de scroll, el intervalo real
+desde el tick anterior y el retraso respecto del momento programado, y por
+cada repintado de la letra cuánto tardó. Los últimos valores alimentan los
+percentiles que muestra el HUD en vivo; además se acumula un histograma
+(de a 1 ms) de toda la sesión que se guarda en JSON al cerrar, para
+comparar máquinas y configuraciones.
+"""
+
+import json
+import os
+import platform
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from PyQt6.QtCore import Qt, QTimer, QEvent
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import QLabel, QWidget
+
+from ..utils.app_paths import logs_dir
+
+
+# El último casillero del histograma acumula todo lo que lo supera
+HISTOGRAM_MAX_MS = 250
+# Muestras recientes para los percentiles en vivo
+RECENT_SAMPLES = 600
+# Cada cuánto se actualiza el HUD (ms)
+HUD_REFRESH_MS = 500
+
+
+class Histogram:
+    """Histograma de milisegundos con casilleros de 1 ms y las muestras recientes"""
+
+    def __init__(self):
+        self.counts = [0] * (HISTOGRAM_MAX_MS + 1)
+        self.total = 0
+        self.max_ms = 0.0
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def add(self, ms: float):
+        self.counts[min(HISTOGRAM_MAX_MS, max(0, int(ms)))] += 1
+        self.total += 1
+        self.max_ms = max(self.max_ms, ms)
+        self.recent.append(ms)
+
+    def recent_percentiles(self, percents=(50, 95, 99)) -> List[float]:
+        """Percentiles de las muestras recientes"""
+        values = sorted(self.recent)
+        if not values:
+            return [0.0] * len(percents)
+        return [values[min(len(values) - 1, int(len(values) * p / 100))] for p in percents]
+
+    def percentile(self, percent: float) -> int:
+        """Percentil de toda la sesión (con la resolución del histograma)"""
+        if not self.total:
+            return 0
+        target = self.total * percent / 100
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return bucket
+        return HISTOGRAM_MAX_MS
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.total,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'max': round(self.max_ms, 2),
+            # Solo los casilleros con muestras: {"ms": cantidad}
+            'histogram_ms': {str(bucket): count for bucket, count in enumerate(self.counts) if count},
+        }
+
+
+class FrameStats:
+    """Tiempos de cada tick del scroll y de cada repintado"""
+
+    def __init__(self):
+        self.intervals = Histogram()
+        self.lateness = Histogram()
+        self.paints = Histogram()
+        self.dropped_frames = 0
+        self.started = datetime.now()
+
+    def record_tick(self, interval_ms: Optional[float], late_ms: Optional[float], frame_ms: float):
+        """
+        Registra un tick del motor de scroll
+
+        Args:
+            interval_ms: Tiempo desde el tick anterior (None en el primero tras arrancar)
+            late_ms: Retraso respecto de lo programado (None si no había tick programado)
+            frame_ms: Duración de un cuadro de la pantalla
+        """
+        if interval_ms is not None:
+            self.intervals.add(interval_ms)
+        if late_ms is not None:
+            self.lateness.add(max(0.0, late_ms))
+            if late_ms > frame_ms:
+                self.dropped_frames += int(late_ms // frame_ms)
+
+    def record_paint(self, ms: float):
+        self.paints.add(ms)
+
+    def summary_text(self) -> str:
+        """Resumen para el HUD"""
+        lines = []
+        for name, histogram in (("tick", self.intervals), ("retraso", self.lateness), ("pintado", self.paints)):
+            p50, p95, p99 = histogram.recent_percentiles()
+            lines.append(f"{name:<8}{p50:6.1f}{p95:6.1f}{p99:6.1f} ms")
+        lines.append(f"cuadros perdidos: {self.dropped_frames}")
+        return "        p50   p95   p99\n" + "\n".join(lines)
+
+    def dump(self, context: Dict = None) -> Optional[str]:
+        """
+        Guarda el histograma de la sesión en la carpeta de registros
+
+        Returns:
+            Ruta del archivo (None si no hubo muestras)
+        """
+        if not (self.intervals.total or self.paints.total):
+            return None
+        data = {
+            'started': self.started.isoformat(timespec='seconds'),
+            'finished': datetime.now().isoformat(timespec='seconds'),
+            'machine': {
+                'platform': platform.platform(),
+                'processor': platform.processor(),
+                'python': platform.python_version(),
+            },
+            'context': context or {},
+            'dropped_frames': self.dropped_frames,
+            'tick_interval': self.intervals.to_dict(),
+            'tick_lateness': self.lateness.to_dict(),
+            'paint': self.paints.to_dict(),
+        }
+        path = os.path.join(logs_dir(), f"frames_{self.started:%Y%m%d-%H%M%S}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        return path
+
+
+class FrameHud(QLabel):
+    """Superposición con los percentiles en vivo, en la esquina superior derecha"""
+
+    def __init__(self, stats: FrameStats, parent: QWidget):
+        super().__init__(parent)
+        self.stats = stats
+        font = QFont("Courier New")
+        font.setStyleHint(QFont.StyleHint.Monospace)
+        font.setPointSize(10)
+        self.setFont(font)
+        self.setStyleSheet("background-color: rgba(0, 0, 0, 170); color: #7CFC00; padding: 6px;")
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(HUD_REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+        self.paused = False  # Sin refrescos durante la reproducción en modo rendimiento
+        parent.installEventFilter(self)
+
+    def refresh(self):
+        self.setText(self.stats.summary_text())
+        self.adjustSize()
+        self._place()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.raise_()
+        if not self.paused:
+            self.timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.timer.stop()
+
+    def pause(self):
+        """Deja de refrescarse (las mediciones se siguen acumulando en FrameStats)"""
+        self.paused = True
+        self.timer.stop()
+
+    def resume(self):
+        """Muestra lo acumulado y vuelve a refrescarse"""
+        self.paused = False
+        if self.isVisible():
+            self.refresh()
+            self.timer.start()
+
+    def eventFilter(self, obj, event):
+        if obj is self.parent() and event.type() == QEvent.Type.Resize:
+            self._place()
+        return super().eventFilter(obj, event)
+
+    def _place(self):
+        self.move(self.parent().width() - self.width() - 24, 8)
@@ -8,6 +8,8 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 
+from ..utils.tracing import traced
+
 
 class ImportConflictDialog(QDialog):
     """Diálogo para resolver conflictos cuando se importa una canción similar"""
@@ -16,6 +18,7 @@ class ImportConflictDialog(QDialog):
     CREATE_NEW = 2
     SKIP = 3
     
+    @traced(category="dialog")
     def __init__(self, existing_song, imported_song, parent=None):
         super().__init__(parent)
         
@@ -3,9 +3,10 @@ Handlers para importar y exportar canciones y sets
 """
 
 from datetime import datetime
+from typing import Tuple
 from PyQt6.QtWidgets import QMessageBox, QDialog
 
-from ..database.models import Song, Set
+from ..database.models import Song, Set, SetSong
 from ..utils.import_export import songs_are_similar
 
 
@@ -18,6 +19,25 @@ class ImportExportHandler:
     
     def import_songs(self, songs_data):
         """Importa canciones con manejo de conflictos"""
+        imported_count, replaced_count, skipped_count = self.add_imported_songs(songs_data)
+        
+        # Mostrar resumen
+        summary = f"Importación completada:\n\n"
+        summary += f"• Canciones nuevas importadas: {imported_count}\n"
+        summary += f"• Canciones reemplazadas: {replaced_count}\n"
+        summary += f"• Canciones omitidas: {skipped_count}"
+        
+        QMessageBox.information(self.main_window, "Importación Completa", summary)
+        
+        return imported_count + replaced_count > 0  # True si hubo cambios
+    
+    def add_imported_songs(self, songs_data) -> Tuple[int, int, int]:
+        """
+        Guarda las canciones importadas, preguntando qué hacer en cada conflicto
+        
+        Returns:
+            (canciones nuevas, reemplazadas, omitidas)
+        """
         from .import_conflict_dialog import ImportConflictDialog
         
         imported_count = 0
@@ -44,13 +64,14 @@ class ImportExportHandler:
                 }
                 
                 dialog = ImportConflictDialog(existing_dict, song_dict, self.main_window)
+                accepted = dialog.exec() == QDialog.DialogCode.Accepted
+                action = dialog.get_action()
+                dialog.deleteLater()  # Uno por conflicto: no deben quedar vivos hasta cerrar la aplicación
                 
-                if dialog.exec() != QDialog.DialogCode.Accepted:
+                if not accepted:
                     # Usuario canceló
                     break
                 
-                action = dialog.get_action()
-                
                 if action == ImportConflictDialog.SKIP:
                     skipped_count += 1
                     continue
@@ -79,18 +100,28 @@ class ImportExportHandler:
                 self._create_song_from_dict(song_dict)
                 imported_count += 1
         
+        return imported_count, replaced_count, skipped_count
+    
+    def import_sets(self, sets_data):
+        """Importa sets con sus canciones"""
+        imported_sets, imported_songs = self.add_imported_sets(sets_data)
+        
         # Mostrar resumen
         summary = f"Importación completada:\n\n"
-        summary += f"• Canciones nuevas importadas: {imported_count}\n"
-        summary += f"• Canciones reemplazadas: {replaced_count}\n"
-        summary += f"• Canciones omitidas: {skipped_count}"
+        summary += f"• Sets importados: {imported_sets}\n"
+        summary += f"• Canciones nuevas: {imported_songs}"
         
         QMessageBox.information(self.main_window, "Importación Completa", summary)
         
-        return imported_count + replaced_count > 0  # True si hubo cambios
+        return True  # Hubo cambios
     
-    def import_sets(self, sets_data):
-        """Importa sets con sus canciones"""
+    def add_imported_sets(self, sets_data) -> Tuple[int, int]:
+        """
+        Guarda los sets importados, creando las canciones que no existan
+        
+        Returns:
+            (sets importados, canciones nuevas)
+        """
         imported_sets = 0
         imported_songs = 0
         
@@ -128,22 +159,15 @@ class ImportExportHandler:
                     song_id = existing_song.id
                 
                 # Agregar al set con configuración
-                self.db.add_song_to_set(
-                    set_id,
-                    song_id,
-                    song_config.get('song_order', 0),
-                    song_config.get('scroll_speed', 50),
-                    song_config.get('transposition', 0)
-                )
+                self.db.add_song_to_set(SetSong(
+                    set_id=set_id,
+                    song_id=song_id,
+                    order=song_config.get('song_order', 0),
+                    scroll_speed=song_config.get('scroll_speed', 50),
+                    transposition=song_config.get('transposition', 0)
+                ))
         
-        # Mostrar resumen
-        summary = f"Importación completada:\n\n"
-        summary += f"• Sets importados: {imported_sets}\n"
-        summary += f"• Canciones nuevas: {imported_songs}"
-        
-        QMessageBox.information(self.main_window, "Importación Completa", summary)
-        
-        return True  # Hubo cambios
+        return imported_sets, imported_songs
     
     def _create_song_from_dict(self, song_dict):
         """Crea una canción desde un diccionario y la guarda en la BD"""
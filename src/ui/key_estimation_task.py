@@ -0,0 +1,71 @@
+"""
+Estimación de tonalidades en segundo plano desde la interfaz
+
+Envuelve un KeyEstimation (que corre en otro hilo) con un QTimer que lo
+consulta y avisa en el hilo de la interfaz cuando termina. Es un trabajo de
+background_tasks: durante la reproducción en modo rendimiento no reparte más
+lotes, el timer se detiene y el aviso (que guarda en la base y recarga las
+listas) espera hasta que se reanude.
+"""
+
+from typing import Optional, Sequence, Tuple
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from ..utils.key_detection import start_key_estimation
+from ..utils.performance_mode import BackgroundTasks, background_tasks
+
+
+# Cada cuánto se consulta si terminó (ms)
+POLL_INTERVAL_MS = 100
+
+
+class KeyEstimationTask(QObject):
+    """Estimación en curso, pausable, que emite finished con los resultados"""
+
+    finished = pyqtSignal(list)  # [(song_id, tonalidad, confianza)]
+    failed = pyqtSignal(str)
+
+    def __init__(self, songs: Sequence[Tuple[int, str, Optional[bytes], Optional[str]]],
+                 parent: QObject = None, tasks: BackgroundTasks = background_tasks):
+        super().__init__(parent)
+        self.tasks = tasks
+        self.paused = False
+        self.estimation = start_key_estimation(songs)
+        self.timer = QTimer(self)
+        self.timer.setInterval(POLL_INTERVAL_MS)
+        self.timer.timeout.connect(self.poll)
+        # Si se lanza durante una reproducción, el registro la deja pausada
+        tasks.register(self)
+        if not self.paused:
+            self.timer.start()
+
+    def pause(self):
+        """Deja de repartir lotes y de consultar (los resultados esperan a resume)"""
+        self.paused = True
+        self.timer.stop()
+        self.estimation.pause()
+
+    def resume(self):
+        self.paused = False
+        self.estimation.resume()
+        self.timer.start()
+
+    def cancel(self):
+        """Abandona la estimación sin avisar (al cerrar la ventana)"""
+        self.timer.stop()
+        self.tasks.unregister(self)
+        self.estimation.cancel()
+
+    def poll(self):
+        """Cuando la estimación terminó, avisa con los resultados"""
+        if self.paused or not self.estimation.done():
+            return
+        self.timer.stop()
+        self.tasks.unregister(self)
+        try:
+            results = self.estimation.result()
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.finished.emit(results)
@@ -0,0 +1,433 @@
+"""
+Vista de letras virtualizada por líneas para el reproductor
+
+En lugar de pasar por el motor de texto enriquecido de QTextEdit, la letra
+se maqueta una sola vez en líneas de altura fija. Cada línea se convierte en
+un QStaticText (ya "moldeado") la primera vez que se ve, el repintado solo
+dibuja la franja visible, y al desplazar se copia la parte que sigue en
+pantalla y solo se pintan los píxeles nuevos. El costo de cada cuadro no
+depende del largo de la canción.
+"""
+
+import bisect
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from PyQt6.QtWidgets import QAbstractScrollArea
+from PyQt6.QtCore import Qt, QEvent, QPointF, pyqtSignal
+from PyQt6.QtGui import QFont, QFontMetricsF, QPainter, QPalette, QStaticText, QTransform
+
+from ..utils.lyrics_wrap import widest_line, wrap_lyrics_with_sources
+from ..utils.pagination import paginate
+
+
+# Margen interno alrededor del texto (el mismo que usa QTextDocument por defecto)
+DOCUMENT_MARGIN = 4
+# Maquetados que se conservan (canciones × tamaños de fuente × anchos recientes)
+DEFAULT_LAYOUT_CACHE_SIZE = 32
+# Separación entre páginas cuando se muestran dos lado a lado
+PAGE_GAP = 40
+
+
+class LyricsLayout:
+    """
+    Letra maquetada en líneas de altura fija para una fuente y un ancho
+
+    Las líneas largas se ajustan con wrap_lyrics, que corta cada par
+    acordes/letra en la misma columna.
+    """
+
+    def __init__(self, text: str, font: QFont, width: int, revision: Hashable = None):
+        """
+        Args:
+            text: Texto plano a mostrar
+            font: Fuente (monoespaciada) de la letra
+            width: Ancho disponible en píxeles (0 = sin ajuste de línea)
+            revision: Identifica el texto (canción, versión, transposición) para el caché
+        """
+        self.text = text or ""
+        self.revision = revision
+        self.font = QFont(font)
+        self.width = width
+
+        metrics = QFontMetricsF(self.font)
+        self.line_height = metrics.lineSpacing()
+        self.char_width = metrics.horizontalAdvance('M')
+        self.widest = widest_line(self.text)
+        self.columns = self.effective_columns(self.columns_for(width, self.char_width), self.widest)
+        # source_starts[i] = primera línea mostrada de la línea i del texto original
+        self.lines, self.source_starts = wrap_lyrics_with_sources(self.text, self.columns)
+
+        # QStaticText de cada línea, creado la primera vez que se necesita
+        self._static: List[Optional[QStaticText]] = [None] * len(self.lines)
+        # Inicio de cada página por cantidad de líneas por página
+        self._page_starts: Dict[int, List[int]] = {}
+
+    @staticmethod
+    def columns_for(width: int, char_width: float) -> int:
+        """Caracteres que entran en el ancho indicado (0 si no hay ajuste de línea)"""
+        if width <= 0 or char_width <= 0:
+            return 0
+        return max(1, int((width - 2 * DOCUMENT_MARGIN) // char_width))
+
+    @staticmethod
+    def effective_columns(columns: int, widest: int) -> int:
+        """Columnas de ajuste; 0 si la línea más larga ya entra (el maquetado no depende del ancho)"""
+        return 0 if columns <= 0 or columns >= widest else columns
+
+    @property
+    def height(self) -> int:
+        """Alto total del contenido en píxeles"""
+        return math.ceil(len(self.lines) * self.line_height + 2 * DOCUMENT_MARGIN)
+
+    def line_top(self, index: int) -> float:
+        """Coordenada y del borde superior de una línea"""
+        return DOCUMENT_MARGIN + index * self.line_height
+
+    def display_line(self, source_line: int) -> int:
+        """Línea mostrada donde empieza una línea del texto original"""
+        if not self.source_starts:
+            return 0
+        return self.source_starts[max(0, min(source_line, len(self.source_starts) - 1))]
+
+    def line_range(self, top: float, bottom: float) -> Tuple[int, int]:
+        """Líneas (desde, hasta exclusivo) que tocan la franja vertical [top, bottom)"""
+        first = max(0, int((top - DOCUMENT_MARGIN) // self.line_height))
+        last = min(len(self.lines), int(math.ceil((bottom - DOCUMENT_MARGIN) / self.line_height)))
+        return first, max(first, last)
+
+    def static_text(self, index: int) -> QStaticText:
+        """QStaticText ya preparado de una línea"""
+        static = self._static[index]
+        if static is None:
+            static = QStaticText(self.lines[index])
+            static.setTextFormat(Qt.TextFormat.PlainText)
+            static.prepare(QTransform(), self.font)
+            self._static[index] = static
+        return static
+
+    def prepare(self, first: int, last: int):
+        """Prepara por adelantado las líneas [first, last) (por ejemplo, la primera pantalla)"""
+        for index in range(max(0, first), min(len(self.lines), last)):
+            self.static_text(index)
+
+    def lines_per_page(self, height: int) -> int:
+        """Líneas que entran en una página del alto indicado"""
+        return max(1, int((height - 2 * DOCUMENT_MARGIN) // self.line_height))
+
+    def page_starts(self, height: int) -> List[int]:
+        """Primera línea de cada página para un alto de página (calculado una sola vez)"""
+        lines_per_page = self.lines_per_page(height)
+        starts = self._page_starts.get(lines_per_page)
+        if starts is None:
+            starts = self._page_starts[lines_per_page] = paginate(self.lines, lines_per_page)
+        return starts
+
+    def matches(self, font: QFont, width: int) -> bool:
+        """Indica si este maquetado sirve para la fuente y el ancho indicados"""
+        if font != self.font:
+            return False
+        return self.effective_columns(self.columns_for(width, self.char_width), self.widest) == self.columns
+
+
+class LayoutCache:
+    """
+    Maquetados recientes con desalojo LRU
+
+    La clave es (revisión, fuente, columnas): el ancho se normaliza a la
+    cantidad de caracteres que entran, y a 0 si la línea más larga de la
+    canción ya entra. Así, al cambiar el ancho solo se vuelven a maquetar las
+    canciones que efectivamente necesitan otro ajuste de línea, e ir y volver
+    entre tamaños de fuente o anchos ya vistos no vuelve a maquetar.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_LAYOUT_CACHE_SIZE):
+        self.capacity = capacity
+        self._layouts: "OrderedDict[Tuple, LyricsLayout]" = OrderedDict()
+        self._char_widths: Dict[str, float] = {}  # font.key() -> ancho de un carácter
+        self._widest: Dict[Hashable, int] = {}  # revisión -> largo de la línea más larga
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, revision: Hashable, text: str, font: QFont, width: int) -> LyricsLayout:
+        """Retorna el maquetado de un texto, armándolo solo si no estaba en caché"""
+        key = self._key(revision, text, font, width)
+        layout = self._layouts.get(key)
+        if layout is not None:
+            self._layouts.move_to_end(key)
+            self.hits += 1
+            return layout
+
+        self.misses += 1
+        layout = LyricsLayout(text, font, width, revision)
+        self._layouts[key] = layout
+        while len(self._layouts) > self.capacity:
+            (evicted, _, _), _ = self._layouts.popitem(last=False)
+            # El largo de la línea más larga se guarda mientras quede algún maquetado de esa revisión
+            if not any(other[0] == evicted for other in self._layouts):
+                self._widest.pop(evicted, None)
+        return layout
+
+    def discard(self, revision: Hashable):
+        """Descarta los maquetados de una revisión (de una canción que se liberó de memoria)"""
+        for key in [key for key in self._layouts if key[0] == revision]:
+            del self._layouts[key]
+        self._widest.pop(revision, None)
+
+    def clear(self):
+        """Descarta todos los maquetados"""
+        self._layouts.clear()
+        self._widest.clear()
+
+    def __len__(self):
+        return len(self._layouts)
+
+    def _key(self, revision: Hashable, text: str, font: QFont, width: int) -> Tuple:
+        font_key = font.key()
+        char_width = self._char_widths.get(font_key)
+        if char_width is None:
+            char_width = QFontMetricsF(font).horizontalAdvance('M')
+            self._char_widths[font_key] = char_width
+        widest = self._widest.get(revision)
+        if widest is None:
+            widest = self._widest[revision] = widest_line(text)
+        columns = LyricsLayout.effective_columns(LyricsLayout.columns_for(width, char_width), widest)
+        return revision, font_key, columns
+
+
+class LyricsView(QAbstractScrollArea):
+    """
+    Muestra un LyricsLayout pintando solo las líneas visibles
+
+    En modo de páginas no hay scroll: se muestran una o dos páginas lado a
+    lado y pasar de página solo cambia el índice de la página actual.
+    """
+
+    # Emitida al mostrar otro maquetado (otra canción, fuente o ancho)
+    layout_changed = pyqtSignal()
+    # Emitida al pasar de página en modo de páginas
+    page_changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._layout: Optional[LyricsLayout] = None
+        # Caché compartido (opcional) para rehacer maquetados al cambiar fuente o ancho
+        self.layout_cache: Optional[LayoutCache] = None
+        # Medición opcional de cada repintado (ver frame_hud.FrameStats)
+        self.frame_stats = None
+
+        self.page_mode = False
+        self.pages_per_spread = 1
+        self.current_page = 0
+        self._page_line = 0  # Primera línea de la página actual (se conserva al repaginar)
+
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+
+    def lyrics_layout(self) -> Optional[LyricsLayout]:
+        """Maquetado que se está mostrando"""
+        return self._layout
+
+    def set_text(self, text: str, revision: Hashable = None):
+        """Muestra un texto maquetándolo con la fuente y el ancho actuales"""
+        self.set_layout(self._build(text, revision))
+
+    def text_width(self) -> int:
+        """Ancho de una columna de texto (la mitad del área si se muestran dos páginas)"""
+        width = self.viewport().width()
+        if self.page_mode and self.pages_per_spread > 1:
+            width = (width - PAGE_GAP * (self.pages_per_spread - 1)) // self.pages_per_spread
+        return width
+
+    def set_page_mode(self, enabled: bool, pages_per_spread: int = 1):
+        """Activa el modo de páginas (una o dos lado a lado) o vuelve al scroll continuo"""
+        anchor = self._anchor_position()
+        self.page_mode = enabled
+        self.pages_per_spread = max(1, pages_per_spread) if enabled else 1
+        self.setVerticalScrollBarPolicy(
+            Qt.ScrollBarPolicy.ScrollBarAlwaysOff if enabled else Qt.ScrollBarPolicy.ScrollBarAsNeeded
+        )
+        if self._layout is not None:
+            self.set_layout(self._layout)
+            self._restore_anchor(anchor)
+
+    def page_count(self) -> int:
+        """Cantidad de páginas de la canción actual"""
+        if self._layout is None:
+            return 0
+        return len(self._layout.page_starts(self.viewport().height()))
+
+    def next_page(self) -> bool:
+        """Avanza una página (o un par de páginas); False si ya está en la última"""
+        if self.current_page + self.pages_per_spread >= self.page_count():
+            return False
+        self.show_page(self.current_page + self.pages_per_spread)
+        return True
+
+    def previous_page(self) -> bool:
+        """Retrocede una página (o un par de páginas); False si ya está en la primera"""
+        if self.current_page == 0:
+            return False
+        self.show_page(max(0, self.current_page - self.pages_per_spread))
+        return True
+
+    def show_page(self, page: int):
+        """Muestra una página (O(1): la paginación ya está calculada)"""
+        self.current_page = page
+        starts = self._layout.page_starts(self.viewport().height())
+        self._page_line = starts[min(page, len(starts) - 1)]
+        self.viewport().update()
+        self.page_changed.emit()
+
+    def content_offset(self) -> int:
+        """Posición actual en píxeles del contenido (arriba de la pantalla o de la página actual)"""
+        if self._layout is None:
+            return 0
+        if self.page_mode:
+            return int(self._layout.line_top(self._page_line) - DOCUMENT_MARGIN)
+        return self.verticalScrollBar().value()
+
+    def show_line(self, line: int):
+        """Lleva una línea mostrada al borde superior (o muestra la página que la contiene)"""
+        if self._layout is None:
+            return
+        if self.page_mode:
+            starts = self._layout.page_starts(self.viewport().height())
+            page = max(0, bisect.bisect_right(starts, line) - 1)
+            self.show_page(page - page % self.pages_per_spread)
+        else:
+            self.verticalScrollBar().setValue(int(self._layout.line_top(line) - DOCUMENT_MARGIN))
+
+    def set_layout(self, layout: LyricsLayout):
+        """Muestra un maquetado ya armado (si no coincide con la vista, se rehace)"""
+        if not layout.matches(self.font(), self.text_width()):
+            layout = self._build(layout.text, layout.revision)
+        self._layout = layout
+        self.current_page = 0
+        self._page_line = 0
+
+        # Dejar lista la primera pantalla antes de pintar
+        first, last = layout.line_range(0, self.viewport().height())
+        layout.prepare(first, last)
+
+        self._update_scrollbar()
+        self.viewport().update()
+        self.layout_changed.emit()
+
+    def text(self) -> str:
+        """Texto que se está mostrando"""
+        return self._layout.text if self._layout is not None else ""
+
+    def _build(self, text: str, revision: Hashable) -> LyricsLayout:
+        width = self.text_width()
+        if self.layout_cache is not None and revision is not None:
+            return self.layout_cache.get(revision, text, self.font(), width)
+        return LyricsLayout(text, self.font(), width, revision)
+
+    def _relayout(self, anchor: Optional[float] = None):
+        """Rehace el maquetado actual si cambió la fuente o el ancho, conservando la posición relativa"""
+        if self._layout is None or self._layout.matches(self.font(), self.text_width()):
+            if anchor is not None:
+                self._restore_anchor(anchor)
+            return
+        if anchor is None:
+            anchor = self._anchor_position()
+        self.set_layout(self._layout)
+        self._restore_anchor(anchor)
+
+    def _anchor_position(self) -> float:
+        """Posición actual como fracción de la canción (scroll) o primera línea visible (páginas)"""
+        if self._layout is None:
+            return 0.0
+        if self.page_mode:
+            return self._page_line / max(1, len(self._layout.lines))
+        scrollbar = self.verticalScrollBar()
+        return scrollbar.value() / scrollbar.maximum() if scrollbar.maximum() > 0 else 0.0
+
+    def _restore_anchor(self, anchor: float):
+        """Vuelve a la posición guardada por _anchor_position en el maquetado actual"""
+        if self.page_mode:
+            starts = self._layout.page_starts(self.viewport().height())
+            line = int(anchor * len(self._layout.lines))
+            page = max(0, bisect.bisect_right(starts, line) - 1)
+            self.show_page(page - page % self.pages_per_spread)
+        else:
+            scrollbar = self.verticalScrollBar()
+            scrollbar.setValue(round(anchor * scrollbar.maximum()))
+
+    def _update_scrollbar(self):
+        scrollbar = self.verticalScrollBar()
+        viewport_height = self.viewport().height()
+        if self._layout is None or self.page_mode:
+            scrollbar.setRange(0, 0)
+            return
+        scrollbar.setRange(0, max(0, self._layout.height - viewport_height))
+        scrollbar.setPageStep(viewport_height)
+        scrollbar.setSingleStep(max(1, round(self._layout.line_height)))
+
+    def scrollContentsBy(self, dx: int, dy: int):
+        """Copia la parte que sigue visible; solo se repinta la franja nueva"""
+        self.viewport().scroll(dx, dy)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # En modo de páginas la paginación cambia con el alto: volver a la página de la misma línea
+        self._relayout(self._anchor_position() if self.page_mode else None)
+        self._update_scrollbar()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.FontChange:
+            self._relayout()
+
+    def paintEvent(self, event):
+        if self.frame_stats is None:
+            self._paint(event)
+            return
+        started = time.perf_counter()
+        self._paint(event)
+        self.frame_stats.record_paint((time.perf_counter() - started) * 1000)
+
+    def _paint(self, event):
+        layout = self._layout
+        if layout is None:
+            return
+        if self.page_mode:
+            self._paint_pages(layout)
+            return
+
+        offset = self.verticalScrollBar().value()
+        exposed = event.rect()
+        first, last = layout.line_range(offset + exposed.top(), offset + exposed.bottom() + 1)
+
+        painter = QPainter(self.viewport())
+        painter.setFont(layout.font)
+        painter.setPen(self.palette().color(QPalette.ColorRole.Text))
+        for index in range(first, last):
+            if layout.lines[index]:
+                position = QPointF(DOCUMENT_MARGIN, layout.line_top(index) - offset)
+                painter.drawStaticText(position, layout.static_text(index))
+        painter.end()
+
+    def _paint_pages(self, layout: LyricsLayout):
+        """Pinta la página actual (y la siguiente si se muestran dos)"""
+        starts = layout.page_starts(self.viewport().height())
+        column_width = self.text_width() + PAGE_GAP
+
+        painter = QPainter(self.viewport())
+        painter.setFont(layout.font)
+        painter.setPen(self.palette().color(QPalette.ColorRole.Text))
+        for column in range(self.pages_per_spread):
+            page = self.current_page + column
+            if page >= len(starts):
+                break
+            first = starts[page]
+            last = starts[page + 1] if page + 1 < len(starts) else len(layout.lines)
+            last = min(last, first + layout.lines_per_page(self.viewport().height()))
+            for index in range(first, last):
+                if layout.lines[index]:
+                    position = QPointF(DOCUMENT_MARGIN + column * column_width, layout.line_top(index - first))
+                    painter.drawStaticText(position, layout.static_text(index))
+        painter.end()
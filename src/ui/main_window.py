@@ -14,6 +14,11 @@ from PyQt6.QtGui import QFont, QAction
 from ..database.db_manager import DatabaseManager
 from ..database.models import Song, SetSong
 from ..utils.settings import Settings
+from ..utils.stall_watchdog import StallWatchdog
+from ..utils.memory_profiler import MemoryProfiler
+from ..utils.performance_mode import background_tasks
+from ..utils.tracing import traced
+from ..utils.timing_map import TimingMap
 from ..utils.import_export import (
     export_songs_to_json, export_sets_to_json, save_json_to_file,
     load_json_from_file, validate_import_data
@@ -21,10 +26,13 @@ from ..utils.import_export import (
 from .song_editor import SongEditorDialog
 from .set_manager import SetManagerDialog
 from .player_window import PlayerWindow
+from .player_process import PlayerProcess
+from .key_estimation_task import KeyEstimationTask
 from .song_preview import SongPreviewDialog
 from .song_list_delegate import SongListDelegate
 from .import_export_handler import ImportExportHandler
 from .settings_dialog import SettingsDialog
+from .diagnostics_dialog import DiagnosticsDialog
 
 
 class MainWindow(QMainWindow):
@@ -35,7 +43,18 @@ class MainWindow(QMainWindow):
         
         self.db = DatabaseManager()
         self.settings = Settings()
+        self.db.query_stats.slow_query_ms = self.settings.get_slow_query_ms()
         self.import_export = ImportExportHandler(self, self.db)
+        self.player_process = None  # Reproductor en proceso propio (si está activada la opción)
+        self.player_window = None
+        self.memory_profiler = MemoryProfiler()  # Línea base del diálogo de diagnóstico
+        
+        # Estimación de tonalidades en segundo plano (se pausa durante la reproducción)
+        self.key_estimation = None
+        
+        # Registro de bloqueos de la interfaz (ver utils/stall_watchdog)
+        self.stall_watchdog = None
+        self.apply_stall_watchdog()
         
         self.init_ui()
         self.apply_theme()
@@ -234,6 +253,17 @@ class MainWindow(QMainWindow):
         font_decrease.triggered.connect(lambda: self.change_font_size(-2))
         view_menu.addAction(font_decrease)
         
+        # Menú Herramientas
+        tools_menu = menubar.addMenu("Herramientas")
+        
+        self.detect_keys_action = QAction("🎼 Detectar Tonalidades Faltantes", self)
+        self.detect_keys_action.triggered.connect(self.detect_missing_keys)
+        tools_menu.addAction(self.detect_keys_action)
+        
+        diagnostics_action = QAction("🩺 Diagnóstico", self)
+        diagnostics_action.triggered.connect(self.open_diagnostics)
+        tools_menu.addAction(diagnostics_action)
+        
         # Menú Ayuda
         help_menu = menubar.addMenu("Ayuda")
         
@@ -241,6 +271,7 @@ class MainWindow(QMainWindow):
         about_action.triggered.connect(self.show_about)
         help_menu.addAction(about_action)
     
+    @traced(category="ui")
     def load_data(self):
         """Carga los datos de la base de datos"""
         # Cargar canciones
@@ -427,6 +458,8 @@ class MainWindow(QMainWindow):
             song_id = self.db.add_song(song)
             self.load_data()
             self.statusBar().showMessage(f"Canción '{song.title}' guardada correctamente", 3000)
+        # Los diálogos son hijos de la ventana: sin esto quedan vivos hasta cerrar la aplicación
+        dialog.deleteLater()
     
     def edit_song(self):
         """Abre el diálogo para editar la canción seleccionada"""
@@ -445,6 +478,7 @@ class MainWindow(QMainWindow):
                 self.db.update_song(updated_song)
                 self.load_data()
                 self.statusBar().showMessage(f"Canción '{updated_song.title}' actualizada", 3000)
+            dialog.deleteLater()
     
     def preview_song(self):
         """Abre la vista previa de la canción seleccionada"""
@@ -463,6 +497,7 @@ class MainWindow(QMainWindow):
                 updated_song = dialog.get_song()
                 self.db.update_song(updated_song)
                 self.statusBar().showMessage(f"Velocidad de scroll guardada para '{updated_song.title}'", 3000)
+            dialog.deleteLater()
     
     def delete_song(self):
         """Elimina la canción seleccionada"""
@@ -615,6 +650,7 @@ class MainWindow(QMainWindow):
             
             self.load_data()
             self.statusBar().showMessage(f"Set '{set_obj.name}' guardado correctamente", 3000)
+        dialog.deleteLater()
     
     def edit_set(self):
         """Abre el diálogo para editar el set seleccionado"""
@@ -631,34 +667,24 @@ class MainWindow(QMainWindow):
                 dialog = SetManagerDialog(self, self.db, s)
                 if dialog.exec():
                     updated_set = dialog.get_set()
+                    updated_set.id = set_id
                     set_songs = dialog.get_set_songs()
                     
-                    # Actualizar nombre del set
-                    self.db.connection.execute(
-                        "UPDATE sets SET name = ? WHERE id = ?",
-                        (updated_set.name, set_id)
-                    )
-                    
-                    # Eliminar canciones anteriores del set
-                    self.db.connection.execute(
-                        "DELETE FROM set_songs WHERE set_id = ?",
-                        (set_id,)
-                    )
-                    
-                    # Agregar canciones actualizadas
-                    for order, song_config in enumerate(set_songs):
-                        set_song = SetSong(
+                    # Nombre y canciones actualizadas (reemplazan a las anteriores)
+                    self.db.update_set(updated_set, [
+                        SetSong(
                             set_id=set_id,
                             song_id=song_config['song'].id,
                             order=order,
                             scroll_speed=song_config['scroll_speed'],
-                            transposition=song_config['transposition']
+                            transposition=song_config['transposition'],
+                            timing_map=song_config.get('timing_map')
                         )
-                        self.db.add_song_to_set(set_song)
-                    
-                    self.db.connection.commit()
+                        for order, song_config in enumerate(set_songs)
+                    ])
                     self.load_data()
                     self.statusBar().showMessage(f"Set '{updated_set.name}' actualizado", 3000)
+                dialog.deleteLater()
                 break
     
     def play_set(self):
@@ -680,8 +706,8 @@ class MainWindow(QMainWindow):
         if not set_obj:
             return
         
-        # Obtener canciones del set con configuración
-        set_songs_rows = self.db.get_set_songs(set_id)
+        # Obtener canciones del set con configuración (la letra se carga en el reproductor)
+        set_songs_rows = self.db.get_set_song_entries(set_id)
         
         if not set_songs_rows:
             QMessageBox.warning(self, "Advertencia", "Este set no tiene canciones")
@@ -690,30 +716,61 @@ class MainWindow(QMainWindow):
         # Construir lista de canciones con configuración
         set_songs = []
         for row in set_songs_rows:
-            song = Song(
-                id=row['id'],
-                title=row['title'],
-                artist=row['artist'],
-                original_key=row['original_key'],
-                lyrics_with_chords=row['lyrics_with_chords'],
-                bpm=row['bpm']
-            )
-            
             set_songs.append({
-                'song': song,
+                'song_id': row['song_id'],
+                'title': row['title'],
+                'artist': row['artist'],
                 'scroll_speed': row['scroll_speed'],
-                'transposition': row['transposition']
+                'transposition': row['transposition'],
+                'set_song_id': row['set_song_id'],
+                'timing_map': TimingMap.decode(row['timing_map'])
             })
         
-        # Abrir ventana de reproducción
+        # En un proceso propio, el trabajo de esta ventana no frena el scroll
+        if self.settings.get_player_separate_process():
+            self.start_player_process(set_songs, set_obj.name)
+            return
+        
+        # Abrir ventana de reproducción (se destruye al cerrarla, no queda colgada de esta ventana)
+        if self.player_window is not None:
+            self.player_window.destroyed.disconnect(self.on_player_window_destroyed)
+            self.player_window.close()
         self.player_window = PlayerWindow(
             parent=self,
             set_songs=set_songs,
             set_name=set_obj.name,
-            settings=self.settings
+            settings=self.settings,
+            fetch_song=self.db.get_song
         )
+        self.player_window.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self.player_window.destroyed.connect(self.on_player_window_destroyed)
+        self.player_window.timing_map_recorded.connect(self.db.update_set_song_timing)
+        self.player_window.scroll_speed_changed.connect(self.db.update_set_song_speed)
         self.player_window.show()
     
+    def on_player_window_destroyed(self):
+        self.player_window = None
+    
+    def start_player_process(self, set_songs, set_name: str):
+        """Lanza el reproductor en un proceso separado y guarda lo que devuelva"""
+        if self.player_process is None:
+            self.player_process = PlayerProcess(self)
+            self.player_process.speed_changed.connect(self.db.update_set_song_speed)
+            self.player_process.timing_map_recorded.connect(self.db.update_set_song_timing)
+            self.player_process.closed.connect(lambda: self.statusBar().showMessage("Reproductor cerrado", 3000))
+        
+        count = len(set_songs)
+        try:
+            self.player_process.song_changed.disconnect()
+        except TypeError:
+            pass
+        self.player_process.song_changed.connect(
+            lambda index: self.statusBar().showMessage(
+                f"▶ {set_name}: {set_songs[index]['title']} ({index + 1}/{count})"
+            )
+        )
+        self.player_process.start(set_songs, set_name, self.db.db_path)
+    
     def delete_set(self):
         """Elimina el set seleccionado"""
         current_item = self.sets_list.currentItem()
@@ -825,10 +882,69 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error al importar: {str(e)}")
     
+    def detect_missing_keys(self):
+        """Estima en segundo plano la tonalidad de todas las canciones que no la tienen"""
+        if self.key_estimation is not None:
+            return
+        songs = self.db.get_songs_missing_key()
+        if not songs:
+            self.show_key_estimation_result(0)
+            return
+        
+        self.key_estimation = KeyEstimationTask(songs, self)
+        self.key_estimation.finished.connect(self.save_estimated_keys)
+        self.key_estimation.failed.connect(self.on_key_estimation_failed)
+        self.detect_keys_action.setEnabled(False)
+        self.statusBar().showMessage(f"Estimando la tonalidad de {len(songs)} canciones...")
+    
+    def save_estimated_keys(self, estimates):
+        """Cuando termina la estimación, guarda las tonalidades y recarga las listas"""
+        self.finish_key_estimation()
+        try:
+            updated = self.db.update_estimated_keys(estimates)
+        except Exception as e:
+            self.on_key_estimation_failed(str(e))
+            return
+        
+        self.load_data()
+        self.show_key_estimation_result(updated)
+    
+    def on_key_estimation_failed(self, message: str):
+        """Informa el error de la estimación o del guardado"""
+        self.finish_key_estimation()
+        self.statusBar().clearMessage()
+        QMessageBox.critical(self, "Error", f"Error al detectar tonalidades: {message}")
+    
+    def finish_key_estimation(self):
+        """Libera la estimación terminada y vuelve a habilitar la acción del menú"""
+        if self.key_estimation is not None:
+            self.key_estimation.deleteLater()
+            self.key_estimation = None
+        self.detect_keys_action.setEnabled(True)
+    
+    def show_key_estimation_result(self, updated: int):
+        """Informa cuántas canciones recibieron una tonalidad estimada"""
+        QMessageBox.information(
+            self,
+            "Detección de Tonalidades",
+            f"Se estimó la tonalidad de {updated} canciones"
+        )
+    
     def open_settings(self):
         """Abre el diálogo de configuración"""
         dialog = SettingsDialog(self)
+        dialog.settings_changed.connect(self.apply_stall_watchdog)
+        dialog.settings_changed.connect(
+            lambda: setattr(self.db.query_stats, 'slow_query_ms', self.settings.get_slow_query_ms())
+        )
         dialog.exec()
+        dialog.deleteLater()
+    
+    def open_diagnostics(self):
+        """Abre el diálogo de diagnóstico (consultas SQL, bloqueos y memoria)"""
+        dialog = DiagnosticsDialog(self, self.db, self.memory_profiler)
+        dialog.exec()
+        dialog.deleteLater()
     
     def show_about(self):
         """Muestra el diálogo Acerca de"""
@@ -841,8 +957,33 @@ class MainWindow(QMainWindow):
             "<p>Desarrollado con PyQt6 y ❤️</p>"
         )
     
+    def apply_stall_watchdog(self):
+        """Arranca, ajusta o detiene la vigilancia de bloqueos según la configuración"""
+        threshold = self.settings.get_stall_threshold_ms()
+        if threshold <= 0:
+            if self.stall_watchdog is not None:
+                background_tasks.unregister(self.stall_watchdog)
+                self.stall_watchdog.stop()
+                self.stall_watchdog = None
+            return
+        if self.stall_watchdog is None:
+            self.stall_watchdog = StallWatchdog(self, threshold)
+            self.stall_watchdog.start()
+            # El latido se pausa mientras el reproductor está en modo rendimiento
+            background_tasks.register(self.stall_watchdog)
+        self.stall_watchdog.threshold_ms = threshold
+    
     def closeEvent(self, event):
         """Guarda la configuración antes de cerrar"""
         self.settings.set_window_geometry(self.saveGeometry())
+        if self.player_process is not None:
+            self.player_process.stop()  # Antes de cerrar la base, para guardar lo pendiente
+        if self.stall_watchdog is not None:
+            background_tasks.unregister(self.stall_watchdog)
+            self.stall_watchdog.stop()
+        # Una estimación de tonalidades en curso se abandona (aunque esté en pausa)
+        if self.key_estimation is not None:
+            self.key_estimation.cancel()
+            self.key_estimation = None
         self.db.close()
         event.accept()
@@ -0,0 +1,164 @@
+"""
+Reproductor en un proceso separado
+
+Con el reproductor en la misma ventana, cualquier trabajo largo del hilo de
+la interfaz principal (importar, exportar, recargar la biblioteca) frena el
+scroll, porque comparten el event loop. En un proceso propio el reproductor
+tiene su propio event loop: recibe el set ya preparado por un Pipe, lee las
+letras de la base en modo de solo lectura y devuelve por el mismo canal lo
+que el proceso principal debe guardar (velocidades y mapas de tiempos) y la
+canción que se está mostrando.
+
+Mensajes del reproductor: ('speed', id, velocidad), ('timing_map', id, bytes),
+('position', índice) y ('closed',). Del proceso principal: ('close',).
+"""
+
+import multiprocessing
+import sqlite3
+import sys
+from typing import Dict, List, Optional
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from ..database.db_manager import DatabaseManager
+from ..database.models import Song
+
+
+# Cada cuánto se revisa el canal de control (ms)
+POLL_INTERVAL_MS = 100
+
+
+class _SongReader:
+    """Lee canciones en modo de solo lectura: el proceso principal es el único que escribe"""
+
+    def __init__(self, db_path: str):
+        self.connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        self.connection.row_factory = sqlite3.Row
+
+    def get_song(self, song_id: int) -> Optional[Song]:
+        row = self.connection.execute("SELECT * FROM songs WHERE id = ?", (song_id,)).fetchone()
+        return DatabaseManager.song_from_row(row) if row else None
+
+
+def run_player(connection):
+    """Punto de entrada del proceso del reproductor"""
+    from PyQt6.QtWidgets import QApplication
+    from .player_window import PlayerWindow
+
+    handoff = connection.recv()
+    app = QApplication(sys.argv[:1])
+    app.setApplicationName("GimmeLetter")
+    app.setOrganizationName("GimmeLetter")
+
+    reader = _SongReader(handoff['db_path'])
+    window = PlayerWindow(
+        set_songs=handoff['set_songs'],
+        set_name=handoff['set_name'],
+        fetch_song=reader.get_song
+    )
+
+    def send(*message):
+        try:
+            connection.send(message)
+        except (BrokenPipeError, OSError):
+            pass  # El proceso principal ya no está
+
+    window.scroll_speed_changed.connect(lambda set_song_id, speed: send('speed', set_song_id, speed))
+    window.timing_map_recorded.connect(lambda set_song_id, data: send('timing_map', set_song_id, data))
+    window.song_changed.connect(lambda index: send('position', index))
+
+    def poll():
+        try:
+            while connection.poll():
+                if connection.recv()[0] == 'close':
+                    window.close()
+        except (EOFError, OSError):
+            window.close()  # Se cerró el proceso principal
+
+    timer = QTimer()
+    timer.timeout.connect(poll)
+    timer.start(POLL_INTERVAL_MS)
+
+    window.show()
+    send('position', window.current_index)
+    app.exec()
+    send('closed')
+    connection.close()
+
+
+class PlayerProcess(QObject):
+    """Lado del proceso principal: lanza el reproductor y atiende su canal de control"""
+
+    speed_changed = pyqtSignal(int, int)  # (id de set_songs, velocidad)
+    timing_map_recorded = pyqtSignal(int, bytes)  # (id de set_songs, mapa codificado)
+    song_changed = pyqtSignal(int)  # Índice de la canción mostrada
+    closed = pyqtSignal()
+
+    # Función que corre en el proceso hijo (debe poder importarse desde el hijo)
+    entry_point = staticmethod(run_player)
+
+    def __init__(self, parent: QObject = None):
+        super().__init__(parent)
+        self.process = None
+        self.connection = None
+        self.timer = QTimer(self)
+        self.timer.setInterval(POLL_INTERVAL_MS)
+        self.timer.timeout.connect(self.poll)
+
+    def start(self, set_songs: List[Dict], set_name: str, db_path: str):
+        """Lanza el reproductor y le entrega el set preparado"""
+        self.stop()
+        # spawn: un fork de un proceso con Qt no es seguro
+        context = multiprocessing.get_context('spawn')
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(target=self.entry_point, args=(child_connection,), daemon=True)
+        self.process.start()
+        child_connection.close()
+        self.connection.send({'set_songs': set_songs, 'set_name': set_name, 'db_path': db_path})
+        self.timer.start()
+
+    def is_running(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def poll(self):
+        """Atiende los mensajes pendientes del reproductor"""
+        try:
+            while self.connection.poll():
+                message = self.connection.recv()
+                kind = message[0]
+                if kind == 'speed':
+                    self.speed_changed.emit(message[1], message[2])
+                elif kind == 'timing_map':
+                    self.timing_map_recorded.emit(message[1], message[2])
+                elif kind == 'position':
+                    self.song_changed.emit(message[1])
+                elif kind == 'closed':
+                    self._finish()
+                    return
+        except (EOFError, OSError):
+            self._finish()  # El reproductor terminó sin avisar
+            return
+        if not self.process.is_alive():
+            self._finish()
+
+    def stop(self, timeout: float = 2.0):
+        """Cierra el reproductor (guardando antes lo que tenga pendiente)"""
+        if self.process is None:
+            return
+        try:
+            self.connection.send(('close',))
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout)
+        self.poll()
+        if self.process is not None and self.process.is_alive():
+            self.process.terminate()
+            self._finish()
+
+    def _finish(self):
+        self.timer.stop()
+        if self.connection is not None:
+            self.connection.close()
+        self.process = None
+        self.connection = None
+        self.closed.emit()
@@ -2,39 +2,113 @@
 Reproductor de sets con scroll automático
 """
 
+import bisect
+
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLabel, QTextEdit, QSlider, QToolBar, QListWidget, QListWidgetItem
+    QPushButton, QLabel, QSlider, QToolBar, QListWidget, QListWidgetItem, QComboBox
 )
-from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QFont, QAction
+from PyQt6.QtCore import Qt, QTimer, QEvent, QElapsedTimer, pyqtSignal
+from PyQt6.QtGui import QFont, QAction, QKeySequence
 
 from ..database.models import Song
 from ..utils.chord_transposer import ChordTransposer
+from ..utils.lyrics_wrap import widest_line
+from ..utils.performance_mode import PerformanceMode, background_tasks
+from ..utils.song_analysis import NOTATION_LATIN, content_hash, decode_sections, detect_sections
 from ..utils.settings import Settings
+from ..utils.timing_map import PositionTimeline, TimingMap, tap_targets
+from ..utils.tracing import traced
+from .font_fit import FontMetricsTable, MIN_FONT_SIZE, MAX_FONT_SIZE
+from .frame_hud import FrameHud, FrameStats
+from .lyrics_view import DOCUMENT_MARGIN, LayoutCache, LyricsView
+from .scroll_engine import ScrollEngine
+from .song_loader import SongLoader
+from .song_prefetch import SongPrefetcher
 
 
 class PlayerWindow(QMainWindow):
     """Ventana de reproducción con scroll automático"""
     
-    def __init__(self, parent=None, set_songs=None, set_name="Set", settings=None):
+    # (id de set_songs, mapa de tiempos codificado; vacío = borrar el mapa)
+    timing_map_recorded = pyqtSignal(int, bytes)
+    # (id de set_songs, velocidad) cuando se cambia la velocidad de una canción
+    scroll_speed_changed = pyqtSignal(int, int)
+    # Índice de la canción mostrada
+    song_changed = pyqtSignal(int)
+    
+    def __init__(self, parent=None, set_songs=None, set_name="Set", settings=None, fetch_song=None):
         super().__init__(parent)
         
-        self.set_songs = set_songs or []  # Lista de dict con song, scroll_speed, transposition
+        # Lista de dict con song (o song_id, title y artist), scroll_speed, transposition
+        self.set_songs = set_songs or []
+        # Con fetch_song (id -> canción) las letras se cargan a demanda cerca de la actual
+        self.songs = SongLoader(self.set_songs, fetch_song, on_release=self.release_song_layouts)
         self.set_name = set_name
         self.settings = settings or Settings()
         
         self.current_index = 0
         self.is_playing = False
-        self.scroll_position = 0
-        self.scroll_accumulator = 0.0  # Acumulador para movimientos suaves con velocidades bajas
         self.current_font_size = 22  # Tamaño de fuente inicial más grande
-        
-        # Timer para el scroll automático
-        self.scroll_timer = QTimer()
-        self.scroll_timer.timeout.connect(self.auto_scroll)
+        self.fit_to_width = self.settings.get_player_fit_width()
+        
+        # Modo rendimiento: GC congelado y trabajos en segundo plano en pausa mientras se reproduce
+        self.performance = PerformanceMode()
+        self.performance.enabled = self.settings.get_player_performance_mode()
+        self.janks_at_play = 0
+        self.font_metrics_table = FontMetricsTable()
+        
+        # Índice de secciones de la canción actual: nombres y posición en píxeles en el maquetado actual
+        self.sections = []
+        self.section_offsets = []
+        self.current_section = -1
+        self.song_info_text = ""
+        
+        # Grabación del mapa de tiempos (un toque por línea durante el ensayo)
+        self.recording_map = None
+        self.recording_index = 0
+        self.record_targets = []
+        self.record_clock = QElapsedTimer()
+        
+        # La velocidad se informa al dejar de moverla, no en cada paso del slider
+        self.pending_speed = None
+        self.speed_save_timer = QTimer(self)
+        self.speed_save_timer.setSingleShot(True)
+        self.speed_save_timer.setInterval(800)
+        self.speed_save_timer.timeout.connect(self.flush_speed_change)
         
         self.init_ui()
+        
+        # Motor de scroll basado en tiempo (no depende de que cada tick llegue a horario)
+        self.scroll_engine = ScrollEngine(self.lyrics_display.verticalScrollBar(), self)
+        self.scroll_engine.finished.connect(self.on_scroll_finished)
+        self.scroll_engine.watch_visibility(self)
+        
+        # Maquetados recientes (zoom y cambios de ancho instantáneos) y preparación anticipada
+        self.layout_cache = LayoutCache()
+        self.lyrics_display.layout_cache = self.layout_cache
+        self.prefetcher = SongPrefetcher(self, self.prepare_lyrics, self.song_revision, self.layout_cache,
+                                         viewport=self.lyrics_display.viewport())
+        background_tasks.register(self.prefetcher)
+        self.lyrics_display.viewport().installEventFilter(self)
+        
+        # Métricas de fluidez (HUD) si quedaron activadas
+        self.frame_stats = None
+        self.frame_hud = None
+        if self.settings.get_player_frame_hud():
+            self.frame_hud_action.setChecked(True)
+        
+        # Sección actual: se recalcula al moverse, con búsqueda binaria sobre las posiciones
+        self.lyrics_display.layout_changed.connect(self.update_section_offsets)
+        self.lyrics_display.layout_changed.connect(self.update_timeline)
+        self.lyrics_display.page_changed.connect(self.update_current_section)
+        self.lyrics_display.verticalScrollBar().valueChanged.connect(self.update_current_section)
+        
+        pages = self.page_mode_combo.currentData()
+        if pages:
+            self.lyrics_display.set_page_mode(True, pages)
+            self.play_pause_btn.setEnabled(False)
+        
         self.load_song()
         self.apply_theme()
     
@@ -71,9 +145,8 @@ class PlayerWindow(QMainWindow):
         self.song_info_label.setFont(info_font)
         right_layout.addWidget(self.song_info_label)
         
-        # Área de texto con letra y acordes
-        self.lyrics_display = QTextEdit()
-        self.lyrics_display.setReadOnly(True)
+        # Área de texto con letra y acordes (solo pinta las líneas visibles)
+        self.lyrics_display = LyricsView()
         
         # Fuente monoespaciada para los acordes - más grande para mejor lectura
         mono_font = QFont("Monaco, Courier New, monospace")
@@ -104,9 +177,8 @@ class PlayerWindow(QMainWindow):
         self.song_list.setFont(list_font)
         
         # Poblar la lista
-        for i, song_config in enumerate(self.set_songs):
-            song = song_config['song']
-            item_text = f"{i + 1}. {song.title}\n   {song.artist}"
+        for i in range(len(self.set_songs)):
+            item_text = f"{i + 1}. {self.songs.title(i)}"
             item = QListWidgetItem(item_text)
             self.song_list.addItem(item)
         
@@ -141,6 +213,13 @@ class PlayerWindow(QMainWindow):
         fullscreen_action.triggered.connect(self.toggle_fullscreen)
         toolbar.addAction(fullscreen_action)
         
+        # Métricas de fluidez del scroll
+        self.frame_hud_action = QAction("📊 Métricas (F3)", self)
+        self.frame_hud_action.setCheckable(True)
+        self.frame_hud_action.setShortcut(Qt.Key.Key_F3)
+        self.frame_hud_action.toggled.connect(self.set_frame_hud)
+        toolbar.addAction(self.frame_hud_action)
+        
         return toolbar
     
     def create_controls(self):
@@ -186,6 +265,31 @@ class PlayerWindow(QMainWindow):
         font_plus_btn.setMaximumWidth(40)
         speed_font_layout.addWidget(font_plus_btn)
         
+        # Ajustar el tamaño para que la línea más ancha entre sin cortarse
+        self.fit_width_btn = QPushButton("↔ Ajustar al ancho")
+        self.fit_width_btn.setCheckable(True)
+        self.fit_width_btn.setChecked(self.fit_to_width)
+        self.fit_width_btn.toggled.connect(self.set_fit_to_width)
+        speed_font_layout.addWidget(self.fit_width_btn)
+        
+        # Scroll continuo o páginas (para pasar con pedal)
+        speed_font_layout.addSpacing(20)
+        speed_font_layout.addWidget(QLabel("Modo:"))
+        self.page_mode_combo = QComboBox()
+        self.page_mode_combo.addItem("Scroll", 0)
+        self.page_mode_combo.addItem("1 página", 1)
+        self.page_mode_combo.addItem("2 páginas", 2)
+        self.page_mode_combo.setCurrentIndex(max(0, self.page_mode_combo.findData(self.settings.get_player_page_mode())))
+        self.page_mode_combo.currentIndexChanged.connect(self.on_page_mode_changed)
+        speed_font_layout.addWidget(self.page_mode_combo)
+        
+        self.performance_btn = QPushButton("⚡ Rendimiento")
+        self.performance_btn.setCheckable(True)
+        self.performance_btn.setChecked(self.performance.enabled)
+        self.performance_btn.setToolTip("Congela el GC y pausa el trabajo en segundo plano mientras se reproduce")
+        self.performance_btn.toggled.connect(self.set_performance_mode)
+        speed_font_layout.addWidget(self.performance_btn)
+        
         controls_layout.addLayout(speed_font_layout)
         
         # Botones de control
@@ -216,6 +320,17 @@ class PlayerWindow(QMainWindow):
         rewind_btn.setMinimumHeight(40)
         buttons_layout.addWidget(rewind_btn)
         
+        # Grabar el mapa de tiempos: Enter marca el comienzo de cada línea
+        self.record_btn = QPushButton("⏺ Grabar tiempos (T)")
+        self.record_btn.setCheckable(True)
+        self.record_btn.setMinimumHeight(40)
+        self.record_btn.setToolTip(
+            "Durante el ensayo, presiona Enter al comenzar cada línea.\n"
+            "Detener sin marcar líneas borra el mapa de la canción."
+        )
+        self.record_btn.toggled.connect(self.toggle_timing_recording)
+        buttons_layout.addWidget(self.record_btn)
+        
         controls_layout.addLayout(buttons_layout)
         
         return controls_layout
@@ -228,15 +343,15 @@ class PlayerWindow(QMainWindow):
         play_action.triggered.connect(self.toggle_play)
         self.addAction(play_action)
         
-        # Flechas para navegar
+        # Flechas para navegar (en modo de páginas pasan de página; los pedales suelen enviar Re/Av Pág)
         next_action = QAction(self)
-        next_action.setShortcut(Qt.Key.Key_Right)
-        next_action.triggered.connect(self.next_song)
+        next_action.setShortcuts([QKeySequence(Qt.Key.Key_Right), QKeySequence(Qt.Key.Key_PageDown)])
+        next_action.triggered.connect(self.next_page_or_song)
         self.addAction(next_action)
         
         prev_action = QAction(self)
-        prev_action.setShortcut(Qt.Key.Key_Left)
-        prev_action.triggered.connect(self.previous_song)
+        prev_action.setShortcuts([QKeySequence(Qt.Key.Key_Left), QKeySequence(Qt.Key.Key_PageUp)])
+        prev_action.triggered.connect(self.previous_page_or_song)
         self.addAction(prev_action)
         
         # ESC para salir de pantalla completa
@@ -251,17 +366,51 @@ class PlayerWindow(QMainWindow):
         f11_action.triggered.connect(self.toggle_fullscreen)
         self.addAction(f11_action)
         
+        # Ctrl +/- para el tamaño de letra
+        zoom_in_action = QAction(self)
+        zoom_in_action.setShortcut(QKeySequence.StandardKey.ZoomIn)
+        zoom_in_action.triggered.connect(lambda: self.change_font_size(2))
+        self.addAction(zoom_in_action)
+        
+        zoom_out_action = QAction(self)
+        zoom_out_action.setShortcut(QKeySequence.StandardKey.ZoomOut)
+        zoom_out_action.triggered.connect(lambda: self.change_font_size(-2))
+        self.addAction(zoom_out_action)
+        
+        # 1-9 para saltar a la sección correspondiente (verso, coro...)
+        for number in range(1, 10):
+            section_action = QAction(self)
+            section_action.setShortcut(QKeySequence(str(number)))
+            section_action.triggered.connect(lambda checked=False, n=number: self.jump_to_section(n - 1))
+            self.addAction(section_action)
+        
+        # T graba el mapa de tiempos y Enter marca cada línea
+        record_action = QAction(self)
+        record_action.setShortcut(Qt.Key.Key_T)
+        record_action.triggered.connect(self.record_btn.toggle)
+        self.addAction(record_action)
+        
+        tap_action = QAction(self)
+        tap_action.setShortcuts([QKeySequence(Qt.Key.Key_Return), QKeySequence(Qt.Key.Key_Enter)])
+        tap_action.triggered.connect(self.tap_timing)
+        self.addAction(tap_action)
+        
         # Backspace para rebobinar
         rewind_action = QAction(self)
         rewind_action.setShortcut(Qt.Key.Key_Backspace)
         rewind_action.triggered.connect(self.rewind)
         self.addAction(rewind_action)
     
+    @traced(category="ui")
     def load_song(self):
         """Carga la canción actual"""
         if not self.set_songs or self.current_index >= len(self.set_songs):
             return
         
+        # Una grabación de tiempos en curso corresponde a la canción anterior
+        if self.recording_map is not None:
+            self.record_btn.setChecked(False)
+        
         # Detener scroll si está reproduciendo
         if self.is_playing:
             self.toggle_play()
@@ -270,7 +419,7 @@ class PlayerWindow(QMainWindow):
         self.song_list.setCurrentRow(self.current_index)
         
         song_config = self.set_songs[self.current_index]
-        song = song_config['song']
+        song = self.songs.song(self.current_index)
         transposition = song_config['transposition']
         scroll_speed = song_config['scroll_speed']
         
@@ -286,83 +435,148 @@ class PlayerWindow(QMainWindow):
             info_text += f" | BPM: {song.bpm}"
         info_text += trans_str
         info_text += f" | Canción {self.current_index + 1}/{len(self.set_songs)}"
+        if song_config.get('timing_map'):
+            info_text += " | ⏱"
         
-        self.song_info_label.setText(info_text)
+        self.song_info_text = info_text
         
-        # Aplicar transposición si es necesario
-        lyrics = song.lyrics_with_chords or ""
-        if transposition != 0:
-            # Detectar si usa notación latina o inglesa
-            # Buscar acordes latinos con word boundaries para evitar falsos positivos
-            import re
-            latin_pattern = r'\b(Do|Re|Mi|Fa|Sol|La|Si)(#|b)?(m|M|maj|min|dim|aug|sus|add|\d)*\b'
-            use_latin = bool(re.search(latin_pattern, lyrics))
-            lyrics = ChordTransposer.transpose_text(lyrics, transposition, use_latin)
+        # Secciones precalculadas al guardar (o detectadas ahora si la canción no viene de la BD)
+        if song.sections is not None:
+            self.sections = decode_sections(song.sections)
+        else:
+            use_latin = song.notation == NOTATION_LATIN if song.notation else None
+            self.sections = detect_sections(song.lyrics_with_chords, use_latin, song.line_kinds)
+        self.current_section = -1
+        
+        # Con el ajuste al ancho activo, elegir el tamaño antes de maquetar
+        if self.fit_to_width:
+            self.apply_fit_to_width()
         
-        self.lyrics_display.setPlainText(lyrics)
+        # Mostrar el maquetado ya preparado (normalmente armado en tiempo ocioso);
+        # las siguientes se preparan después de pintar esta
+        self.configure_prefetch()
+        self.lyrics_display.set_layout(self.prefetcher.get(self.current_index))
+        self.prefetcher.schedule(self.current_index, len(self.set_songs))
+        self.songs.retain(self.current_index)
         
         # Configurar velocidad
         self.speed_slider.setValue(scroll_speed)
+        self.scroll_engine.set_speed(self.speed_slider.value())
         
         # Resetear scroll
         self.reset_scroll()
+        self.song_changed.emit(self.current_index)
+    
+    def prepare_lyrics(self, index: int) -> str:
+        """Texto a mostrar de una canción del set (con la transposición aplicada)"""
+        song_config = self.set_songs[index]
+        song = self.songs.song(index)
+        transposition = song_config['transposition']
+        
+        lyrics = song.lyrics_with_chords or ""
+        if transposition != 0:
+            # La notación y la clasificación de líneas vienen precalculadas al guardar
+            if song.notation:
+                use_latin = song.notation == NOTATION_LATIN
+            else:
+                use_latin = ChordTransposer.detect_latin(lyrics)
+            lyrics = ChordTransposer.transpose_text(
+                lyrics, transposition, use_latin, line_kinds=song.line_kinds
+            )
+        return lyrics
+    
+    def release_song_layouts(self, index: int):
+        """Descarta los maquetados de una canción que se libera de memoria"""
+        self.layout_cache.discard(self.song_revision(index))
+    
+    def song_revision(self, index: int):
+        """Identifica el texto a mostrar: cambia si se edita la canción o su transposición"""
+        song_config = self.set_songs[index]
+        song = self.songs.song(index)
+        return (
+            song.id,
+            song.content_hash or content_hash(song.lyrics_with_chords),
+            song_config['transposition'],
+        )
     
     def toggle_play(self):
         """Alterna entre reproducir y pausar"""
+        if self.lyrics_display.page_mode and not self.is_playing:
+            return  # En modo de páginas no hay scroll automático
         self.is_playing = not self.is_playing
         
         if self.is_playing:
             self.play_pause_btn.setText("⏸ Pausar (Space)")
-            # Iniciar timer con intervalo de 50ms para scroll suave
-            self.scroll_timer.start(50)
+            self.performance.begin()
+            self.janks_at_play = self.scroll_engine.janks
+            self.scroll_engine.start()
         else:
             self.play_pause_btn.setText("▶ Reproducir (Space)")
-            self.scroll_timer.stop()
+            self.scroll_engine.stop()
+            self.performance.end()
+            self.update_performance_tooltip()
     
-    def auto_scroll(self):
-        """Scroll automático basado en la velocidad configurada"""
-        if not self.is_playing:
-            return
-        
-        # Calcular cuántos píxeles mover (velocidad está en px/seg)
-        speed = self.speed_slider.value()
-        pixels_per_frame = speed / 20  # 50ms = 1/20 de segundo
-        
-        # Acumular el movimiento para permitir velocidades muy lentas
-        self.scroll_accumulator += pixels_per_frame
-        
-        # Obtener el scroll bar vertical
-        scrollbar = self.lyrics_display.verticalScrollBar()
-        current_pos = scrollbar.value()
-        max_pos = scrollbar.maximum()
-        
-        # Solo mover cuando hayamos acumulado al menos 1 píxel
-        if self.scroll_accumulator >= 1.0:
-            pixels_to_move = int(self.scroll_accumulator)
-            self.scroll_accumulator -= pixels_to_move
-            
-            # Incrementar posición
-            new_pos = current_pos + pixels_to_move
-            
-            # Si llegamos al final (y hay contenido para scrollear), pausar
-            if max_pos > 0 and new_pos >= max_pos:
-                new_pos = max_pos
-                scrollbar.setValue(new_pos)
-                # Auto-avanzar a la siguiente canción si hay más
-                if self.current_index < len(self.set_songs) - 1:
-                    self.toggle_play()  # Pausar primero
-                    QTimer.singleShot(2000, self.next_song)  # Esperar 2 segundos
-                else:
-                    self.toggle_play()  # Pausar si es la última canción
-            else:
-                scrollbar.setValue(new_pos)
+    def set_performance_mode(self, enabled: bool):
+        """Activa/desactiva el modo rendimiento (rige desde la próxima reproducción)"""
+        self.performance.enabled = enabled
+        self.settings.set_player_performance_mode(enabled)
+        if not enabled:
+            self.performance.release()
+    
+    def set_frame_hud(self, enabled: bool):
+        """Muestra u oculta las métricas de fluidez; al ocultarlas se guarda el histograma"""
+        self.settings.set_player_frame_hud(enabled)
+        if enabled:
+            self.frame_stats = FrameStats()
+            self.scroll_engine.frame_stats = self.frame_stats
+            self.lyrics_display.frame_stats = self.frame_stats
+            self.frame_hud = FrameHud(self.frame_stats, self.lyrics_display)
+            self.frame_hud.show()
+            background_tasks.register(self.frame_hud)
+        elif self.frame_stats is not None:
+            self.dump_frame_stats()
+            self.scroll_engine.frame_stats = None
+            self.lyrics_display.frame_stats = None
+            background_tasks.unregister(self.frame_hud)
+            self.frame_hud.deleteLater()
+            self.frame_stats = None
+            self.frame_hud = None
+    
+    def dump_frame_stats(self):
+        """Guarda el histograma de la sesión junto con la configuración con la que se midió"""
+        path = self.frame_stats.dump({
+            'set': self.set_name,
+            'font_size': self.current_font_size,
+            'page_mode': self.lyrics_display.pages_per_spread if self.lyrics_display.page_mode else 0,
+            'performance_mode': self.performance.enabled,
+            'refresh_rate_hz': self.screen().refreshRate() if self.screen() else None,
+            'viewport': [self.lyrics_display.viewport().width(), self.lyrics_display.viewport().height()],
+            'engine': self.scroll_engine.diagnostics(),
+        })
+        return path
+    
+    def update_performance_tooltip(self):
+        """Muestra los tirones del último tramo reproducido, para comparar con y sin el modo"""
+        janks = self.scroll_engine.janks - self.janks_at_play
+        mode = "con" if self.performance.enabled else "sin"
+        self.performance_btn.setToolTip(
+            "Congela el GC y pausa el trabajo en segundo plano mientras se reproduce\n"
+            f"Último tramo ({mode} modo rendimiento): {janks} tirones, "
+            f"{self.performance.gen2_collections} recolecciones completas en total"
+        )
+    
+    def on_scroll_finished(self):
+        """Se llegó al final de la canción: pausar y auto-avanzar si hay más"""
+        self.toggle_play()
+        if self.current_index < len(self.set_songs) - 1:
+            QTimer.singleShot(2000, self.next_song)  # Esperar 2 segundos
     
     def reset_scroll(self):
         """Reinicia el scroll al inicio"""
-        scrollbar = self.lyrics_display.verticalScrollBar()
-        scrollbar.setValue(0)
-        self.scroll_position = 0
-        self.scroll_accumulator = 0.0  # Resetear acumulador
+        self.scroll_engine.reset()
+        if self.lyrics_display.page_mode:
+            self.lyrics_display.show_page(0)
+        self.update_info_label()
     
     def rewind(self):
         """Rebobina al inicio de la canción y detiene el scroll"""
@@ -376,10 +590,25 @@ class PlayerWindow(QMainWindow):
     def on_speed_changed(self, value):
         """Actualiza la etiqueta de velocidad"""
         self.speed_label.setText(f"{value} px/s")
+        if hasattr(self, 'scroll_engine'):
+            self.scroll_engine.set_speed(value)
         
         # Actualizar la configuración de la canción actual
         if self.set_songs and self.current_index < len(self.set_songs):
-            self.set_songs[self.current_index]['scroll_speed'] = value
+            song_config = self.set_songs[self.current_index]
+            if song_config['scroll_speed'] != value:
+                song_config['scroll_speed'] = value
+                if song_config.get('set_song_id') is not None:
+                    self.pending_speed = (song_config['set_song_id'], value)
+                    self.speed_save_timer.start()
+    
+    def flush_speed_change(self):
+        """Informa la última velocidad elegida para que se guarde"""
+        self.speed_save_timer.stop()
+        if self.pending_speed is not None:
+            set_song_id, value = self.pending_speed
+            self.pending_speed = None
+            self.scroll_speed_changed.emit(set_song_id, value)
     
     def next_song(self):
         """Avanza a la siguiente canción"""
@@ -393,6 +622,154 @@ class PlayerWindow(QMainWindow):
             self.current_index -= 1
             self.load_song()
     
+    def next_page_or_song(self):
+        """Siguiente página; al pasar de la última, siguiente canción"""
+        if not self.lyrics_display.page_mode or not self.lyrics_display.next_page():
+            self.next_song()
+        self.update_info_label()
+    
+    def previous_page_or_song(self):
+        """Página anterior; desde la primera, canción anterior"""
+        if not self.lyrics_display.page_mode or not self.lyrics_display.previous_page():
+            self.previous_song()
+        self.update_info_label()
+    
+    def on_page_mode_changed(self):
+        """Cambia entre scroll continuo y una o dos páginas"""
+        pages = self.page_mode_combo.currentData()
+        self.settings.set_player_page_mode(pages)
+        if pages and self.is_playing:
+            self.toggle_play()
+        if pages and self.recording_map is not None:
+            self.record_btn.setChecked(False)
+        self.lyrics_display.set_page_mode(bool(pages), pages or 1)
+        self.play_pause_btn.setEnabled(not pages)
+        self.refresh_prefetch()
+        self.update_info_label()
+    
+    def update_section_offsets(self):
+        """Ubica las secciones en el maquetado que se está mostrando"""
+        layout = self.lyrics_display.lyrics_layout()
+        if layout is None:
+            self.section_offsets = []
+        else:
+            self.section_offsets = [
+                int(layout.line_top(layout.display_line(section.line)) - DOCUMENT_MARGIN)
+                for section in self.sections
+            ]
+        self.current_section = -1
+        self.update_current_section()
+    
+    def update_current_section(self):
+        """Busca (binaria) la última sección que empieza antes de la posición actual"""
+        # Una sección cuenta como actual apenas su marca entra en el tercio superior de la pantalla
+        lookahead = self.lyrics_display.viewport().height() // 3 if not self.lyrics_display.page_mode else 0
+        index = bisect.bisect_right(self.section_offsets, self.lyrics_display.content_offset() + lookahead) - 1
+        if index != self.current_section:
+            self.current_section = index
+            self.update_info_label()
+    
+    def jump_to_section(self, index: int):
+        """Salta a una sección de la canción actual (atajos 1-9)"""
+        if not 0 <= index < len(self.sections):
+            return
+        layout = self.lyrics_display.lyrics_layout()
+        if layout is not None:
+            self.lyrics_display.show_line(layout.display_line(self.sections[index].line))
+    
+    def update_timeline(self):
+        """Con mapa de tiempos, el scroll sigue las marcas grabadas en lugar de una velocidad fija"""
+        timeline = None
+        layout = self.lyrics_display.lyrics_layout()
+        if (self.set_songs and layout is not None and self.recording_map is None
+                and not self.lyrics_display.page_mode):
+            timing_map = self.set_songs[self.current_index].get('timing_map')
+            if timing_map is not None and len(timing_map) >= 2:
+                # La línea marcada queda a la altura de lectura (tercio superior)
+                reading = self.lyrics_display.viewport().height() // 3
+                positions = [
+                    max(0.0, layout.line_top(layout.display_line(line)) - DOCUMENT_MARGIN - reading)
+                    for line in timing_map.lines
+                ]
+                timeline = PositionTimeline(timing_map.times_ms, positions)
+        self.scroll_engine.set_timeline(timeline)
+    
+    def toggle_timing_recording(self, enabled: bool):
+        """Comienza o termina la grabación del mapa de tiempos"""
+        if enabled:
+            self.start_timing_recording()
+        else:
+            self.finish_timing_recording()
+    
+    def start_timing_recording(self):
+        """Empieza a grabar: el reloj arranca ahora y cada Enter marca la línea siguiente"""
+        if not self.set_songs or self.lyrics_display.page_mode:
+            self.record_btn.setChecked(False)
+            return
+        if self.is_playing:
+            self.toggle_play()
+        
+        song = self.songs.song(self.current_index)
+        use_latin = song.notation == NOTATION_LATIN if song.notation else None
+        self.record_targets = tap_targets(song.lyrics_with_chords, use_latin)
+        self.recording_map = TimingMap()
+        self.recording_index = self.current_index
+        self.scroll_engine.set_timeline(None)
+        self.reset_scroll()
+        self.record_clock.start()
+        self.update_info_label()
+    
+    def tap_timing(self):
+        """Marca que la siguiente línea empieza ahora"""
+        if self.recording_map is None or len(self.recording_map) >= len(self.record_targets):
+            return
+        line = self.record_targets[len(self.recording_map)]
+        self.recording_map.add(self.record_clock.elapsed(), line)
+        
+        # Llevar la línea marcada a la altura de lectura
+        layout = self.lyrics_display.lyrics_layout()
+        if layout is not None:
+            reading = self.lyrics_display.viewport().height() // 3
+            top = layout.line_top(layout.display_line(line)) - DOCUMENT_MARGIN - reading
+            self.lyrics_display.verticalScrollBar().setValue(int(max(0, top)))
+        self.update_info_label()
+    
+    def finish_timing_recording(self):
+        """Termina la grabación y guarda el mapa (menos de dos marcas lo borra)"""
+        if self.recording_map is None:
+            return
+        timing_map, index = self.recording_map, self.recording_index
+        self.recording_map = None
+        if len(timing_map) < 2:
+            timing_map = None
+        
+        song_config = self.set_songs[index]
+        song_config['timing_map'] = timing_map
+        set_song_id = song_config.get('set_song_id')
+        if set_song_id is not None:
+            self.timing_map_recorded.emit(set_song_id, timing_map.encode() if timing_map else b"")
+        
+        if index == self.current_index:
+            self.song_info_text = self.song_info_text.replace(" | ⏱", "")
+            if timing_map is not None:
+                self.song_info_text += " | ⏱"
+            self.update_timeline()
+            self.update_info_label()
+    
+    def update_info_label(self):
+        """Muestra la información de la canción con la sección y la página actuales"""
+        text = self.song_info_text
+        if self.recording_map is not None:
+            text += f" | ⏺ Grabando: Enter en cada línea ({len(self.recording_map)}/{len(self.record_targets)})"
+        if 0 <= self.current_section < len(self.sections):
+            text += f" | {self.sections[self.current_section].label} ({self.current_section + 1}/{len(self.sections)})"
+        view = self.lyrics_display
+        if view.page_mode and view.page_count() > 0:
+            last = min(view.page_count(), view.current_page + view.pages_per_spread)
+            pages = f"{view.current_page + 1}" if last == view.current_page + 1 else f"{view.current_page + 1}-{last}"
+            text += f" | Página {pages}/{view.page_count()}"
+        self.song_info_label.setText(text)
+    
     def on_song_list_clicked(self, item):
         """Maneja el clic en una canción de la lista"""
         row = self.song_list.row(item)
@@ -418,12 +795,64 @@ class PlayerWindow(QMainWindow):
         mono_font.setPointSize(self.current_font_size)
         self.lyrics_display.setFont(mono_font)
         self.font_size_label.setText(f"{self.current_font_size}")
+        self.refresh_prefetch()
     
     def change_font_size(self, delta: int):
-        """Cambia el tamaño de fuente"""
-        self.current_font_size = max(12, min(48, self.current_font_size + delta))
+        """Cambia el tamaño de fuente (desactiva el ajuste al ancho)"""
+        if self.fit_to_width:
+            self.fit_width_btn.setChecked(False)
+        self.current_font_size = max(MIN_FONT_SIZE, min(MAX_FONT_SIZE, self.current_font_size + delta))
         self.update_font_size()
     
+    def set_fit_to_width(self, enabled: bool):
+        """Activa/desactiva el ajuste del tamaño de letra al ancho"""
+        self.fit_to_width = enabled
+        self.settings.set_player_fit_width(enabled)
+        if enabled:
+            self.apply_fit_to_width()
+    
+    def apply_fit_to_width(self):
+        """Elige el mayor tamaño en el que la línea más ancha de la canción entra sin cortarse"""
+        if not self.set_songs or self.current_index >= len(self.set_songs):
+            return
+        widest = widest_line(self.prefetcher.text(self.current_index))
+        size = self.font_metrics_table.fit_point_size(
+            self.lyrics_display.font(), widest, self.fit_width()
+        )
+        if size != self.current_font_size:
+            self.current_font_size = size
+            self.update_font_size()
+    
+    def fit_width(self) -> int:
+        """Ancho disponible para el texto"""
+        # Se descuenta siempre la barra de scroll, así el resultado no cambia cuando aparece o desaparece
+        width = self.lyrics_display.text_width()
+        scrollbar = self.lyrics_display.verticalScrollBar()
+        if not scrollbar.isVisible() and not self.lyrics_display.page_mode:
+            width -= scrollbar.sizeHint().width()
+        return width
+    
+    def refresh_prefetch(self):
+        """Vuelve a preparar las próximas canciones con la fuente y el ancho actuales"""
+        if not self.set_songs:
+            return
+        self.configure_prefetch()
+        self.prefetcher.schedule(self.current_index, len(self.set_songs))
+    
+    def configure_prefetch(self):
+        """Pasa al prefetcher la fuente y el tamaño actuales del área de texto"""
+        viewport = self.lyrics_display.viewport()
+        self.prefetcher.configure(self.lyrics_display.font(), self.lyrics_display.text_width(), viewport.height())
+    
+    def eventFilter(self, obj, event):
+        """Al cambiar el ancho del área de texto, lo preparado con el ancho anterior queda obsoleto"""
+        if obj is self.lyrics_display.viewport() and event.type() == QEvent.Type.Resize:
+            if self.fit_to_width:
+                self.apply_fit_to_width()
+            self.refresh_prefetch()
+            self.update_timeline()  # La altura de lectura depende del alto visible
+        return super().eventFilter(obj, event)
+    
     def apply_theme(self):
         """Aplica el tema oscuro o claro con colores personalizados"""
         dark_mode = self.settings.get_dark_mode()
@@ -438,7 +867,7 @@ class PlayerWindow(QMainWindow):
                     background-color: #1e1e1e;
                     color: #d4d4d4;
                 }}
-                QTextEdit {{
+                LyricsView {{
                     background-color: {bg_color};
                     color: {text_color};
                     border: none;
@@ -518,7 +947,7 @@ class PlayerWindow(QMainWindow):
                     background-color: #ffffff;
                     color: #000000;
                 }}
-                QTextEdit {{
+                LyricsView {{
                     background-color: {bg_color};
                     color: {text_color};
                     border: none;
@@ -567,7 +996,14 @@ class PlayerWindow(QMainWindow):
 
     
     def closeEvent(self, event):
-        """Limpia el timer antes de cerrar"""
-        if self.scroll_timer.isActive():
-            self.scroll_timer.stop()
+        """Detiene el scroll antes de cerrar"""
+        self.finish_timing_recording()
+        self.flush_speed_change()
+        self.scroll_engine.stop()
+        self.performance.release()
+        background_tasks.unregister(self.prefetcher)
+        if self.frame_hud is not None:
+            background_tasks.unregister(self.frame_hud)
+        if self.frame_stats is not None:
+            self.dump_frame_stats()
         event.accept()
@@ -0,0 +1,291 @@
+"""
+Motor de scroll automático basado en tiempo
+
+La posición se deriva de un reloj monotónico (QElapsedTimer) y no de la
+cantidad de ticks del timer: si un tick llega tarde o se pierde, el
+siguiente recupera la distancia, y la velocidad real coincide con los px/s
+configurados aunque la canción dure varios minutos. La posición se lleva
+en punto flotante para que las velocidades bajas avancen suavemente.
+
+Con un PositionTimeline (mapa de tiempos grabado en el ensayo) la posición
+sale de interpolar el mapa en el tiempo transcurrido de la canción en lugar
+de una velocidad constante; la velocidad queda para después de la última
+marca.
+"""
+
+import math
+from collections import deque
+from typing import Callable, Optional
+
+from PyQt6.QtCore import QObject, QTimer, QElapsedTimer, QEvent, Qt, pyqtSignal
+from PyQt6.QtGui import QGuiApplication
+from PyQt6.QtWidgets import QScrollBar, QWidget
+
+from ..utils.timing_map import PositionTimeline
+
+
+# Intervalo mínimo entre ticks si no se conoce la frecuencia de la pantalla (~60 Hz)
+TICK_INTERVAL_MS = 16
+# Intervalo máximo: aunque la velocidad sea muy baja, revisar la barra de vez en cuando
+MAX_TICK_INTERVAL_MS = 500
+
+
+class ScrollEngine(QObject):
+    """Desplaza una barra de scroll a velocidad constante en píxeles por segundo"""
+
+    # Emitida al llegar al final del contenido (el motor ya se detuvo)
+    finished = pyqtSignal()
+
+    def __init__(self, scrollbar: QScrollBar, parent: QObject = None,
+                 finish_when_empty: bool = False, clock: Callable[[], float] = None):
+        """
+        Args:
+            scrollbar: Barra de scroll a mover
+            parent: Objeto padre de Qt
+            finish_when_empty: Si True, termina aunque no haya contenido para desplazar
+            clock: Función que retorna milisegundos monotónicos (para pruebas)
+        """
+        super().__init__(parent)
+        self.scrollbar = scrollbar
+        self.finish_when_empty = finish_when_empty
+
+        if clock is None:
+            self._elapsed = QElapsedTimer()
+            self._elapsed.start()
+            clock = lambda: self._elapsed.nsecsElapsed() / 1_000_000
+        self._clock = clock
+
+        self.speed = 50.0  # px/s
+        self.is_running = False
+        self._origin_pos = 0.0  # Posición (con decimales) al momento _origin_ms
+        self._origin_ms = 0.0
+        self._last_value = 0  # Último valor entero aplicado a la barra
+        
+        # Mapa de tiempos opcional; con él, el origen se lleva en tiempo de la canción
+        self.timeline: Optional[PositionTimeline] = None
+        self._origin_song_ms = 0.0
+
+        # El timer es de un solo disparo: cada tick programa el siguiente según la velocidad
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.tick)
+
+        # Ventana vigilada para suspender el timer cuando no se ve
+        self._watched: Optional[QWidget] = None
+        self.is_suspended = False
+
+        # Diagnóstico: instantes de los últimos despertares y total acumulado
+        self._wakeups = deque()
+        self.total_wakeups = 0
+        self.next_interval_ms = float(TICK_INTERVAL_MS)
+        
+        # Tirones: ticks que llegaron más de un cuadro tarde (None = no hay tick programado)
+        self._due_ms: Optional[float] = None
+        self.janks = 0
+        self.max_late_ms = 0.0
+        
+        # Medición opcional de cada tick (ver frame_hud.FrameStats)
+        self.frame_stats = None
+        self._last_tick_ms: Optional[float] = None
+
+    def position(self, now: Optional[float] = None) -> float:
+        """Posición exacta (con decimales) en el instante indicado"""
+        if not self.is_running:
+            return self._origin_pos
+        if now is None:
+            now = self._clock()
+        if self.timeline is not None:
+            return self.timeline.position_at(self._song_ms(now), self.speed)
+        return self._origin_pos + self.speed * (now - self._origin_ms) / 1000.0
+
+    def set_timeline(self, timeline: Optional[PositionTimeline]):
+        """Sigue un mapa de tiempos (None vuelve a la velocidad constante) sin saltar de posición"""
+        now = self._clock()
+        self._move_origin(now, self.position(now))
+        self.timeline = timeline
+        self._move_origin(now, self._origin_pos)
+        if self.is_running:
+            self._schedule(now)
+
+    def start(self):
+        """Comienza a desplazar desde la posición actual"""
+        if self.is_running:
+            return
+        self._sync_with_scrollbar()
+        self._origin_ms = self._clock()
+        self.is_running = True
+        self._schedule(self._origin_ms)
+
+    def stop(self):
+        """Detiene el desplazamiento conservando la posición con decimales"""
+        if not self.is_running:
+            return
+        now = self._clock()
+        self._move_origin(now, self.position(now), self._song_ms(now))
+        self.is_running = False
+        self.timer.stop()
+        self._due_ms = None
+        self._last_tick_ms = None
+
+    def reset(self, position: float = 0.0):
+        """Vuelve a una posición (por defecto el inicio)"""
+        self._move_origin(self._clock(), float(position))
+        self._apply(int(position))
+
+    def set_speed(self, speed: float):
+        """Cambia la velocidad sin saltos: la posición actual pasa a ser el nuevo origen"""
+        now = self._clock()
+        position = self.position(now)
+        song_ms = self._song_ms(now) if self.is_running else self._origin_song_ms
+        self.speed = float(speed)
+        if self.timeline is not None and song_ms >= self.timeline.end_ms:
+            song_ms = None  # Pasada la última marca manda la velocidad: conservar la posición
+        self._move_origin(now, position, song_ms)
+        if self.is_running:
+            self._schedule(now)
+
+    def tick(self):
+        """Aplica la posición que corresponde al tiempo transcurrido"""
+        if not self.is_running:
+            return
+        now = self._clock()
+        self._record_wakeup(now)
+        late = self._record_lateness(now)
+        if self.frame_stats is not None:
+            interval = now - self._last_tick_ms if self._last_tick_ms is not None else None
+            self.frame_stats.record_tick(interval, late, self._refresh_interval_ms())
+        self._last_tick_ms = now
+
+        # Si el usuario movió la barra (rueda, arrastre), continuar desde ahí
+        if self.scrollbar.value() != self._last_value:
+            self._move_origin(now, float(self.scrollbar.value()))
+
+        position = self.position(now)
+        max_pos = self.scrollbar.maximum()
+
+        if position >= max_pos and (max_pos > 0 or self.finish_when_empty):
+            self._apply(max_pos)
+            self._origin_pos = float(max_pos)
+            self.is_running = False
+            self.timer.stop()
+            self.finished.emit()
+            return
+
+        self._apply(int(position))
+        self._schedule(now)
+
+    def watch_visibility(self, widget: QWidget):
+        """Suspende el timer mientras la ventana esté oculta o minimizada"""
+        if self._watched is not None:
+            self._watched.removeEventFilter(self)
+        self._watched = widget
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if obj is self._watched and event.type() in (
+            QEvent.Type.Hide, QEvent.Type.Show, QEvent.Type.WindowStateChange
+        ):
+            hidden = not obj.isVisible() or obj.isMinimized()
+            if hidden and not self.is_suspended:
+                self.is_suspended = True
+                self.timer.stop()
+                self._due_ms = None
+                self._last_tick_ms = None
+            elif not hidden and self.is_suspended:
+                self.is_suspended = False
+                # La posición depende del tiempo, así que el primer tick se pone al día solo
+                if self.is_running:
+                    self.tick()
+        return super().eventFilter(obj, event)
+
+    @property
+    def wakeups_per_second(self) -> int:
+        """Cantidad de ticks en el último segundo"""
+        self._trim_wakeups(self._clock())
+        return len(self._wakeups)
+
+    def diagnostics(self) -> dict:
+        """Contadores para diagnosticar el consumo del scroll"""
+        return {
+            'wakeups_per_second': self.wakeups_per_second,
+            'total_wakeups': self.total_wakeups,
+            'interval_ms': round(self.next_interval_ms, 1),
+            'suspended': self.is_suspended,
+            'janks': self.janks,
+            'max_late_ms': round(self.max_late_ms, 1),
+        }
+
+    def _schedule(self, now: float):
+        """Programa el próximo tick para cuando la posición avance un píxel entero"""
+        if self.is_suspended:
+            return
+        speed = self.speed
+        if self.timeline is not None:
+            song_ms = self._song_ms(now)
+            speed = self.timeline.speed_at(song_ms, self.speed)
+        if speed > 0:
+            position = self.position(now)
+            pixels_left = math.floor(position) + 1 - position
+            interval = pixels_left / speed * 1000
+        else:
+            interval = MAX_TICK_INTERVAL_MS
+        if self.timeline is not None:
+            # En un corte instrumental (velocidad 0) despertar justo cuando se retoma
+            change = self.timeline.next_change_ms(song_ms)
+            if change is not None:
+                interval = min(interval, change - song_ms)
+        # Nunca más seguido que la frecuencia de la pantalla
+        self.next_interval_ms = max(self._refresh_interval_ms(), min(MAX_TICK_INTERVAL_MS, interval))
+        delay = max(1, math.ceil(self.next_interval_ms))
+        self._due_ms = now + delay
+        self.timer.start(delay)
+
+    def _refresh_interval_ms(self) -> float:
+        """Duración de un cuadro de la pantalla donde está la barra"""
+        screen = self.scrollbar.screen() or QGuiApplication.primaryScreen()
+        rate = screen.refreshRate() if screen is not None else 0
+        return 1000.0 / rate if rate > 0 else float(TICK_INTERVAL_MS)
+
+    def _record_wakeup(self, now: float):
+        self.total_wakeups += 1
+        self._wakeups.append(now)
+        self._trim_wakeups(now)
+
+    def _record_lateness(self, now: float) -> Optional[float]:
+        """Cuenta un tirón si el tick llegó más de un cuadro después de lo programado; retorna el retraso"""
+        if self._due_ms is None:
+            return None  # Tick manual o primero después de reanudar
+        late = now - self._due_ms
+        self._due_ms = None
+        self.max_late_ms = max(self.max_late_ms, late)
+        if late > self._refresh_interval_ms():
+            self.janks += 1
+        return late
+
+    def _trim_wakeups(self, now: float):
+        while self._wakeups and now - self._wakeups[0] > 1000:
+            self._wakeups.popleft()
+
+    def _apply(self, value: int):
+        """Mueve la barra solo cuando cambia el píxel entero"""
+        if value != self.scrollbar.value():
+            self.scrollbar.setValue(value)
+        self._last_value = self.scrollbar.value()
+
+    def _sync_with_scrollbar(self):
+        """Toma la posición de la barra si fue movida mientras el motor estaba detenido"""
+        if self.scrollbar.value() != int(self._origin_pos):
+            self._move_origin(self._clock(), float(self.scrollbar.value()))
+        self._last_value = self.scrollbar.value()
+
+    def _song_ms(self, now: float) -> float:
+        """Tiempo transcurrido de la canción (para el mapa de tiempos)"""
+        return self._origin_song_ms + (now - self._origin_ms)
+
+    def _move_origin(self, now: float, position: float, song_ms: Optional[float] = None):
+        """Toma (now, position) como nuevo origen; con mapa, busca el tiempo de esa posición si no se indica"""
+        self._origin_pos = position
+        self._origin_ms = now
+        if self.timeline is not None:
+            self._origin_song_ms = song_ms if song_ms is not None else self.timeline.time_at(position, self.speed)
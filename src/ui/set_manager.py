@@ -11,11 +11,14 @@ from PyQt6.QtCore import Qt
 
 from ..database.models import Set, SetSong, Song
 from ..database.db_manager import DatabaseManager
+from ..utils.key_optimizer import SetKeyOptimizer, DEFAULT_MAX_CAPO
+from ..utils.tracing import traced
 
 
 class SetManagerDialog(QDialog):
     """Diálogo para crear o editar un set de canciones"""
     
+    @traced(category="dialog")
     def __init__(self, parent=None, db: DatabaseManager = None, set_obj: Set = None):
         super().__init__(parent)
         
@@ -119,6 +122,36 @@ class SetManagerDialog(QDialog):
         config_group.setLayout(config_layout)
         set_layout.addWidget(config_group)
         
+        # Optimización de tonalidades para todo el set
+        optimizer_group = QGroupBox("Optimizar Tonalidades del Set")
+        optimizer_layout = QFormLayout()
+        
+        vocal_range_layout = QHBoxLayout()
+        self.min_transposition_input = QSpinBox()
+        self.min_transposition_input.setRange(-11, 11)
+        self.min_transposition_input.setValue(-5)
+        vocal_range_layout.addWidget(self.min_transposition_input)
+        vocal_range_layout.addWidget(QLabel("a"))
+        self.max_transposition_input = QSpinBox()
+        self.max_transposition_input.setRange(-11, 11)
+        self.max_transposition_input.setValue(5)
+        self.max_transposition_input.setSuffix(" semitonos")
+        vocal_range_layout.addWidget(self.max_transposition_input)
+        optimizer_layout.addRow("Rango vocal:", vocal_range_layout)
+        
+        self.max_capo_input = QSpinBox()
+        self.max_capo_input.setRange(0, 11)
+        self.max_capo_input.setValue(DEFAULT_MAX_CAPO)
+        self.max_capo_input.setSpecialValueText("Sin cejilla")
+        optimizer_layout.addRow("Cejilla máxima:", self.max_capo_input)
+        
+        optimize_btn = QPushButton("🎯 Sugerir Transposiciones")
+        optimize_btn.clicked.connect(self.optimize_transpositions)
+        optimizer_layout.addRow(optimize_btn)
+        
+        optimizer_group.setLayout(optimizer_layout)
+        set_layout.addWidget(optimizer_group)
+        
         set_group.setLayout(set_layout)
         right_panel.addWidget(set_group)
         main_panel.addLayout(right_panel)
@@ -163,19 +196,13 @@ class SetManagerDialog(QDialog):
             set_songs_rows = self.db.get_set_songs(self.set_obj.id)
             
             for row in set_songs_rows:
-                song = Song(
-                    id=row['id'],
-                    title=row['title'],
-                    artist=row['artist'],
-                    original_key=row['original_key'],
-                    lyrics_with_chords=row['lyrics_with_chords'],
-                    bpm=row['bpm']
-                )
+                song = self.db.song_from_row(row)
                 
                 self.set_songs.append({
                     'song': song,
                     'scroll_speed': row['scroll_speed'],
-                    'transposition': row['transposition']
+                    'transposition': row['transposition'],
+                    'timing_map': row['timing_map']  # Se conserva al guardar el set
                 })
             
             self.refresh_set_list()
@@ -306,6 +333,51 @@ class SetManagerDialog(QDialog):
         self.refresh_set_list()
         self.set_list.setCurrentRow(current_row)
     
+    def optimize_transpositions(self):
+        """Propone la transposición de cada canción minimizando formas de acordes difíciles"""
+        if not self.set_songs:
+            return
+        
+        min_trans = self.min_transposition_input.value()
+        max_trans = self.max_transposition_input.value()
+        if min_trans > max_trans:
+            QMessageBox.warning(self, "Advertencia", "El rango vocal está invertido")
+            return
+        
+        optimizer = SetKeyOptimizer(max_capo=self.max_capo_input.value())
+        histograms = self.db.get_chord_histograms(c['song'].id for c in self.set_songs)
+        proposals = optimizer.optimize(
+            histograms,
+            min_transposition=min_trans,
+            max_transposition=max_trans,
+            target_transposition=max(min_trans, min(max_trans, 0))
+        )
+        
+        summary_lines = []
+        for i, song_config in enumerate(self.set_songs):
+            proposal = proposals.get(song_config['song'].id)
+            if not proposal:
+                continue
+            song_config['transposition'] = proposal.transposition
+            line = f"{i + 1}. {song_config['song'].title}: {proposal.transposition:+d}"
+            if proposal.capo:
+                line += f", cejilla {proposal.capo}"
+            if proposal.hard_shapes:
+                line += f" (difíciles: {', '.join(proposal.hard_shapes)})"
+            summary_lines.append(line)
+        
+        current_row = self.set_list.currentRow()
+        self.refresh_set_list()
+        if current_row >= 0:
+            self.set_list.setCurrentRow(current_row)
+            self.on_set_song_selected()
+        
+        QMessageBox.information(
+            self,
+            "Transposiciones Sugeridas",
+            "\n".join(summary_lines) or "No hay acordes para analizar"
+        )
+    
     def accept_set(self):
         """Valida y acepta el diálogo"""
         # Validación básica
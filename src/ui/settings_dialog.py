@@ -4,12 +4,13 @@ Diálogo de configuración de la aplicación
 
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel,
-    QPushButton, QColorDialog, QGroupBox, QFormLayout
+    QPushButton, QColorDialog, QGroupBox, QFormLayout, QCheckBox, QSpinBox
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QColor
 
 from ..utils.settings import Settings
+from ..utils.tracing import traced
 
 
 class SettingsDialog(QDialog):
@@ -18,6 +19,7 @@ class SettingsDialog(QDialog):
     # Señal emitida cuando se guardan los cambios
     settings_changed = pyqtSignal()
     
+    @traced(category="dialog")
     def __init__(self, parent=None):
         super().__init__(parent)
         self.settings = Settings()
@@ -81,6 +83,48 @@ class SettingsDialog(QDialog):
         player_colors_group.setLayout(player_colors_layout)
         layout.addWidget(player_colors_group)
         
+        # Grupo de opciones del reproductor
+        player_group = QGroupBox("▶ Reproductor")
+        player_layout = QVBoxLayout()
+        
+        self.separate_process_check = QCheckBox("Ejecutar el reproductor en un proceso separado")
+        self.separate_process_check.setToolTip(
+            "El scroll no se frena mientras la ventana principal importa, exporta o recarga la biblioteca"
+        )
+        self.separate_process_check.setChecked(self.settings.get_player_separate_process())
+        player_layout.addWidget(self.separate_process_check)
+        
+        player_group.setLayout(player_layout)
+        layout.addWidget(player_group)
+        
+        # Grupo de diagnóstico
+        diagnostics_group = QGroupBox("🩺 Diagnóstico")
+        diagnostics_layout = QFormLayout()
+        
+        self.stall_threshold_spin = QSpinBox()
+        self.stall_threshold_spin.setRange(0, 10000)
+        self.stall_threshold_spin.setSingleStep(100)
+        self.stall_threshold_spin.setSuffix(" ms")
+        self.stall_threshold_spin.setSpecialValueText("Desactivado")
+        self.stall_threshold_spin.setToolTip(
+            "Los bloqueos de la interfaz más largos que esto se registran en gimmeletter_logs/stalls.log\n"
+            "Desactivado por defecto; 500 ms es un buen valor para buscar tirones"
+        )
+        self.stall_threshold_spin.setValue(self.settings.get_stall_threshold_ms())
+        diagnostics_layout.addRow("Registrar bloqueos de más de:", self.stall_threshold_spin)
+        
+        self.slow_query_spin = QSpinBox()
+        self.slow_query_spin.setRange(1, 10000)
+        self.slow_query_spin.setSuffix(" ms")
+        self.slow_query_spin.setToolTip(
+            "Las consultas más lentas que esto se registran con su plan en gimmeletter_logs/slow_queries.log"
+        )
+        self.slow_query_spin.setValue(self.settings.get_slow_query_ms())
+        diagnostics_layout.addRow("Registrar consultas SQL de más de:", self.slow_query_spin)
+        
+        diagnostics_group.setLayout(diagnostics_layout)
+        layout.addWidget(diagnostics_group)
+        
         layout.addStretch()
         
         # Botones de acción
@@ -136,6 +180,9 @@ class SettingsDialog(QDialog):
         """Guarda la configuración y cierra el diálogo"""
         self.settings.set_player_background_color(self.player_bg_color)
         self.settings.set_player_text_color(self.player_text_color)
+        self.settings.set_player_separate_process(self.separate_process_check.isChecked())
+        self.settings.set_stall_threshold_ms(self.stall_threshold_spin.value())
+        self.settings.set_slow_query_ms(self.slow_query_spin.value())
         
         # Emitir señal de cambio
         self.settings_changed.emit()
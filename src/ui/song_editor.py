@@ -11,11 +11,13 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 
 from ..database.models import Song
+from ..utils.tracing import traced
 
 
 class SongEditorDialog(QDialog):
     """Diálogo para crear o editar una canción"""
     
+    @traced(category="dialog")
     def __init__(self, parent=None, song: Song = None):
         super().__init__(parent)
         
@@ -131,6 +133,10 @@ class SongEditorDialog(QDialog):
             self.title_input.setText(self.song.title or "")
             self.artist_input.setText(self.song.artist or "")
             self.key_input.setText(self.song.original_key or "")
+            if self.song.key_confidence is not None:
+                self.key_input.setToolTip(
+                    f"Tonalidad estimada automáticamente (confianza {self.song.key_confidence:.0%})"
+                )
             self.bpm_input.setValue(self.song.bpm or 0)
             self.lyrics_input.setPlainText(self.song.lyrics_with_chords or "")
     
@@ -145,7 +151,11 @@ class SongEditorDialog(QDialog):
         # Actualizar el objeto song con los datos del formulario
         self.song.title = self.title_input.text().strip()
         self.song.artist = self.artist_input.text().strip()
-        self.song.original_key = self.key_input.text().strip()
+        original_key = self.key_input.text().strip()
+        if original_key != (self.song.original_key or ""):
+            # La tonalidad ya no es la estimada automáticamente
+            self.song.key_confidence = None
+        self.song.original_key = original_key
         self.song.bpm = self.bpm_input.value() if self.bpm_input.value() > 0 else None
         self.song.lyrics_with_chords = self.lyrics_input.toPlainText()
         
@@ -0,0 +1,68 @@
+"""
+Carga perezosa de las canciones de un set en el reproductor
+
+El reproductor recibe solo los ids y la configuración de cada canción del
+set; la letra se lee de la base de datos recién cuando hace falta (al
+mostrarla o al prepararla por adelantado) y se libera cuando la canción
+queda lejos de la actual. Así un set largo no tiene todas sus letras en
+memoria ni demora la apertura del reproductor.
+"""
+
+from typing import Callable, Dict, List, Optional
+
+from ..database.models import Song
+from .song_prefetch import DEFAULT_LOOKAHEAD
+
+
+class SongLoader:
+    """Mantiene cargadas solo las canciones a ±radius de la actual"""
+
+    def __init__(self, set_songs: List[Dict], fetch: Optional[Callable[[int], Optional[Song]]] = None,
+                 radius: int = DEFAULT_LOOKAHEAD, on_release: Optional[Callable[[int], None]] = None):
+        """
+        Args:
+            set_songs: Configuración de cada canción del set (con 'song' o con 'song_id')
+            fetch: Función id -> canción (None = las canciones ya vienen cargadas)
+            radius: Canciones a mantener antes y después de la actual
+            on_release: Se llama con el índice de cada canción justo antes de liberarla
+                (todavía cargada, para descartar lo que se armó a partir de ella)
+        """
+        self.set_songs = set_songs
+        self.fetch = fetch
+        self.radius = radius
+        self.on_release = on_release
+
+    def song(self, index: int) -> Song:
+        """Canción de una posición del set (la lee de la base si no está cargada)"""
+        song_config = self.set_songs[index]
+        song = song_config.get('song')
+        if song is None:
+            song = self.fetch(song_config['song_id']) if self.fetch else None
+            if song is None:
+                # La canción se borró mientras el set estaba abierto
+                song = Song(id=song_config.get('song_id'), title=song_config.get('title', ""),
+                            artist=song_config.get('artist', ""))
+            song_config['song'] = song
+        return song
+
+    def title(self, index: int) -> str:
+        """Título y artista para la lista, sin cargar la letra"""
+        song_config = self.set_songs[index]
+        song = song_config.get('song')
+        if song is not None:
+            return f"{song.title}\n   {song.artist}"
+        return f"{song_config.get('title', '')}\n   {song_config.get('artist', '')}"
+
+    def retain(self, current_index: int):
+        """Libera las canciones que quedaron fuera de la ventana alrededor de la actual"""
+        if self.fetch is None:
+            return  # Sin forma de volver a leerlas, se conservan
+        for index, song_config in enumerate(self.set_songs):
+            if abs(index - current_index) > self.radius and song_config.get('song') is not None:
+                if self.on_release is not None:
+                    self.on_release(index)
+                del song_config['song']
+
+    def loaded(self) -> int:
+        """Cantidad de canciones con la letra en memoria"""
+        return sum(1 for song_config in self.set_songs if song_config.get('song') is not None)
@@ -0,0 +1,139 @@
+"""
+Preparación anticipada de las próximas canciones del set
+
+Mientras la UI está ociosa se calcula el texto transpuesto y se arma un
+LyricsLayout ya maquetado con la fuente y el ancho actuales (con la primera
+pantalla preparada), así avanzar de canción (incluido el auto-avance) solo
+cambia el maquetado mostrado. La preparación arranca recién después de que
+la vista pinta la canción recién mostrada, para no demorar lo que se está
+por leer. Los maquetados quedan en un LayoutCache
+compartido con la vista, de modo que volver a un tamaño de fuente o a un
+ancho ya usado tampoco vuelve a maquetar.
+"""
+
+from typing import Callable, Dict, Hashable, List, Tuple
+
+from PyQt6.QtCore import QEvent, QObject, QTimer
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import QWidget
+
+from .lyrics_view import LayoutCache, LyricsLayout
+
+
+# Cuántas canciones por delante se preparan
+DEFAULT_LOOKAHEAD = 2
+
+
+class SongPrefetcher(QObject):
+    """Prepara maquetados de canciones por adelantado en tiempo ocioso"""
+
+    def __init__(self, parent: QObject, build_text: Callable[[int], str],
+                 revision_of: Callable[[int], Hashable], cache: LayoutCache = None,
+                 lookahead: int = DEFAULT_LOOKAHEAD, viewport: QWidget = None):
+        """
+        Args:
+            parent: Objeto padre
+            build_text: Función índice -> texto transpuesto a mostrar
+            revision_of: Función índice -> identificador del texto (canción, versión, transposición)
+            cache: Caché de maquetados (compartido con la vista)
+            lookahead: Cantidad de canciones a preparar después de la actual
+            viewport: Área donde se pinta la canción actual; si se indica, la
+                preparación espera a su próximo paint
+        """
+        super().__init__(parent)
+        self.build_text = build_text
+        self.revision_of = revision_of
+        self.cache = cache if cache is not None else LayoutCache()
+        self.lookahead = lookahead
+        self.font = QFont()
+        self.width = 0
+        self.height = 0
+        self._texts: Dict[int, Tuple[Hashable, str]] = {}  # índice -> (revisión, texto)
+        self._pending: List[int] = []
+        self.paused = False  # Pausado durante la reproducción en modo rendimiento
+        self.viewport = viewport
+        self._awaiting_paint = False
+        if viewport is not None:
+            viewport.installEventFilter(self)
+
+    def configure(self, font: QFont, width: int, height: int = 0):
+        """Actualiza la fuente y el tamaño visible con los que se maqueta"""
+        self.font = QFont(font)
+        self.width = width
+        self.height = height
+
+    def text(self, index: int) -> str:
+        """Texto transpuesto de una canción (no depende de la fuente ni del ancho)"""
+        revision = self.revision_of(index)
+        cached = self._texts.get(index)
+        if cached is None or cached[0] != revision:
+            cached = (revision, self.build_text(index))
+            self._texts[index] = cached
+        return cached[1]
+
+    def get(self, index: int) -> LyricsLayout:
+        """Retorna el maquetado de una canción (lo arma en el momento si no estaba en caché)"""
+        text = self.text(index)
+        layout = self.cache.get(self.revision_of(index), text, self.font, self.width)
+        first, last = layout.line_range(0, self.height)
+        layout.prepare(first, last)
+        return layout
+
+    def schedule(self, current_index: int, count: int):
+        """Programa la preparación de las siguientes canciones para después del próximo paint"""
+        self._evict_outside(current_index)
+        self._pending = [
+            index for index in range(current_index + 1, min(count, current_index + 1 + self.lookahead))
+        ]
+        # Con un viewport, la canción actual se pinta primero (si está oculto, se espera a que se muestre)
+        self._awaiting_paint = self.viewport is not None
+        if not self._awaiting_paint:
+            self._start()
+
+    @property
+    def idle(self) -> bool:
+        """True si no queda ninguna canción por preparar"""
+        return not self._pending
+
+    def clear(self):
+        """Descarta los textos y maquetados preparados (el próximo get arma todo de nuevo)"""
+        self._texts.clear()
+        self._pending = []
+        self.cache.clear()
+
+    def pause(self):
+        """Deja de preparar en segundo plano (lo pendiente se conserva)"""
+        self.paused = True
+
+    def resume(self):
+        """Retoma la preparación pendiente"""
+        self.paused = False
+        if not self._awaiting_paint:
+            self._start()
+
+    def eventFilter(self, obj, event):
+        """El paint del viewport libera la preparación programada"""
+        if obj is self.viewport and event.type() == QEvent.Type.Paint and self._awaiting_paint:
+            self._awaiting_paint = False
+            # El filtro corre antes del paint: el timer dispara cuando ya terminó
+            self._start()
+        return False
+
+    def _start(self):
+        """Arranca la cadena de preparación en la próxima vuelta del event loop"""
+        if self._pending and not self.paused:
+            QTimer.singleShot(0, self._prepare_pending)
+
+    def _prepare_pending(self):
+        """Prepara una canción pendiente por vuelta del event loop"""
+        if not self._pending or self.paused:
+            return
+        self.get(self._pending.pop(0))
+        if self._pending:
+            QTimer.singleShot(0, self._prepare_pending)
+
+    def _evict_outside(self, current_index: int):
+        """Libera los textos que quedaron lejos de la canción actual (los maquetados los desaloja el caché)"""
+        keep = range(current_index - 1, current_index + 1 + self.lookahead)
+        for index in [i for i in self._texts if i not in keep]:
+            del self._texts[index]
@@ -6,16 +6,19 @@ from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QTextEdit, QSlider, QCheckBox
 )
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 
 from ..database.models import Song
 from ..utils.settings import Settings
+from ..utils.tracing import traced
+from .scroll_engine import ScrollEngine
 
 
 class SongPreviewDialog(QDialog):
     """Diálogo de vista previa para una canción individual"""
     
+    @traced(category="dialog")
     def __init__(self, parent=None, song: Song = None, settings: Settings = None):
         super().__init__(parent)
         
@@ -23,13 +26,17 @@ class SongPreviewDialog(QDialog):
         self.settings = settings or Settings()
         self.is_playing = False
         self.saved_speed = song.default_scroll_speed if song else 50
-        self.scroll_accumulator = 0.0  # Acumulador para velocidades bajas
-        
-        # Timer para el scroll
-        self.scroll_timer = QTimer()
-        self.scroll_timer.timeout.connect(self.auto_scroll)
         
         self.init_ui()
+        
+        # Motor de scroll compartido con el reproductor
+        self.scroll_engine = ScrollEngine(
+            self.lyrics_display.verticalScrollBar(), self, finish_when_empty=True
+        )
+        self.scroll_engine.set_speed(self.saved_speed)
+        self.scroll_engine.finished.connect(self.on_scroll_finished)
+        self.scroll_engine.watch_visibility(self)
+        
         self.load_song()
         self.apply_theme()
     
@@ -146,49 +153,25 @@ class SongPreviewDialog(QDialog):
         
         if self.is_playing:
             self.play_pause_btn.setText("⏸ Pausar")
-            self.scroll_timer.start(50)
+            self.scroll_engine.start()
         else:
             self.play_pause_btn.setText("▶ Reproducir")
-            self.scroll_timer.stop()
+            self.scroll_engine.stop()
     
-    def auto_scroll(self):
-        """Scroll automático"""
-        if not self.is_playing:
-            return
-        
-        speed = self.speed_slider.value()
-        pixels_per_frame = speed / 20
-        
-        # Acumular el movimiento para permitir velocidades muy lentas
-        self.scroll_accumulator += pixels_per_frame
-        
-        scrollbar = self.lyrics_display.verticalScrollBar()
-        max_pos = scrollbar.maximum()
-        
-        # Solo mover cuando hayamos acumulado al menos 1 píxel
-        if self.scroll_accumulator >= 1.0:
-            pixels_to_move = int(self.scroll_accumulator)
-            self.scroll_accumulator -= pixels_to_move
-            
-            current_pos = scrollbar.value()
-            new_pos = current_pos + pixels_to_move
-            
-            if new_pos >= max_pos:
-                new_pos = max_pos
-                self.toggle_play()  # Pausar al final
-            
-            scrollbar.setValue(new_pos)
+    def on_scroll_finished(self):
+        """Pausar al llegar al final"""
+        self.toggle_play()
     
     def reset_scroll(self):
         """Reinicia el scroll"""
-        scrollbar = self.lyrics_display.verticalScrollBar()
-        scrollbar.setValue(0)
-        self.scroll_accumulator = 0.0  # Resetear acumulador
+        self.scroll_engine.reset()
     
     def on_speed_changed(self, value):
         """Actualiza la etiqueta de velocidad"""
         self.speed_label.setText(f"{value} px/s")
         self.saved_speed = value
+        if hasattr(self, 'scroll_engine'):
+            self.scroll_engine.set_speed(value)
     
     def save_and_close(self):
         """Guarda la velocidad y cierra"""
@@ -267,6 +250,5 @@ class SongPreviewDialog(QDialog):
     
     def closeEvent(self, event):
         """Limpia antes de cerrar"""
-        if self.scroll_timer.isActive():
-            self.scroll_timer.stop()
+        self.scroll_engine.stop()
         event.accept()
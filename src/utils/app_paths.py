@@ -0,0 +1,12 @@
+"""
+Ubicación de los archivos que genera la aplicación
+"""
+
+import os
+
+
+def logs_dir() -> str:
+    """Carpeta de registros y mediciones (junto a la base de datos, en el home del usuario)"""
+    path = os.path.join(os.path.expanduser("~"), "gimmeletter_logs")
+    os.makedirs(path, exist_ok=True)
+    return path
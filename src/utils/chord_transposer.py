@@ -3,6 +3,17 @@ Utilidad para transponer acordes musicales
 """
 
 import re
+from typing import List, NamedTuple, Optional, Tuple
+
+from .tracing import traced
+
+
+class ChordToken(NamedTuple):
+    """Acorde encontrado en una línea de acordes"""
+    column: int  # Columna donde empieza el acorde en la línea
+    text: str  # Texto original del acorde (ej: "Am7", "Solm")
+    root: int  # Semitonos desde Do/C (0-11)
+    quality: str  # Sufijo normalizado ("", "m", "7", "m7", "maj7", "sus4"...)
 
 
 class ChordTransposer:
@@ -16,6 +27,34 @@ class ChordTransposer:
     FLATS_LATIN = {'Reb': 'Do#', 'Mib': 'Re#', 'Solb': 'Fa#', 'Lab': 'Sol#', 'Sib': 'La#'}
     FLATS_ENGLISH = {'Db': 'C#', 'Eb': 'D#', 'Gb': 'F#', 'Ab': 'G#', 'Bb': 'A#'}
     
+    # Semitonos de cada nota natural desde Do/C (en minúsculas para buscar sin importar el case)
+    NATURAL_SEMITONES = {
+        'c': 0, 'd': 2, 'e': 4, 'f': 5, 'g': 7, 'a': 9, 'b': 11,
+        'do': 0, 're': 2, 'mi': 4, 'fa': 5, 'sol': 7, 'la': 9, 'si': 11,
+    }
+    
+    # Familias de acordes (usadas por los índices y el análisis armónico)
+    FAMILY_MAJOR = 0
+    FAMILY_MINOR = 1
+    FAMILY_DIMINISHED = 2
+    FAMILY_AUGMENTED = 3
+    FAMILY_SUSPENDED = 4
+    
+    # Calidad normalizada del semidisminuido (Bm7b5, Bø, Bø7)
+    HALF_DIMINISHED = "m7b5"
+    
+    # Patrones precompilados para el tokenizador (mismas reglas que transpose_text,
+    # sin contar el bajo de los acordes con barra como un acorde aparte)
+    _CHORD_RE_LATIN = re.compile(
+        r'(?<![\w#/])(Do|Re|Mi|Fa|Sol|La|Si)(#|b)?((?:m|M|maj|min|dim|aug|sus|add|ø|[b#]5|\d)*)(?![\w#])', re.IGNORECASE
+    )
+    _CHORD_RE_ENGLISH = re.compile(
+        r'(?<![\w#/])([A-G])(#|b)?((?:m|M|maj|min|dim|aug|sus|add|ø|[b#]5|\d)*)(?![\w#])', re.IGNORECASE
+    )
+    _LATIN_DETECT_RE = re.compile(
+        r'\b(Do|Re|Mi|Fa|Sol|La|Si)(#|b)?(m|M|maj|min|dim|aug|sus|add|ø|[b#]5|\d)*\b'
+    )
+    
     @classmethod
     def transpose_chord(cls, chord: str, semitones: int, use_latin: bool = False) -> str:
         """
@@ -71,7 +110,9 @@ class ChordTransposer:
         return new_note + suffix
     
     @classmethod
-    def transpose_text(cls, text: str, semitones: int, use_latin: bool = False) -> str:
+    @traced(category="transpose")
+    def transpose_text(cls, text: str, semitones: int, use_latin: bool = False,
+                       line_kinds: Optional[bytes] = None) -> str:
         """
         Transpone todos los acordes en un texto
         
@@ -79,6 +120,8 @@ class ChordTransposer:
             text: Texto con letra y acordes
             semitones: Número de semitonos a transponer
             use_latin: Si True usa notación latina
+            line_kinds: Mapa de bits precalculado (ver song_analysis) que indica
+                qué líneas son de acordes. Si se omite se clasifica cada línea.
         
         Returns:
             Texto con acordes transpuestos
@@ -86,15 +129,21 @@ class ChordTransposer:
         if semitones == 0:
             return text
         
+        # Import local: song_analysis depende de este módulo
+        from .song_analysis import is_chord_line as stored_chord_line
+        
         lines = text.split('\n')
         result = []
         
-        for line in lines:
-            # Detectar si la línea contiene acordes (heurística simple)
-            # Una línea de acordes típicamente tiene espacios y acordes cortos
-            words = line.split()
+        for index, line in enumerate(lines):
+            if line_kinds is not None:
+                is_chord_line = stored_chord_line(line_kinds, index)
+            else:
+                # Detectar si la línea contiene acordes (heurística simple)
+                # Una línea de acordes típicamente tiene espacios y acordes cortos
+                is_chord_line = cls._is_chord_line(line.split(), use_latin)
             
-            if cls._is_chord_line(words, use_latin):
+            if is_chord_line:
                 # Transponer preservando el espaciado original
                 transposed_line = cls._transpose_line_preserve_spacing(line, semitones, use_latin)
                 result.append(transposed_line)
@@ -109,10 +158,10 @@ class ChordTransposer:
         """Transpone acordes en una línea preservando el espaciado original"""
         if use_latin:
             # Patrón para acordes latinos
-            pattern = r'\b(Do|Re|Mi|Fa|Sol|La|Si)(#|b)?(m|M|maj|min|dim|aug|sus|add|\d)*\b'
+            pattern = r'\b(Do|Re|Mi|Fa|Sol|La|Si)(#|b)?(m|M|maj|min|dim|aug|sus|add|ø|[b#]5|\d)*\b'
         else:
             # Patrón para acordes ingleses
-            pattern = r'\b[A-G](#|b)?(m|M|maj|min|dim|aug|sus|add|\d)*\b'
+            pattern = r'\b[A-G](#|b)?(m|M|maj|min|dim|aug|sus|add|ø|[b#]5|\d)*\b'
         
         def replace_chord(match):
             chord = match.group(0)
@@ -128,10 +177,10 @@ class ChordTransposer:
         
         if use_latin:
             # Patrón más estricto para notación latina
-            chord_pattern = r'^(Do|Re|Mi|Fa|Sol|La|Si)(#|b)?(m|M|maj|min|dim|aug|sus|add|\d)*$'
+            chord_pattern = r'^(Do|Re|Mi|Fa|Sol|La|Si)(#|b)?(m|M|maj|min|dim|aug|sus|add|ø|[b#]5|\d)*$'
         else:
             # Patrón más estricto para notación inglesa - solo letras A-G seguidas de modificadores
-            chord_pattern = r'^[A-G](#|b)?(m|M|maj|min|dim|aug|sus|add|\d)*$'
+            chord_pattern = r'^[A-G](#|b)?(m|M|maj|min|dim|aug|sus|add|ø|[b#]5|\d)*$'
         
         # Contar cuántas palabras coinciden con el patrón de acorde
         chord_count = sum(1 for word in words if re.match(chord_pattern, word, re.IGNORECASE))
@@ -145,6 +194,91 @@ class ChordTransposer:
         chord_ratio = chord_count / len(words) if len(words) > 0 else 0
         return chord_ratio >= 0.7 and chord_count >= 2
     
+    @classmethod
+    def is_chord_line(cls, line: str, use_latin: bool = False) -> bool:
+        """Determina si una línea de texto es una línea de acordes"""
+        return cls._is_chord_line(line.split(), use_latin)
+    
+    @classmethod
+    def detect_latin(cls, text: str) -> bool:
+        """Detecta si un texto usa notación latina (Do, Re, Mi...)"""
+        # Se respeta el case para evitar falsos positivos con palabras comunes
+        return bool(cls._LATIN_DETECT_RE.search(text or ""))
+    
+    @classmethod
+    def parse_chord(cls, chord: str, use_latin: bool = False) -> Optional[Tuple[int, str]]:
+        """
+        Separa un acorde en su nota base y su calidad normalizada
+        
+        Returns:
+            Tupla (semitonos desde Do/C, calidad) o None si no es un acorde
+        """
+        pattern = cls._CHORD_RE_LATIN if use_latin else cls._CHORD_RE_ENGLISH
+        match = pattern.fullmatch(chord.strip())
+        if not match:
+            return None
+        return cls._root_semitones(match.group(1), match.group(2)), cls.normalize_quality(match.group(3))
+    
+    @classmethod
+    def tokenize_line(cls, line: str, use_latin: bool = False) -> List[ChordToken]:
+        """Extrae los acordes de una línea de acordes con su posición"""
+        pattern = cls._CHORD_RE_LATIN if use_latin else cls._CHORD_RE_ENGLISH
+        tokens = []
+        for match in pattern.finditer(line):
+            tokens.append(ChordToken(
+                column=match.start(),
+                text=match.group(0),
+                root=cls._root_semitones(match.group(1), match.group(2)),
+                quality=cls.normalize_quality(match.group(3))
+            ))
+        return tokens
+    
+    @staticmethod
+    def normalize_quality(suffix: str) -> str:
+        """
+        Normaliza el sufijo de un acorde para poder compararlo
+        
+        "min7" -> "m7", "M7" -> "maj7", "Maj" -> "", "SUS4" -> "sus4", "ø7" -> "m7b5"
+        """
+        if not suffix:
+            return ""
+        lowered = suffix.lower()
+        if lowered.startswith('ø'):
+            return ChordTransposer.HALF_DIMINISHED
+        if lowered.startswith('maj'):
+            rest = lowered[3:]
+            return f"maj{rest}" if rest else ""
+        if lowered.startswith('min'):
+            return "m" + lowered[3:]
+        if suffix[0] == 'M':
+            rest = lowered[1:]
+            return f"maj{rest}" if rest else ""
+        return lowered
+    
+    @classmethod
+    def chord_family(cls, quality: str) -> int:
+        """Clasifica una calidad normalizada en mayor, menor, disminuido, aumentado o suspendido"""
+        # El semidisminuido tiene la tríada disminuida: va con los disminuidos, no con los menores
+        if quality.startswith('dim') or quality.startswith(cls.HALF_DIMINISHED):
+            return cls.FAMILY_DIMINISHED
+        if quality.startswith('aug'):
+            return cls.FAMILY_AUGMENTED
+        if quality.startswith('sus'):
+            return cls.FAMILY_SUSPENDED
+        if quality.startswith('m') and not quality.startswith('maj'):
+            return cls.FAMILY_MINOR
+        return cls.FAMILY_MAJOR
+    
+    @classmethod
+    def _root_semitones(cls, note: str, accidental: Optional[str]) -> int:
+        """Convierte nota + alteración en semitonos desde Do/C"""
+        semitones = cls.NATURAL_SEMITONES[note.lower()]
+        if accidental == '#':
+            semitones += 1
+        elif accidental:
+            semitones -= 1
+        return semitones % 12
+    
     @classmethod
     def get_key_name(cls, semitones_from_c: int, use_latin: bool = False) -> str:
         """Obtiene el nombre de la tonalidad dado un número de semitonos desde Do/C"""
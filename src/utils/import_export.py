@@ -77,7 +77,12 @@ def export_songs_to_json(songs):
             'lyrics_with_chords': song.lyrics_with_chords,
             'bpm': song.bpm,
             'original_key': song.original_key,
-            'default_scroll_speed': song.default_scroll_speed
+            'default_scroll_speed': song.default_scroll_speed,
+            # Análisis precalculado al guardar (informativo, se recalcula al importar)
+            'notation': song.notation,
+            'line_count': song.line_count,
+            'chord_count': song.chord_count,
+            'content_hash': song.content_hash
         }
         export_data['songs'].append(song_data)
     
@@ -115,6 +120,10 @@ def export_sets_to_json(sets_with_songs, db_manager):
                 'bpm': row['bpm'],
                 'original_key': row['original_key'],
                 'default_scroll_speed': row['default_scroll_speed'],
+                'notation': row['notation'],
+                'line_count': row['line_count'],
+                'chord_count': row['chord_count'],
+                'content_hash': row['content_hash'],
                 # Configuración específica del set
                 'scroll_speed': row['scroll_speed'],
                 'transposition': row['transposition'],
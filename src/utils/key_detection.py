@@ -0,0 +1,262 @@
+"""
+Estimación de tonalidad a partir de los acordes
+
+Se arma un histograma de clases de altura con las notas de cada acorde,
+ponderado por posición (el primer y el último acorde de la canción y el
+primero de cada línea pesan más), y se correlaciona con los perfiles de
+Krumhansl-Kessler de las 24 tonalidades mayores y menores.
+"""
+
+import math
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from .chord_transposer import ChordTransposer
+from .song_analysis import NOTATION_LATIN, is_chord_line
+
+
+# Perfiles de Krumhansl-Kessler (desde la tónica)
+MAJOR_PROFILE = (6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88)
+MINOR_PROFILE = (6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17)
+
+# Intervalos de las notas de cada familia de acordes
+CHORD_TONES = {
+    ChordTransposer.FAMILY_MAJOR: (0, 4, 7),
+    ChordTransposer.FAMILY_MINOR: (0, 3, 7),
+    ChordTransposer.FAMILY_DIMINISHED: (0, 3, 6),
+    ChordTransposer.FAMILY_AUGMENTED: (0, 4, 8),
+    ChordTransposer.FAMILY_SUSPENDED: (0, 5, 7),
+}
+
+# Pesos por posición
+FIRST_CHORD_WEIGHT = 2.0
+LAST_CHORD_WEIGHT = 3.0
+LINE_START_WEIGHT = 1.5
+ROOT_WEIGHT = 2.0  # La nota base pesa más que el resto del acorde
+
+# Por debajo de esta cantidad de canciones no vale la pena levantar procesos
+MIN_SONGS_FOR_POOL = 200
+CHUNK_SIZE = 250
+
+
+def _rotations(profile: Sequence[float]) -> List[Tuple[float, ...]]:
+    """Perfil centrado (media cero) rotado para cada tónica"""
+    mean = sum(profile) / 12
+    centered = [value - mean for value in profile]
+    return [tuple(centered[(pc - tonic) % 12] for pc in range(12)) for tonic in range(12)]
+
+
+_MAJOR_KEYS = _rotations(MAJOR_PROFILE)
+_MINOR_KEYS = _rotations(MINOR_PROFILE)
+
+
+def pitch_class_histogram(text: str, use_latin: Optional[bool] = None,
+                          line_kinds: Optional[bytes] = None) -> List[float]:
+    """
+    Histograma de clases de altura ponderado por posición
+
+    Con line_kinds (la clasificación guardada en la BD) no se vuelve a
+    clasificar cada línea.
+    """
+    if use_latin is None:
+        use_latin = ChordTransposer.detect_latin(text)
+
+    # (nota base, familia, peso) de cada acorde en orden
+    weighted = []
+    for index, line in enumerate((text or "").split('\n')):
+        if line_kinds is not None:
+            if not is_chord_line(line_kinds, index):
+                continue
+        elif not ChordTransposer.is_chord_line(line, use_latin):
+            continue
+        for position, token in enumerate(ChordTransposer.tokenize_line(line, use_latin)):
+            weight = LINE_START_WEIGHT if position == 0 else 1.0
+            weighted.append([token.root, ChordTransposer.chord_family(token.quality), weight])
+
+    if weighted:
+        weighted[0][2] *= FIRST_CHORD_WEIGHT
+        weighted[-1][2] *= LAST_CHORD_WEIGHT
+
+    histogram = [0.0] * 12
+    for root, family, weight in weighted:
+        for interval in CHORD_TONES[family]:
+            histogram[(root + interval) % 12] += weight * (ROOT_WEIGHT if interval == 0 else 1.0)
+    return histogram
+
+
+def score_keys(histogram: Sequence[float]) -> List[Tuple[float, int, bool]]:
+    """
+    Correlación del histograma con las 24 tonalidades
+
+    Returns:
+        Lista de (correlación, tónica, es_menor) ordenada de mejor a peor
+    """
+    mean = sum(histogram) / 12
+    centered = [value - mean for value in histogram]
+    norm = math.sqrt(sum(value * value for value in centered))
+    if norm == 0:
+        return []
+
+    scores = []
+    for is_minor, keys in ((False, _MAJOR_KEYS), (True, _MINOR_KEYS)):
+        for tonic, profile in enumerate(keys):
+            dot = sum(h * p for h, p in zip(centered, profile))
+            profile_norm = math.sqrt(sum(p * p for p in profile))
+            scores.append((dot / (norm * profile_norm), tonic, is_minor))
+    scores.sort(reverse=True)
+    return scores
+
+
+def estimate_key(text: str, line_kinds: Optional[bytes] = None,
+                 notation: Optional[str] = None) -> Optional[Tuple[str, float]]:
+    """
+    Estima la tonalidad de una canción
+
+    Args:
+        text: Letra con acordes
+        line_kinds: Clasificación de líneas guardada (si no, se clasifica la letra)
+        notation: Notación guardada (si no, se detecta)
+
+    Returns:
+        (nombre de la tonalidad en la notación de la canción, confianza 0-1) o None si no hay acordes
+    """
+    use_latin = notation == NOTATION_LATIN if notation else ChordTransposer.detect_latin(text)
+    scores = score_keys(pitch_class_histogram(text, use_latin, line_kinds))
+    if not scores:
+        return None
+
+    best, tonic, is_minor = scores[0]
+    second = scores[1][0]
+    # Confianza: qué tan bien encaja la mejor tonalidad y cuánto se separa de la siguiente
+    confidence = max(0.0, min(1.0, best)) * min(1.0, 0.5 + (best - second) * 5)
+
+    name = ChordTransposer.get_key_name(tonic, use_latin)
+    if is_minor:
+        name += "m"
+    return name, round(confidence, 3)
+
+
+def estimate_key_batch(songs: Sequence[Tuple[int, str, Optional[bytes], Optional[str]]]
+                       ) -> List[Tuple[int, str, float]]:
+    """Estima la tonalidad de un lote de (id, letra, line_kinds, notación) (corre en los procesos del pool)"""
+    results = []
+    for song_id, text, line_kinds, notation in songs:
+        estimated = estimate_key(text, line_kinds, notation)
+        if estimated:
+            results.append((song_id, estimated[0], estimated[1]))
+    return results
+
+
+def estimate_keys(songs: Sequence[Tuple[int, str, Optional[bytes], Optional[str]]],
+                  max_workers: Optional[int] = None,
+                  min_confidence: float = 0.0,
+                  proceed: Optional[Callable[[], bool]] = None) -> List[Tuple[int, str, float]]:
+    """
+    Estima la tonalidad de muchas canciones, repartidas en procesos si son bastantes
+
+    Args:
+        songs: (id, letra, line_kinds, notación), como los devuelve get_songs_missing_key
+        max_workers: Procesos del pool (por defecto, uno por CPU)
+        min_confidence: Solo se devuelven estimaciones con al menos esta confianza
+        proceed: Se llama antes de cada lote; puede bloquear (pausa) y si retorna
+            False se abandona lo que falta
+
+    Returns:
+        Lista de (song_id, tonalidad, confianza)
+    """
+    chunks = [songs[i:i + CHUNK_SIZE] for i in range(0, len(songs), CHUNK_SIZE)]
+    results: List[Tuple[int, str, float]] = []
+    if len(songs) < MIN_SONGS_FOR_POOL:
+        for chunk in chunks:
+            if proceed is not None and not proceed():
+                break
+            results.extend(estimate_key_batch(chunk))
+    else:
+        workers = max_workers or min(len(chunks), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # A lo sumo un lote por proceso en vuelo, así una pausa deja el pool sin trabajo
+            in_flight = deque()
+            for chunk in chunks:
+                if proceed is not None and not proceed():
+                    break
+                if len(in_flight) >= workers:
+                    results.extend(in_flight.popleft().result())
+                in_flight.append(pool.submit(estimate_key_batch, chunk))
+            for future in in_flight:
+                results.extend(future.result())
+    return [result for result in results if result[2] >= min_confidence]
+
+
+class KeyEstimation:
+    """
+    estimate_keys en un hilo aparte, que se puede pausar y cancelar
+
+    La pausa se respeta entre lotes: lo que ya está en proceso termina, pero no
+    se reparte más trabajo hasta resume(). La interfaz consulta done() y guarda
+    los resultados con update_estimated_keys desde su propio hilo (la conexión
+    SQLite no se comparte).
+    """
+
+    def __init__(self, songs: Sequence[Tuple[int, str, Optional[bytes], Optional[str]]],
+                 max_workers: Optional[int] = None, min_confidence: float = 0.0):
+        self._running = threading.Event()
+        self._running.set()
+        self.cancelled = False
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="key-estimation")
+        self.future = executor.submit(estimate_keys, songs, max_workers, min_confidence, self._proceed)
+        executor.shutdown(wait=False)
+
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set()
+
+    def pause(self):
+        """No reparte más lotes hasta resume()"""
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def cancel(self):
+        """Abandona lo que falta (el hilo termina en cuanto vuelve a preguntar)"""
+        self.cancelled = True
+        self._running.set()
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout: Optional[float] = None) -> List[Tuple[int, str, float]]:
+        return self.future.result(timeout)
+
+    def _proceed(self) -> bool:
+        self._running.wait()
+        return not self.cancelled
+
+
+def start_key_estimation(songs: Sequence[Tuple[int, str, Optional[bytes], Optional[str]]],
+                         max_workers: Optional[int] = None,
+                         min_confidence: float = 0.0) -> KeyEstimation:
+    """Lanza estimate_keys en un hilo aparte (ver KeyEstimation)"""
+    return KeyEstimation(songs, max_workers, min_confidence)
+
+
+def estimate_missing_keys(db_manager, max_workers: Optional[int] = None,
+                          min_confidence: float = 0.0) -> int:
+    """
+    Completa original_key en todas las canciones que no la tienen (bloquea hasta terminar)
+
+    Args:
+        db_manager: DatabaseManager de la biblioteca
+        max_workers: Procesos del pool (por defecto, uno por CPU)
+        min_confidence: Solo se guardan estimaciones con al menos esta confianza
+
+    Returns:
+        Cantidad de canciones actualizadas
+    """
+    songs = db_manager.get_songs_missing_key()
+    if not songs:
+        return 0
+    return db_manager.update_estimated_keys(estimate_keys(songs, max_workers, min_confidence))
@@ -0,0 +1,138 @@
+"""
+Optimizador de transposición y cejilla para un set completo
+
+Para cada canción evalúa las 12 transposiciones y todas las posiciones de
+cejilla contra un modelo de dificultad de formas de acordes (guitarra) y
+propone el valor de transposición que minimiza las formas difíciles dentro
+del rango vocal indicado.
+
+La forma que se toca depende solo de (transposición - cejilla) mod 12, así
+que por canción se calculan 12 costos una sola vez y luego cada combinación
+transposición/cejilla es una consulta a esa tabla.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
+
+from .chord_transposer import ChordTransposer
+
+
+# Costo de cada forma por familia (nota base en semitonos desde C). Lo que no
+# aparece es una cejilla completa o una forma incómoda.
+EASY_SHAPES = {
+    ChordTransposer.FAMILY_MAJOR: {0: 0.0, 2: 0.0, 4: 0.0, 7: 0.0, 9: 0.0, 5: 2.0},
+    ChordTransposer.FAMILY_MINOR: {9: 0.0, 4: 0.0, 2: 0.0, 11: 2.0},
+    ChordTransposer.FAMILY_SUSPENDED: {2: 0.0, 9: 0.0, 4: 0.0},
+    ChordTransposer.FAMILY_DIMINISHED: {},
+    ChordTransposer.FAMILY_AUGMENTED: {},
+}
+HARD_SHAPE_COST = 3.0
+
+# Penalizaciones para desempatar: preferir poca cejilla y quedarse cerca del centro del rango
+CAPO_PENALTY = 0.05
+SHIFT_PENALTY = 0.01
+
+DEFAULT_MAX_CAPO = 7
+
+
+def shape_cost(root: int, family: int) -> float:
+    """Dificultad de tocar la forma (root, family) sin cejilla"""
+    return EASY_SHAPES.get(family, {}).get(root % 12, HARD_SHAPE_COST)
+
+
+@dataclass
+class KeyProposal:
+    """Transposición y cejilla propuestas para una canción"""
+    song_id: int
+    transposition: int
+    capo: int
+    cost: float
+    hard_shapes: List[str] = field(default_factory=list)  # Formas difíciles que quedan
+
+
+class SetKeyOptimizer:
+    """Propone transposiciones para todas las canciones de un set"""
+
+    def __init__(self, max_capo: int = DEFAULT_MAX_CAPO):
+        self.max_capo = max(0, min(11, max_capo))
+
+    def optimize(self, chord_histograms: Dict[int, List[Tuple[int, str, int]]],
+                 min_transposition: int = -11, max_transposition: int = 11,
+                 target_transposition: int = 0) -> Dict[int, KeyProposal]:
+        """
+        Calcula la mejor transposición de cada canción
+
+        Args:
+            chord_histograms: {song_id: [(nota base, calidad, apariciones), ...]}
+            min_transposition: Límite inferior del rango vocal, en semitonos
+            max_transposition: Límite superior del rango vocal, en semitonos
+            target_transposition: Desplazamiento preferido dentro del rango (desempate)
+
+        Returns:
+            {song_id: KeyProposal}
+        """
+        if min_transposition > max_transposition:
+            raise ValueError("El rango de transposición está invertido")
+        transpositions = range(max(-11, min_transposition), min(11, max_transposition) + 1)
+
+        proposals = {}
+        for song_id, histogram in chord_histograms.items():
+            chords = self._collapse(histogram)
+            if not chords:
+                # Sin acordes no hay nada que proponer: queda la transposición que eligió el usuario
+                continue
+            costs = self._shape_costs(chords)
+
+            best = None
+            for transposition in transpositions:
+                shift_penalty = SHIFT_PENALTY * abs(transposition - target_transposition)
+                for capo in range(self.max_capo + 1):
+                    total = costs[(transposition - capo) % 12] + CAPO_PENALTY * capo + shift_penalty
+                    if best is None or total < best[0]:
+                        best = (total, transposition, capo)
+
+            if best is None:
+                continue
+            _, transposition, capo = best
+            proposals[song_id] = KeyProposal(
+                song_id=song_id,
+                transposition=transposition,
+                capo=capo,
+                cost=costs[(transposition - capo) % 12],
+                hard_shapes=self._hard_shapes(chords, (transposition - capo) % 12)
+            )
+        return proposals
+
+    @staticmethod
+    def _collapse(histogram: Iterable[Tuple[int, str, int]]) -> Dict[Tuple[int, int], int]:
+        """Agrupa el histograma por (nota base, familia), que es lo que determina la forma"""
+        chords: Dict[Tuple[int, int], int] = {}
+        for root, quality, occurrences in histogram:
+            key = (root % 12, ChordTransposer.chord_family(quality))
+            chords[key] = chords.get(key, 0) + occurrences
+        return chords
+
+    @staticmethod
+    def _shape_costs(chords: Dict[Tuple[int, int], int]) -> List[float]:
+        """Costo promedio por aparición para cada uno de los 12 desplazamientos de forma"""
+        total = sum(chords.values()) or 1
+        return [
+            sum(count * shape_cost(root + shift, family) for (root, family), count in chords.items()) / total
+            for shift in range(12)
+        ]
+
+    @staticmethod
+    def _hard_shapes(chords: Dict[Tuple[int, int], int], shift: int) -> List[str]:
+        """Nombres de las formas que siguen siendo difíciles con el desplazamiento elegido"""
+        suffixes = {
+            ChordTransposer.FAMILY_MAJOR: "",
+            ChordTransposer.FAMILY_MINOR: "m",
+            ChordTransposer.FAMILY_DIMINISHED: "dim",
+            ChordTransposer.FAMILY_AUGMENTED: "aug",
+            ChordTransposer.FAMILY_SUSPENDED: "sus",
+        }
+        return sorted(
+            ChordTransposer.get_key_name(root + shift) + suffixes[family]
+            for (root, family) in chords
+            if shape_cost(root + shift, family) >= HARD_SHAPE_COST
+        )
@@ -0,0 +1,151 @@
+"""
+Ajuste de línea que mantiene los acordes sobre su sílaba
+
+Una línea de acordes seguida de una línea de letra se trata como una unidad:
+ambas se cortan en la misma columna, eligiendo un espacio de la letra que no
+caiga en medio de un acorde. Así, en pantallas angostas, cada acorde sigue
+encima de la sílaba donde se toca.
+"""
+
+from typing import List, Optional, Tuple
+
+from .chord_transposer import ChordTransposer
+
+
+def widest_line(text: str) -> int:
+    """Largo (en caracteres) de la línea más larga"""
+    return max((len(line) for line in (text or "").split('\n')), default=0)
+
+
+def wrap_line(line: str, columns: int) -> List[str]:
+    """Parte una línea en trozos de a lo sumo columns caracteres, cortando en espacios si se puede"""
+    if columns <= 0 or len(line) <= columns:
+        return [line]
+
+    pieces = []
+    while len(line) > columns:
+        cut = line.rfind(' ', 0, columns + 1)
+        if cut <= 0:
+            cut = columns
+        pieces.append(line[:cut].rstrip())
+        line = line[cut:].lstrip(' ')
+    pieces.append(line)
+    return pieces
+
+
+def _splits_chord(chords: str, column: int) -> bool:
+    """Indica si cortar en column parte un acorde en dos"""
+    return 0 < column < len(chords) and chords[column - 1] != ' ' and chords[column] != ' '
+
+
+def _pair_cut(chords: str, lyric: str, columns: int) -> int:
+    """Columna donde cortar un par acordes/letra que no entra en columns"""
+    # Preferido: un espacio de la letra (o su final) sin partir un acorde
+    for column in range(columns, 0, -1):
+        at_space = column >= len(lyric) or lyric[column] == ' '
+        if at_space and not _splits_chord(chords, column):
+            return column
+    # Si no, al menos no partir un acorde
+    for column in range(columns, 0, -1):
+        if not _splits_chord(chords, column):
+            return column
+    return columns
+
+
+def _leading_spaces(text: str) -> int:
+    return len(text) - len(text.lstrip(' '))
+
+
+def wrap_pair(chords: str, lyric: str, columns: int) -> List[str]:
+    """
+    Ajusta una línea de acordes y la letra que va debajo cortando ambas en la misma columna
+
+    Returns:
+        Líneas resultantes alternando acordes y letra (se omiten los trozos vacíos)
+    """
+    return _wrap_pair(chords, lyric, columns)[0]
+
+
+def _wrap_pair(chords: str, lyric: str, columns: int) -> Tuple[List[str], Optional[int]]:
+    """Como wrap_pair, pero además retorna el índice del primer trozo de letra (None si no hay)"""
+    if columns <= 0 or max(len(chords), len(lyric)) <= columns:
+        return [chords, lyric], 1
+
+    pieces: List[str] = []
+    lyric_start: Optional[int] = None
+    while max(len(chords), len(lyric)) > columns:
+        cut = _pair_cut(chords, lyric, columns)
+        chord_piece, lyric_piece = chords[:cut].rstrip(), lyric[:cut].rstrip()
+        if chord_piece:
+            pieces.append(chord_piece)
+        if lyric_piece:
+            # El primer trozo de acordes puede faltar (letra sin acordes encima al principio)
+            if lyric_start is None:
+                lyric_start = len(pieces)
+            pieces.append(lyric_piece)
+
+        chords, lyric = chords[cut:], lyric[cut:]
+        # Quitar la sangría común para que el resto empiece al margen sin desalinearse
+        indent = min(
+            _leading_spaces(part) for part in (chords, lyric) if part.strip()
+        ) if (chords.strip() or lyric.strip()) else 0
+        chords, lyric = chords[indent:], lyric[indent:]
+
+    if chords.strip():
+        pieces.append(chords.rstrip())
+    if lyric.strip():
+        if lyric_start is None:
+            lyric_start = len(pieces)
+        pieces.append(lyric.rstrip())
+    return pieces, lyric_start
+
+
+def wrap_lyrics(text: str, columns: int, use_latin: Optional[bool] = None) -> List[str]:
+    """
+    Ajusta una letra con acordes a columns caracteres por línea
+
+    Args:
+        text: Letra (ya transpuesta) a mostrar
+        columns: Caracteres por línea (0 = sin ajuste)
+        use_latin: Notación de los acordes (None = detectar)
+
+    Returns:
+        Líneas a mostrar
+    """
+    return wrap_lyrics_with_sources(text, columns, use_latin)[0]
+
+
+def wrap_lyrics_with_sources(text: str, columns: int,
+                             use_latin: Optional[bool] = None) -> Tuple[List[str], List[int]]:
+    """
+    Igual que wrap_lyrics, pero además indica dónde quedó cada línea original
+
+    Returns:
+        (líneas a mostrar, índice de la primera línea mostrada de cada línea original)
+    """
+    lines = (text or "").split('\n')
+    if columns <= 0 or widest_line(text) <= columns:
+        return lines, list(range(len(lines)))
+    if use_latin is None:
+        use_latin = ChordTransposer.detect_latin(text)
+
+    result: List[str] = []
+    starts: List[int] = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        starts.append(len(result))
+        if ChordTransposer.is_chord_line(line, use_latin):
+            following = lines[i + 1] if i + 1 < len(lines) else ""
+            if following.strip() and not ChordTransposer.is_chord_line(following, use_latin):
+                pieces, lyric_start = _wrap_pair(line, following, columns)
+                starts.append(len(result) + lyric_start)
+                result.extend(pieces)
+                i += 2
+                continue
+            # Acordes sin letra debajo: se cortan solo entre acordes
+            result.extend(wrap_pair(line, "", columns) if len(line) > columns else [line])
+        else:
+            result.extend(wrap_line(line, columns))
+        i += 1
+    return result, starts
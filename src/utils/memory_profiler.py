@@ -0,0 +1,143 @@
+"""
+Instantáneas de memoria para encontrar fugas
+
+Se toma una línea base (instantánea de tracemalloc, conteo de widgets vivos
+por clase y memoria residente del proceso) y, después de usar la aplicación
+un rato, se compara contra ella: las líneas de código que más memoria
+sumaron y las clases de widgets que quedaron vivas de más.
+
+tracemalloc se activa recién al tomar la primera línea base, porque mientras
+está activo cada reserva de memoria de Python cuesta más, y se detiene al
+descartar la línea base (reset).
+"""
+
+import os
+import sys
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from PyQt6.QtWidgets import QApplication, QWidget
+
+
+# Profundidad de pila que guarda tracemalloc por cada reserva
+TRACE_FRAMES = 1
+# Cantidad de líneas de código que se muestran en la comparación
+TOP_LINES = 15
+
+
+def rss_bytes() -> int:
+    """Memoria residente del proceso (0 si no se puede saber)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    # Sin /proc (macOS): el máximo histórico es lo que hay; en macOS viene en bytes
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def widget_counts(exclude: Optional[QWidget] = None) -> Counter:
+    """Widgets vivos por clase (sin contar los de la ventana `exclude`)"""
+    counts = Counter()
+    for widget in QApplication.allWidgets():
+        if exclude is not None and (widget is exclude or exclude.isAncestorOf(widget)):
+            continue
+        counts[type(widget).__name__] += 1
+    return counts
+
+
+@dataclass
+class MemoryDiff:
+    """Resultado de comparar contra la línea base"""
+    rss_delta: int
+    traced_delta: int
+    widget_deltas: Dict[str, int] = field(default_factory=dict)
+    top_lines: List[tracemalloc.StatisticDiff] = field(default_factory=list)
+
+    def report(self) -> str:
+        """Texto legible de la comparación"""
+        lines = [
+            f"Memoria residente: {self.rss_delta / 1024 / 1024:+.1f} MB",
+            f"Memoria de Python (tracemalloc): {self.traced_delta / 1024:+.1f} KB",
+            "",
+            "Widgets vivos respecto de la línea base:",
+        ]
+        if self.widget_deltas:
+            for name, delta in self.widget_deltas.items():
+                lines.append(f"  {delta:+5d}  {name}")
+        else:
+            lines.append("  (sin cambios)")
+        lines += ["", "Líneas que más memoria sumaron:"]
+        for stat in self.top_lines:
+            frame = stat.traceback[0]
+            lines.append(
+                f"  {stat.size_diff / 1024:+9.1f} KB  {stat.count_diff:+7d} bloques  "
+                f"{frame.filename}:{frame.lineno}"
+            )
+        return "\n".join(lines)
+
+
+class MemoryProfiler:
+    """Línea base de memoria y comparación contra ella"""
+
+    def __init__(self):
+        self.baseline: Optional[tracemalloc.Snapshot] = None
+        self.baseline_widgets: Counter = Counter()
+        self.baseline_rss = 0
+        self._started_tracing = False  # tracemalloc lo activó este perfilador (y lo detiene reset)
+
+    @property
+    def has_baseline(self) -> bool:
+        return self.baseline is not None
+
+    def take_baseline(self, exclude: Optional[QWidget] = None):
+        """Toma la línea base (activa tracemalloc si hace falta)"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            self._started_tracing = True
+        self.baseline = self._snapshot()
+        self.baseline_widgets = widget_counts(exclude)
+        self.baseline_rss = rss_bytes()
+
+    def reset(self):
+        """Descarta la línea base y detiene tracemalloc si lo había activado take_baseline"""
+        self.baseline = None
+        self.baseline_widgets = Counter()
+        self.baseline_rss = 0
+        if self._started_tracing:
+            self._started_tracing = False
+            tracemalloc.stop()
+
+    def compare(self, exclude: Optional[QWidget] = None, limit: int = TOP_LINES) -> MemoryDiff:
+        """Compara el estado actual contra la línea base"""
+        if self.baseline is None:
+            raise RuntimeError("No hay línea base: llamar primero a take_baseline()")
+        snapshot = self._snapshot()
+        stats = snapshot.compare_to(self.baseline, 'lineno')
+        widgets = widget_counts(exclude)
+        deltas = {
+            name: widgets[name] - self.baseline_widgets[name]
+            for name in set(widgets) | set(self.baseline_widgets)
+            if widgets[name] != self.baseline_widgets[name]
+        }
+        return MemoryDiff(
+            rss_delta=rss_bytes() - self.baseline_rss,
+            traced_delta=sum(stat.size_diff for stat in stats),
+            widget_deltas=dict(sorted(deltas.items(), key=lambda item: -abs(item[1]))),
+            top_lines=[stat for stat in stats if stat.size_diff][:limit],
+        )
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        """Instantánea sin las reservas del propio tracemalloc"""
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
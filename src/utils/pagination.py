@@ -0,0 +1,64 @@
+"""
+Paginación de letras para el modo de páginas del reproductor
+
+Las páginas se cortan preferentemente en un límite de estrofa (una línea
+vacía) y, si no hay ninguno en la segunda mitad de la página, nunca entre
+una línea de acordes y la letra que va debajo.
+"""
+
+from typing import List, Optional, Sequence
+
+from .chord_transposer import ChordTransposer
+
+
+# Una página debe quedar al menos así de llena antes de cortarla en una estrofa
+MIN_PAGE_FILL = 0.5
+
+
+def paginate(lines: Sequence[str], lines_per_page: int,
+             use_latin: Optional[bool] = None) -> List[int]:
+    """
+    Calcula dónde empieza cada página
+
+    Args:
+        lines: Líneas ya maquetadas (con el ajuste de línea aplicado)
+        lines_per_page: Líneas que entran en una página
+        use_latin: Notación de los acordes (None = detectar si hace falta)
+
+    Returns:
+        Índice de la primera línea de cada página (al menos una página)
+    """
+    lines_per_page = max(1, lines_per_page)
+    count = len(lines)
+    min_lines = max(1, int(lines_per_page * MIN_PAGE_FILL))
+
+    starts: List[int] = []
+    start = 0
+    while start < count:
+        # Las líneas vacías al comienzo de una página no aportan nada
+        while start < count and not lines[start].strip():
+            start += 1
+        if start >= count:
+            break
+        starts.append(start)
+
+        end = start + lines_per_page
+        if end >= count:
+            break
+
+        cut = None
+        for index in range(end, start + min_lines - 1, -1):
+            if not lines[index].strip():
+                cut = index
+                break
+
+        if cut is None:
+            # Sin límite de estrofa: no dejar un acorde separado de su letra
+            cut = end
+            if use_latin is None:
+                use_latin = ChordTransposer.detect_latin("\n".join(lines))
+            if cut - start > 1 and ChordTransposer.is_chord_line(lines[cut - 1], use_latin):
+                cut -= 1
+        start = cut
+
+    return starts or [0]
@@ -0,0 +1,110 @@
+"""
+Modo rendimiento para la reproducción en vivo
+
+Mientras el scroll avanza, una recolección completa del GC de Python o un
+trabajo en segundo plano pueden demorar un tick lo suficiente para que se
+note un tirón. En modo rendimiento, al empezar a reproducir:
+
+- la primera vez, se hace una recolección completa y se congelan (gc.freeze)
+  los objetos existentes, que son de larga vida (biblioteca, ventanas,
+  maquetados), así el GC no los vuelve a recorrer;
+- se difiere la generación 2 subiendo su umbral (las generaciones jóvenes,
+  que son baratas, siguen funcionando);
+- se pausan los trabajos registrados en background_tasks.
+
+El umbral y los trabajos se restauran al detener la reproducción, es decir,
+entre canciones. La recolección completa no se repite en cada reproducir
+(tarda y se notaría al arrancar): los objetos quedan congelados hasta
+release(), al cerrar el reproductor o desactivar el modo.
+"""
+
+import gc
+from typing import List, Optional, Tuple
+
+
+# Umbral de la generación 2 durante la reproducción: en la práctica no se recolecta
+DEFERRED_GEN2_THRESHOLD = 1_000_000
+
+
+class BackgroundTasks:
+    """
+    Registro de trabajos en segundo plano que se pausan durante la reproducción
+
+    Cada trabajo es un objeto con métodos pause() y resume(); al reanudar debe
+    retomar lo que haya quedado pendiente.
+    """
+
+    def __init__(self):
+        self._tasks: List[object] = []
+        self.paused = False
+
+    def register(self, task):
+        """Registra un trabajo (si ya está todo pausado, se pausa también)"""
+        if task not in self._tasks:
+            self._tasks.append(task)
+            if self.paused:
+                task.pause()
+
+    def unregister(self, task):
+        if task in self._tasks:
+            self._tasks.remove(task)
+
+    def pause_all(self):
+        self.paused = True
+        for task in self._tasks:
+            task.pause()
+
+    def resume_all(self):
+        self.paused = False
+        for task in list(self._tasks):
+            task.resume()
+
+
+# Registro compartido por toda la aplicación
+background_tasks = BackgroundTasks()
+
+
+class PerformanceMode:
+    """Controla el GC y el trabajo en segundo plano mientras se reproduce"""
+
+    def __init__(self, tasks: BackgroundTasks = background_tasks):
+        self.tasks = tasks
+        self.enabled = False
+        self.active = False
+        self.gen2_collections = 0  # Recolecciones completas ocurridas mientras estuvo activo
+        self._thresholds: Optional[Tuple[int, int, int]] = None
+        self._frozen = False
+
+    def begin(self):
+        """Entra en modo rendimiento (si está habilitado) al empezar a reproducir"""
+        if not self.enabled or self.active:
+            return
+        self.active = True
+        if not self._frozen:
+            gc.collect()
+            gc.freeze()
+            self._frozen = True
+        self._thresholds = gc.get_threshold()
+        gc.set_threshold(self._thresholds[0], self._thresholds[1], DEFERRED_GEN2_THRESHOLD)
+        gc.callbacks.append(self._on_gc)
+        self.tasks.pause_all()
+
+    def end(self):
+        """Restaura el umbral del GC y reanuda el trabajo en segundo plano"""
+        if not self.active:
+            return
+        self.active = False
+        gc.callbacks.remove(self._on_gc)
+        gc.set_threshold(*self._thresholds)
+        self.tasks.resume_all()
+
+    def release(self):
+        """Sale del modo rendimiento y descongela los objetos (la próxima vez se vuelve a recolectar)"""
+        self.end()
+        if self._frozen:
+            gc.unfreeze()
+            self._frozen = False
+
+    def _on_gc(self, phase: str, info: dict):
+        if phase == 'start' and info.get('generation') == 2:
+            self.gen2_collections += 1
@@ -0,0 +1,134 @@
+"""
+Progresiones de acordes independientes de la tonalidad
+
+Una progresión se representa como n-gramas de intervalos: la familia del
+primer acorde seguida de (salto de la nota base mod 12, familia) para cada
+acorde siguiente. Así I–V–vi–IV en Do (C G Am F) y en Sol (G D Em C)
+producen exactamente los mismos n-gramas.
+"""
+
+import re
+from typing import Dict, Iterable, List, Tuple
+
+from .chord_transposer import ChordTransposer, ChordToken
+
+
+# Tamaños de n-grama que se indexan (cantidad de acordes)
+NGRAM_SIZES = (2, 3)
+
+# Grados de la escala mayor para los números romanos
+_ROMAN_DEGREES = {'i': 0, 'ii': 2, 'iii': 4, 'iv': 5, 'v': 7, 'vi': 9, 'vii': 11}
+
+_ROMAN_RE = re.compile(
+    r'^(b|#|♭|♯)?(VII|VI|V|IV|III|II|I|vii|vi|v|iv|iii|ii|i)'
+    r'(°|o|ø|dim|\+|aug|sus\d*)?(.*)$'
+)
+_SEPARATORS_RE = re.compile(r'[\s,\-–—|]+')
+
+
+def chord_sequence(chords: Iterable[ChordToken]) -> List[Tuple[int, int]]:
+    """
+    Convierte los acordes de una canción en una secuencia (nota base, familia)
+    eliminando repeticiones consecutivas del mismo acorde
+    """
+    sequence: List[Tuple[int, int]] = []
+    for token in chords:
+        chord = (token.root, ChordTransposer.chord_family(token.quality))
+        if not sequence or sequence[-1] != chord:
+            sequence.append(chord)
+    return sequence
+
+
+def encode_ngram(chords: List[Tuple[int, int]]) -> int:
+    """Codifica una ventana de acordes como un entero independiente de la tonalidad"""
+    code = chords[0][1]
+    for previous, current in zip(chords, chords[1:]):
+        interval = (current[0] - previous[0]) % 12
+        code = (code << 7) | (interval << 3) | current[1]
+    # El tamaño va en los bits altos para que no choquen n-gramas de distinto largo
+    return (len(chords) << 24) | code
+
+
+def progression_ngrams(sequence: List[Tuple[int, int]],
+                       sizes: Iterable[int] = NGRAM_SIZES) -> Dict[int, int]:
+    """Cuenta los n-gramas de intervalos de una secuencia de acordes"""
+    grams: Dict[int, int] = {}
+    for size in sizes:
+        for start in range(len(sequence) - size + 1):
+            gram = encode_ngram(sequence[start:start + size])
+            grams[gram] = grams.get(gram, 0) + 1
+    return grams
+
+
+def query_ngrams(sequence: List[Tuple[int, int]]) -> List[int]:
+    """N-gramas que debe contener una canción para seguir la progresión buscada"""
+    size = max(s for s in NGRAM_SIZES if s <= len(sequence))
+    grams = []
+    for start in range(len(sequence) - size + 1):
+        gram = encode_ngram(sequence[start:start + size])
+        if gram not in grams:
+            grams.append(gram)
+    return grams
+
+
+def parse_progression(text: str) -> List[Tuple[int, int]]:
+    """
+    Interpreta una progresión escrita con números romanos o con acordes
+
+    Ejemplos: "I–V–vi–IV", "ii7 V7 I", "C G Am F", "Do Sol Lam Fa"
+
+    Returns:
+        Secuencia de (nota base, familia) sin repeticiones consecutivas
+
+    Raises:
+        ValueError: Si algún elemento no es un grado ni un acorde válido
+    """
+    chords = []
+    for item in _SEPARATORS_RE.split(text.strip()):
+        # El bajo de un acorde con barra (C/G, V/vi...) no cambia la función armónica
+        item = item.split('/')[0]
+        if not item:
+            continue
+        chord = _parse_roman(item)
+        if chord is None:
+            parsed = ChordTransposer.parse_chord(item) or ChordTransposer.parse_chord(item, use_latin=True)
+            if parsed is None:
+                raise ValueError(f"Grado o acorde no reconocido: {item}")
+            chord = (parsed[0], ChordTransposer.chord_family(parsed[1]))
+        if not chords or chords[-1] != chord:
+            chords.append(chord)
+    if len(chords) < min(NGRAM_SIZES):
+        raise ValueError("La progresión debe tener al menos dos acordes distintos")
+    return chords
+
+
+def _parse_roman(item: str):
+    """Convierte un grado en números romanos en (semitonos desde la tónica, familia)"""
+    match = _ROMAN_RE.match(item)
+    if not match:
+        return None
+    accidental, numeral, quality, rest = match.groups()
+    # Lo que sigue al grado solo puede ser una extensión (7, maj7, add9...)
+    if rest and not re.fullmatch(r'(maj|m|add)?\d*(b5)?', rest):
+        return None
+
+    root = _ROMAN_DEGREES[numeral.lower()]
+    if accidental in ('b', '♭'):
+        root -= 1
+    elif accidental in ('#', '♯'):
+        root += 1
+
+    if quality == 'ø' or rest.endswith('b5'):
+        # Semidisminuido (viiø, viim7b5): la misma familia que un acorde m7b5 escrito con letras
+        family = ChordTransposer.chord_family(ChordTransposer.HALF_DIMINISHED)
+    elif quality in ('°', 'o', 'dim'):
+        family = ChordTransposer.FAMILY_DIMINISHED
+    elif quality in ('+', 'aug'):
+        family = ChordTransposer.FAMILY_AUGMENTED
+    elif quality and quality.startswith('sus'):
+        family = ChordTransposer.FAMILY_SUSPENDED
+    elif numeral.islower() or (rest.startswith('m') and not rest.startswith('maj')):
+        family = ChordTransposer.FAMILY_MINOR
+    else:
+        family = ChordTransposer.FAMILY_MAJOR
+    return root % 12, family
@@ -63,3 +63,59 @@ class Settings:
     def set_player_text_color(self, color: str):
         """Establece el color de texto del reproductor"""
         self.settings.setValue("player/text_color", color)
+    
+    def get_player_fit_width(self) -> bool:
+        """Obtiene si el reproductor ajusta el tamaño de letra al ancho"""
+        return self.settings.value("player/fit_width", False, type=bool)
+    
+    def set_player_fit_width(self, enabled: bool):
+        """Activa/desactiva el ajuste del tamaño de letra al ancho"""
+        self.settings.setValue("player/fit_width", enabled)
+    
+    def get_player_page_mode(self) -> int:
+        """Obtiene el modo de páginas del reproductor (0 = scroll, 1 o 2 páginas)"""
+        return self.settings.value("player/page_mode", 0, type=int)
+    
+    def set_player_page_mode(self, pages: int):
+        """Establece el modo de páginas del reproductor (0 = scroll, 1 o 2 páginas)"""
+        self.settings.setValue("player/page_mode", pages)
+    
+    def get_player_performance_mode(self) -> bool:
+        """Obtiene si el reproductor usa el modo rendimiento"""
+        return self.settings.value("player/performance_mode", False, type=bool)
+    
+    def set_player_performance_mode(self, enabled: bool):
+        """Activa/desactiva el modo rendimiento del reproductor"""
+        self.settings.setValue("player/performance_mode", enabled)
+    
+    def get_stall_threshold_ms(self) -> int:
+        """Obtiene el umbral para registrar bloqueos de la interfaz (0 = sin vigilancia, por defecto)"""
+        return self.settings.value("diagnostics/stall_threshold_ms", 0, type=int)
+    
+    def set_stall_threshold_ms(self, threshold: int):
+        """Establece el umbral para registrar bloqueos de la interfaz (0 = sin vigilancia)"""
+        self.settings.setValue("diagnostics/stall_threshold_ms", threshold)
+    
+    def get_slow_query_ms(self) -> int:
+        """Obtiene el umbral para registrar consultas SQL lentas"""
+        return self.settings.value("diagnostics/slow_query_ms", 50, type=int)
+    
+    def set_slow_query_ms(self, threshold: int):
+        """Establece el umbral para registrar consultas SQL lentas"""
+        self.settings.setValue("diagnostics/slow_query_ms", threshold)
+    
+    def get_player_frame_hud(self) -> bool:
+        """Obtiene si el reproductor muestra las métricas de fluidez"""
+        return self.settings.value("player/frame_hud", False, type=bool)
+    
+    def set_player_frame_hud(self, enabled: bool):
+        """Muestra/oculta las métricas de fluidez del reproductor"""
+        self.settings.setValue("player/frame_hud", enabled)
+    
+    def get_player_separate_process(self) -> bool:
+        """Obtiene si el reproductor se ejecuta en un proceso propio"""
+        return self.settings.value("player/separate_process", False, type=bool)
+    
+    def set_player_separate_process(self, enabled: bool):
+        """Establece si el reproductor se ejecuta en un proceso propio"""
+        self.settings.setValue("player/separate_process", enabled)
@@ -0,0 +1,165 @@
+"""
+Análisis de canciones precalculado al guardar
+
+Todo lo que solo cambia cuando se edita la letra (clasificación de líneas,
+notación, conteos, secciones y hash del contenido) se calcula una sola vez
+aquí y se guarda en columnas derivadas de la tabla songs.
+"""
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .chord_transposer import ChordTransposer, ChordToken
+
+
+# Incrementar cuando cambie el análisis para que la BD recalcule las columnas
+ANALYSIS_VERSION = 5
+
+NOTATION_LATIN = "latin"
+NOTATION_ENGLISH = "english"
+
+# Nombres de sección reconocidos aunque no estén entre corchetes ("Coro:", "Verse 2", "(Puente)")
+_SECTION_WORDS = (
+    r'verso|verse|estrofa|coro|chorus|estribillo|refrain|pre-?coro|pre-?chorus|'
+    r'puente|bridge|intro|outro|interludio|interlude|instrumental|solo|final|tag|coda|riff'
+)
+_SECTION_WORD_RE = re.compile(
+    r'^\s*[\(]?((?:' + _SECTION_WORDS + r')(?:\s*\d+)?(?:\s*[x×]\s*\d+)?)[\)]?\s*:?\s*$',
+    re.IGNORECASE
+)
+_SECTION_BRACKET_RE = re.compile(r'^\s*\[([^\[\]]{1,40})\]\s*$')
+
+
+class Section(NamedTuple):
+    """Marca de sección de una canción"""
+    label: str
+    line: int  # Índice de la línea (de la letra original) donde está la marca
+
+
+@dataclass
+class SongAnalysis:
+    """Resultado del análisis de la letra de una canción"""
+    line_kinds: bytes = b""  # Mapa de bits: bit i = 1 si la línea i es de acordes
+    notation: str = NOTATION_ENGLISH
+    line_count: int = 0
+    chord_count: int = 0
+    content_hash: str = ""
+    sections: str = "[]"  # Secciones codificadas con encode_sections
+    # Acordes en orden de aparición (no se guarda como columna, alimenta los índices)
+    chords: List[ChordToken] = field(default_factory=list)
+
+    @property
+    def use_latin(self) -> bool:
+        return self.notation == NOTATION_LATIN
+
+
+def content_hash(text: str) -> str:
+    """Hash compacto del contenido de la letra"""
+    return hashlib.blake2b((text or "").encode("utf-8"), digest_size=16).hexdigest()
+
+
+def pack_line_kinds(flags: List[bool]) -> bytes:
+    """Empaqueta una lista de booleanos en un mapa de bits (LSB primero)"""
+    packed = bytearray((len(flags) + 7) // 8)
+    for index, flag in enumerate(flags):
+        if flag:
+            packed[index >> 3] |= 1 << (index & 7)
+    return bytes(packed)
+
+
+def is_chord_line(line_kinds: Optional[bytes], index: int) -> bool:
+    """Consulta el mapa de bits para saber si la línea index es de acordes"""
+    if not line_kinds or (index >> 3) >= len(line_kinds):
+        return False
+    return bool(line_kinds[index >> 3] & (1 << (index & 7)))
+
+
+def detect_section(line: str, use_latin: bool = False) -> Optional[str]:
+    """Retorna el nombre de la sección si la línea es una marca ("[Coro]", "Verse 2:"...)"""
+    match = _SECTION_BRACKET_RE.match(line)
+    if match:
+        label = match.group(1).strip()
+        # "[Am]" en una línea sola es un acorde, no una sección
+        if label and ChordTransposer.parse_chord(label, use_latin) is None:
+            return label
+        return None
+    match = _SECTION_WORD_RE.match(line)
+    if match:
+        return match.group(1).strip()
+    return None
+
+
+def detect_sections(text: str, use_latin: Optional[bool] = None,
+                    line_kinds: Optional[bytes] = None) -> List[Section]:
+    """
+    Marcas de sección de una letra, en orden
+
+    Las líneas de acordes nunca son marcas; con line_kinds (la clasificación
+    ya calculada) no se vuelve a clasificar cada línea.
+    """
+    if use_latin is None:
+        use_latin = ChordTransposer.detect_latin(text)
+    sections = []
+    for index, line in enumerate((text or "").split('\n')):
+        if line_kinds is not None:
+            if is_chord_line(line_kinds, index):
+                continue
+        elif ChordTransposer.is_chord_line(line, use_latin):
+            continue
+        label = detect_section(line, use_latin)
+        if label:
+            sections.append(Section(label, index))
+    return sections
+
+
+def encode_sections(sections: List[Section]) -> str:
+    """Codifica las secciones para la columna sections: [[línea, "nombre"], ...]"""
+    return json.dumps([[section.line, section.label] for section in sections], ensure_ascii=False)
+
+
+def decode_sections(encoded: Optional[str]) -> List[Section]:
+    """Decodifica la columna sections (lista vacía si no hay o es inválida)"""
+    if not encoded:
+        return []
+    try:
+        return [Section(str(label), int(line)) for line, label in json.loads(encoded)]
+    except (ValueError, TypeError):
+        return []
+
+
+def chord_vocabulary(chords: List[ChordToken]) -> Dict[Tuple[int, str], int]:
+    """Cuenta las apariciones de cada acorde distinto (nota base, calidad)"""
+    vocabulary: Dict[Tuple[int, str], int] = {}
+    for token in chords:
+        key = (token.root, token.quality)
+        vocabulary[key] = vocabulary.get(key, 0) + 1
+    return vocabulary
+
+
+def analyze_lyrics(text: str) -> SongAnalysis:
+    """Analiza la letra con acordes de una canción"""
+    text = text or ""
+    use_latin = ChordTransposer.detect_latin(text)
+    lines = text.split('\n')
+
+    flags = []
+    chords: List[ChordToken] = []
+    for line in lines:
+        chord_line = ChordTransposer.is_chord_line(line, use_latin)
+        flags.append(chord_line)
+        if chord_line:
+            chords.extend(ChordTransposer.tokenize_line(line, use_latin))
+    line_kinds = pack_line_kinds(flags)
+
+    return SongAnalysis(
+        line_kinds=line_kinds,
+        notation=NOTATION_LATIN if use_latin else NOTATION_ENGLISH,
+        line_count=len(lines) if text else 0,
+        chord_count=len(chords),
+        content_hash=content_hash(text),
+        sections=encode_sections(detect_sections(text, use_latin, line_kinds)),
+        chords=chords
+    )
@@ -0,0 +1,208 @@
+"""
+Vigilancia de bloqueos del event loop
+
+Un QTimer en el hilo de la interfaz marca un "latido" cada pocos
+milisegundos y un hilo aparte revisa que los latidos sigan llegando. Si el
+hilo de la interfaz pasa más de threshold_ms sin atender el event loop, el
+hilo vigilante toma muestras de su pila (sys._current_frames) mientras dure
+el bloqueo y, al terminar, lo registra en un log rotativo con la pila más
+frecuente.
+
+Los bloqueos se agrupan por punto de llamada (la línea más profunda del
+código de la aplicación en la pila) en stall_sites.json, que se acumula
+entre sesiones, así los peores culpables quedan a la vista.
+
+Si el hilo de la interfaz retiene el GIL en código nativo, el hilo vigilante
+no puede correr; para esos cuelgues faulthandler vuelca las pilas de todos
+los hilos en hangs.log sin necesitar el GIL.
+"""
+
+import faulthandler
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from logging.handlers import RotatingFileHandler
+from typing import Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import QObject, QTimer
+
+from .app_paths import logs_dir
+
+
+# Cada cuánto late el event loop y cada cuánto lo revisa el hilo vigilante (ms)
+HEARTBEAT_MS = 50
+POLL_MS = 50
+# Umbral por defecto para considerar un bloqueo (ms)
+DEFAULT_THRESHOLD_MS = 500
+# Un cuelgue que dura este múltiplo del umbral se vuelca con faulthandler
+HANG_FACTOR = 10
+# Log rotativo: tamaño máximo y cantidad de archivos anteriores
+LOG_MAX_BYTES = 1_000_000
+LOG_BACKUPS = 3
+
+# Raíz del código de la aplicación, para elegir el punto de llamada dentro de ella
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def call_site(stack: List[traceback.FrameSummary]) -> str:
+    """Línea más profunda de la pila que pertenece a la aplicación (o la más profunda si ninguna)"""
+    for frame in reversed(stack):
+        if frame.filename.startswith(_APP_ROOT):
+            relative = os.path.relpath(frame.filename, os.path.dirname(_APP_ROOT))
+            return f"{relative}:{frame.lineno} in {frame.name}"
+    if stack:
+        frame = stack[-1]
+        return f"{os.path.basename(frame.filename)}:{frame.lineno} in {frame.name}"
+    return "?"
+
+
+class StallWatchdog(QObject):
+    """Detecta bloqueos del hilo de la interfaz y registra dónde estaba"""
+
+    def __init__(self, parent: QObject = None, threshold_ms: int = DEFAULT_THRESHOLD_MS,
+                 directory: Optional[str] = None):
+        super().__init__(parent)
+        self.threshold_ms = threshold_ms
+        self.directory = directory or logs_dir()
+        self.stall_count = 0
+
+        self._gui_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._hang_file = None
+        self._armed_at = 0.0
+        self.paused = False  # En pausa durante la reproducción en modo rendimiento
+
+        self.heartbeat = QTimer(self)
+        self.heartbeat.setInterval(HEARTBEAT_MS)
+        self.heartbeat.timeout.connect(self._beat)
+
+        self.logger = logging.getLogger("gimmeletter.stalls")
+        self.logger.propagate = False
+        self._handler: Optional[RotatingFileHandler] = None
+
+    @property
+    def sites_path(self) -> str:
+        return os.path.join(self.directory, "stall_sites.json")
+
+    def start(self):
+        """Empieza a vigilar (debe llamarse desde el hilo de la interfaz)"""
+        if self._thread is not None:
+            return
+        self._handler = RotatingFileHandler(
+            os.path.join(self.directory, "stalls.log"),
+            maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding='utf-8'
+        )
+        self._handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        self.logger.addHandler(self._handler)
+        self.logger.setLevel(logging.INFO)
+        self._hang_file = open(os.path.join(self.directory, "hangs.log"), 'a', encoding='utf-8')
+
+        self._gui_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._armed_at = 0.0
+        self._beat()
+        self.heartbeat.start()
+        self._thread = threading.Thread(target=self._watch, name="stall-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Deja de vigilar y cierra los archivos"""
+        if self._thread is None:
+            return
+        self.heartbeat.stop()
+        faulthandler.cancel_dump_traceback_later()
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.logger.removeHandler(self._handler)
+        self._handler.close()
+        self._hang_file.close()
+
+    def pause(self):
+        """Deja de latir y de vigilar hasta resume() (ver utils/performance_mode)"""
+        self.paused = True
+        if self._thread is not None:
+            self.heartbeat.stop()
+            faulthandler.cancel_dump_traceback_later()
+
+    def resume(self):
+        """Vuelve a latir y a vigilar"""
+        if self._thread is not None:
+            self._armed_at = 0.0
+            self._beat()  # Antes de quitar la pausa, para no contar el tiempo pausado como bloqueo
+            self.heartbeat.start()
+        self.paused = False
+
+    def _beat(self):
+        now = time.monotonic()
+        with self._lock:
+            self._last_beat = now
+        # Red de seguridad para cuelgues en código nativo que retiene el GIL (se rearma
+        # cada medio plazo y no en cada latido, porque rearmar crea un hilo)
+        hang_s = self.threshold_ms * HANG_FACTOR / 1000
+        if now - self._armed_at > hang_s / 2:
+            self._armed_at = now
+            faulthandler.dump_traceback_later(hang_s, repeat=False, file=self._hang_file)
+
+    def _gap_ms(self) -> float:
+        with self._lock:
+            return (time.monotonic() - self._last_beat) * 1000 - HEARTBEAT_MS
+
+    def _watch(self):
+        """Bucle del hilo vigilante"""
+        samples: List[Tuple[str, Tuple[str, ...]]] = []
+        longest = 0.0
+        while not self._stop.wait(POLL_MS / 1000):
+            if self.paused:
+                samples = []
+                continue
+            gap = self._gap_ms()
+            if gap > self.threshold_ms:
+                longest = gap
+                frame = sys._current_frames().get(self._gui_thread_id)
+                if frame is not None:
+                    stack = traceback.extract_stack(frame)
+                    samples.append((call_site(stack), tuple(traceback.format_list(stack))))
+            elif samples:
+                # La duración es exacta hasta la resolución del sondeo
+                self._record_stall(samples, longest)
+                samples = []
+
+    def _record_stall(self, samples: List[Tuple[str, Tuple[str, ...]]], duration_ms: float):
+        """Registra un bloqueo terminado: sitio y pila más frecuentes entre las muestras"""
+        self.stall_count += 1
+        site, _ = Counter(site for site, _ in samples).most_common(1)[0]
+        stack = Counter(stack for sample_site, stack in samples if sample_site == site).most_common(1)[0][0]
+        self.logger.info(
+            "Bloqueo de ~%d ms en %s (%d muestras)\n%s", duration_ms, site, len(samples), "".join(stack)
+        )
+        self._update_sites(site, duration_ms, stack)
+
+    def _update_sites(self, site: str, duration_ms: float, stack: Tuple[str, ...]):
+        """Acumula el bloqueo en el resumen por punto de llamada"""
+        sites = self.load_sites(self.sites_path)
+        entry = sites.setdefault(site, {'count': 0, 'total_ms': 0, 'max_ms': 0})
+        entry['count'] += 1
+        entry['total_ms'] += int(duration_ms)
+        entry['max_ms'] = max(entry['max_ms'], int(duration_ms))
+        entry['last_stack'] = "".join(stack)
+        ordered = dict(sorted(sites.items(), key=lambda item: item[1]['total_ms'], reverse=True))
+        with open(self.sites_path, 'w', encoding='utf-8') as f:
+            json.dump(ordered, f, indent=2, ensure_ascii=False)
+
+    @staticmethod
+    def load_sites(path: str) -> Dict[str, Dict]:
+        """Resumen acumulado por punto de llamada (los peores primero)"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
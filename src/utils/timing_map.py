@@ -0,0 +1,170 @@
+"""
+Mapas de tiempos por línea para el scroll tipo teleprompter
+
+Durante el ensayo se marca con un toque el momento en que empieza cada
+línea; el mapa resultante (milisegundos -> línea de la letra) permite que el
+scroll siga a la canción aunque tenga cortes instrumentales largos.
+
+Se guarda compacto en set_songs.timing_map: un byte de versión, la cantidad
+de puntos y luego, por punto, el delta de tiempo y el delta de línea
+(zigzag) como enteros de largo variable.
+"""
+
+import bisect
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+
+from .chord_transposer import ChordTransposer
+
+
+FORMAT_VERSION = 1
+
+
+def _write_varint(out: bytearray, value: int):
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def _read_varint(data: bytes, offset: int):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+
+@dataclass
+class TimingMap:
+    """Instantes (ms desde el comienzo de la canción) en que empieza cada línea marcada"""
+    times_ms: List[int] = field(default_factory=list)
+    lines: List[int] = field(default_factory=list)  # Índices de línea de la letra original
+
+    def add(self, time_ms: int, line: int):
+        """Agrega una marca (los tiempos deben ser crecientes)"""
+        if self.times_ms and time_ms <= self.times_ms[-1]:
+            time_ms = self.times_ms[-1] + 1
+        self.times_ms.append(int(time_ms))
+        self.lines.append(int(line))
+
+    def __len__(self):
+        return len(self.times_ms)
+
+    def encode(self) -> bytes:
+        """Codifica el mapa con deltas y enteros de largo variable"""
+        out = bytearray([FORMAT_VERSION])
+        _write_varint(out, len(self.times_ms))
+        previous_time = previous_line = 0
+        for time_ms, line in zip(self.times_ms, self.lines):
+            _write_varint(out, time_ms - previous_time)
+            delta = line - previous_line
+            _write_varint(out, (delta << 1) ^ (delta >> 63))  # zigzag: la letra puede volver atrás
+            previous_time, previous_line = time_ms, line
+        return bytes(out)
+
+    @classmethod
+    def decode(cls, data: Optional[bytes]) -> Optional['TimingMap']:
+        """Decodifica un mapa guardado (None si no hay o el formato no se reconoce)"""
+        if not data or data[0] != FORMAT_VERSION:
+            return None
+        try:
+            count, offset = _read_varint(data, 1)
+            timing_map = cls()
+            time_ms = line = 0
+            for _ in range(count):
+                delta_time, offset = _read_varint(data, offset)
+                zigzag, offset = _read_varint(data, offset)
+                time_ms += delta_time
+                line += (zigzag >> 1) ^ -(zigzag & 1)
+                timing_map.times_ms.append(time_ms)
+                timing_map.lines.append(line)
+            return timing_map
+        except IndexError:
+            return None
+
+
+def tap_targets(text: str, use_latin: Optional[bool] = None) -> List[int]:
+    """
+    Líneas que se marcan al grabar, en orden
+
+    Cada línea con contenido es un toque, salvo la letra que va debajo de una
+    línea de acordes: el par se marca una sola vez (en los acordes).
+    """
+    if use_latin is None:
+        use_latin = ChordTransposer.detect_latin(text)
+    targets = []
+    previous_chords = False
+    for index, line in enumerate((text or "").split('\n')):
+        chord_line = ChordTransposer.is_chord_line(line, use_latin)
+        if line.strip() and not (previous_chords and not chord_line):
+            targets.append(index)
+        previous_chords = chord_line and bool(line.strip())
+    return targets
+
+
+class PositionTimeline:
+    """
+    Posición de scroll en función del tiempo, interpolada entre las marcas
+
+    Antes de la primera marca la posición se queda en la primera; después de
+    la última sigue a la velocidad constante indicada.
+    """
+
+    def __init__(self, times_ms: Sequence[int], positions: Sequence[float]):
+        self.times: List[float] = [0.0]
+        self.positions: List[float] = [float(positions[0]) if positions else 0.0]
+        for time_ms, position in zip(times_ms, positions):
+            if time_ms <= self.times[-1]:
+                continue
+            # Posiciones no decrecientes, para poder invertir la función
+            self.times.append(float(time_ms))
+            self.positions.append(max(float(position), self.positions[-1]))
+
+    @property
+    def end_ms(self) -> float:
+        return self.times[-1]
+
+    def position_at(self, time_ms: float, tail_speed: float = 0.0) -> float:
+        """Posición en el instante indicado (búsqueda binaria + interpolación lineal)"""
+        if time_ms >= self.times[-1]:
+            return self.positions[-1] + tail_speed * (time_ms - self.times[-1]) / 1000.0
+        index = max(0, bisect.bisect_right(self.times, time_ms) - 1)
+        t0, t1 = self.times[index], self.times[index + 1]
+        p0, p1 = self.positions[index], self.positions[index + 1]
+        return p0 + (p1 - p0) * (time_ms - t0) / (t1 - t0)
+
+    def speed_at(self, time_ms: float, tail_speed: float = 0.0) -> float:
+        """Velocidad (px/s) del tramo en el que cae el instante indicado"""
+        if time_ms >= self.times[-1]:
+            return tail_speed
+        index = max(0, bisect.bisect_right(self.times, time_ms) - 1)
+        t0, t1 = self.times[index], self.times[index + 1]
+        return (self.positions[index + 1] - self.positions[index]) * 1000.0 / (t1 - t0)
+
+    def next_change_ms(self, time_ms: float) -> Optional[float]:
+        """Próximo instante en que cambia la velocidad (None si ya pasó la última marca)"""
+        index = bisect.bisect_right(self.times, time_ms)
+        return self.times[index] if index < len(self.times) else None
+
+    def time_at(self, position: float, tail_speed: float = 0.0) -> float:
+        """Primer instante en que se llega a una posición (inversa de position_at)"""
+        if position > self.positions[-1]:
+            extra = position - self.positions[-1]
+            return self.times[-1] + (extra * 1000.0 / tail_speed if tail_speed > 0 else 0.0)
+        index = bisect.bisect_left(self.positions, position)
+        if index == 0:
+            return 0.0
+        if self.positions[index] == position:
+            return self.times[index]
+        p0, p1 = self.positions[index - 1], self.positions[index]
+        t0, t1 = self.times[index - 1], self.times[index]
+        return t0 + (t1 - t0) * (position - p0) / (p1 - p0)
@@ -0,0 +1,149 @@
+"""
+Trazas en formato Chrome trace-event (para chrome://tracing o Perfetto)
+
+Se activa con la variable de entorno GIMMELETTER_TRACE antes de abrir la
+aplicación:
+
+    GIMMELETTER_TRACE=1 python src/main.py            # ~/gimmeletter_logs/trace_<fecha>_<pid>.json
+    GIMMELETTER_TRACE=/tmp/t.json python src/main.py  # archivo elegido
+
+Cada llamada a una función marcada con @traced (o a un método de una clase
+marcada con @traced_methods) queda como un tramo con su comienzo y su
+duración, y al salir se escribe el JSON con todos los tramos. Sin la
+variable, los decoradores devuelven la función original: no hay costo.
+"""
+
+import atexit
+import functools
+import json
+import multiprocessing
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from .app_paths import logs_dir
+
+
+TRACE_ENV = "GIMMELETTER_TRACE"
+
+
+def _trace_path() -> Optional[str]:
+    """Archivo de salida según la variable de entorno (None = trazas desactivadas)"""
+    value = os.environ.get(TRACE_ENV, "").strip()
+    if not value or value.lower() in ("0", "false", "no"):
+        return None
+    if value.lower() in ("1", "true", "yes"):
+        return os.path.join(logs_dir(), f"trace_{datetime.now():%Y%m%d-%H%M%S}_{os.getpid()}.json")
+    if multiprocessing.parent_process() is not None:
+        # Un proceso hijo (el reproductor aparte) escribe su propio archivo
+        root, extension = os.path.splitext(value)
+        return f"{root}_{os.getpid()}{extension or '.json'}"
+    return value
+
+
+class Tracer:
+    """Acumula tramos (comienzo y duración en µs) y los escribe como trace-event JSON"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.pid = os.getpid()
+        # (nombre, categoría, comienzo_ns, duración_ns, id de hilo): tuplas para que registrar sea barato
+        self.spans: List[Tuple[str, str, int, int, int]] = []
+        self.thread_names = {}
+        self._origin_ns = time.perf_counter_ns()
+
+    def record(self, name: str, category: str, start_ns: int, end_ns: int):
+        thread_id = threading.get_ident()
+        if thread_id not in self.thread_names:
+            self.thread_names[thread_id] = threading.current_thread().name
+        self.spans.append((name, category, start_ns, end_ns - start_ns, thread_id))
+
+    def events(self) -> List[dict]:
+        """Eventos en formato trace-event (tramos completos 'X' y nombres de hilo)"""
+        events = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': self.pid, 'tid': thread_id, 'args': {'name': name}}
+            for thread_id, name in self.thread_names.items()
+        ]
+        for name, category, start_ns, duration_ns, thread_id in self.spans:
+            events.append({
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': (start_ns - self._origin_ns) / 1000,
+                'dur': duration_ns / 1000,
+                'pid': self.pid,
+                'tid': thread_id,
+            })
+        return events
+
+    def write(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self.events(), 'displayTimeUnit': 'ms'}, f)
+
+
+_path = _trace_path()
+tracer: Optional[Tracer] = Tracer(_path) if _path else None
+if tracer is not None:
+    atexit.register(tracer.write)
+
+
+def traced(name: Optional[str] = None, category: str = "app") -> Callable:
+    """Decorador: registra cada llamada como un tramo (sin trazas activas no cambia la función)"""
+    def decorator(func):
+        if tracer is None:
+            return func
+        span_name = name or func.__qualname__
+        clock = time.perf_counter_ns
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                tracer.record(span_name, category, start, clock())
+        return wrapper
+    return decorator
+
+
+def traced_methods(category: str, exclude: Iterable[str] = ()) -> Callable:
+    """
+    Decorador de clase: traza todos sus métodos públicos (y __init__)
+
+    Args:
+        category: Categoría de los tramos
+        exclude: Métodos públicos que no se trazan (los que se llaman una vez
+            por fila o por elemento llenarían la traza de tramos diminutos)
+    """
+    excluded = set(exclude)
+
+    def decorator(cls):
+        if tracer is None:
+            return cls
+        for attribute, value in list(vars(cls).items()):
+            if (attribute.startswith('_') and attribute != '__init__') or attribute in excluded:
+                continue
+            if isinstance(value, staticmethod):
+                setattr(cls, attribute, staticmethod(traced(f"{cls.__name__}.{attribute}", category)(value.__func__)))
+            elif isinstance(value, classmethod):
+                setattr(cls, attribute, classmethod(traced(f"{cls.__name__}.{attribute}", category)(value.__func__)))
+            elif callable(value):
+                setattr(cls, attribute, traced(f"{cls.__name__}.{attribute}", category)(value))
+        return cls
+    return decorator
+
+
+@contextmanager
+def span(name: str, category: str = "app"):
+    """Tramo para un bloque de código: with span("importar"): ..."""
+    if tracer is None:
+        yield
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        tracer.record(name, category, start, time.perf_counter_ns())
@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+"""Pruebas del índice de acordes y de las búsquedas por acordes y progresiones (base temporal)"""
+
+import os
+import sqlite3
+import sys
+
+import pytest
+
+from src.database.db_manager import DatabaseManager
+from src.database.models import Song
+from src.utils.progression import encode_ngram, parse_progression, progression_ngrams
+from src.utils.song_analysis import ANALYSIS_VERSION
+
+
+# I V vi IV en Do, la misma progresión en Re y I IV V en notación latina
+SONG_C = "C  G  Am  F\nhola que tal\nC  G  Am  F\ncomo te va"
+SONG_D = "D  A  Bm  G\nhola que tal"
+SONG_LATIN = "Do  Fa  Sol\nhola que tal"
+
+
+def add(db, title, lyrics):
+    return db.add_song(Song(title=title, artist="Prueba", lyrics_with_chords=lyrics))
+
+
+def chord_rows(db, song_id):
+    return [
+        tuple(row) for row in db.connection.execute(
+            "SELECT root, quality, occurrences FROM song_chords WHERE song_id = ? ORDER BY root, quality",
+            (song_id,)
+        )
+    ]
+
+
+def gram_rows(db, song_id):
+    return {
+        row['gram']: row['occurrences'] for row in db.connection.execute(
+            "SELECT gram, occurrences FROM song_progressions WHERE song_id = ?", (song_id,)
+        )
+    }
+
+
+def test_index_follows_add_update_delete(db):
+    """El índice refleja la letra después de agregar, editar y borrar"""
+    song_id = add(db, "Uno", SONG_C)
+    assert chord_rows(db, song_id) == [(0, '', 2), (5, '', 2), (7, '', 2), (9, 'm', 2)]
+    assert gram_rows(db, song_id) == progression_ngrams(parse_progression("C G Am F C G Am F"))
+
+    song = db.get_song(song_id)
+    song.lyrics_with_chords = SONG_LATIN
+    db.update_song(song)
+    assert chord_rows(db, song_id) == [(0, '', 1), (5, '', 1), (7, '', 1)]
+    assert gram_rows(db, song_id) == progression_ngrams(parse_progression("C F G"))
+
+    db.delete_song(song_id)
+    assert chord_rows(db, song_id) == []
+    assert gram_rows(db, song_id) == {}
+
+
+def test_chord_search_modes(db):
+    """Todos, alguno y solo esos acordes, en la tonalidad escrita y en cualquiera"""
+    song_c = add(db, "A en Do", SONG_C)
+    song_d = add(db, "B en Re", SONG_D)
+    song_latin = add(db, "C latina", SONG_LATIN)
+    add(db, "D sin acordes", "solo letra\nsin acordes")
+
+    assert db.find_songs_with_all_chords(["C", "G", "Am", "F"]) == [(song_c, 0)]
+    # En Re está la misma canción dos semitonos más arriba: se baja -2 para llegar a Do
+    assert db.find_songs_with_all_chords(["C", "G", "Am", "F"], any_key=True) == [
+        (song_c, 0), (song_d, -2)
+    ]
+
+    assert db.find_songs_with_any_chords(["C", "Am"]) == [(song_c, 0), (song_latin, 0)]
+    assert db.find_songs_with_any_chords(["C", "Am"], any_key=True) == [
+        (song_c, 0), (song_d, -2), (song_latin, 0)
+    ]
+
+    # Los nombres latinos y en inglés son el mismo acorde
+    assert db.find_songs_with_only_chords(["Do", "Rem", "Mim", "Fa", "Sol", "Lam"]) == [
+        (song_c, 0), (song_latin, 0)
+    ]
+    assert db.find_songs_with_only_chords(["C", "F", "G"]) == [(song_latin, 0)]
+    assert db.find_songs_with_only_chords(["D", "G", "A"], any_key=True) == [(song_latin, 2)]
+    # Una canción sin acordes no cuenta como "solo esos acordes"
+    assert db.find_songs_with_only_chords(["C"], any_key=True) == []
+
+
+def test_only_chords_goes_through_chord_index(db):
+    """La búsqueda de "solo esos acordes" no recorre todo song_chords una vez por transposición"""
+    add(db, "A en Do", SONG_C)
+    statements = []
+    db.connection.set_trace_callback(statements.append)
+    db.find_songs_with_only_chords(["C", "F", "G", "Am"], any_key=True)
+    db.connection.set_trace_callback(None)
+    (query,) = [sql for sql in statements if "song_chords" in sql]
+    plan = [row[3] for row in db.connection.execute("EXPLAIN QUERY PLAN " + query)]
+    assert not any(step.startswith("SCAN sc") or step == "SCAN song_chords" for step in plan), plan
+    assert any("idx_song_chords_chord" in step for step in plan), plan
+
+
+def test_progression_search(db):
+    """Las progresiones se encuentran por intervalos, en cualquier tonalidad"""
+    song_c = add(db, "A en Do", SONG_C)
+    song_d = add(db, "B en Re", SONG_D)
+    song_latin = add(db, "C latina", SONG_LATIN)
+
+    assert db.find_songs_by_progression("I V vi IV") == [(song_c, 1.0), (song_d, 1.0)]
+    assert db.find_songs_by_progression("E B C#m A") == [(song_c, 1.0), (song_d, 1.0)]
+    assert db.find_songs_by_progression("C F G") == [(song_latin, 1.0)]
+    # V vi IV ii: solo los dos primeros de tres saltos están en las canciones
+    matches = db.find_songs_by_progression("V vi IV ii", min_score=0.3)
+    assert [song_id for song_id, _ in matches] == [song_c, song_d]
+    assert all(0.3 <= score < 1.0 for _, score in matches)
+    assert db.find_songs_by_progression("V vi IV ii", min_score=0.9) == []
+
+
+def test_half_diminished_progression(db):
+    """viiø, iiø y m7b5 son la misma familia en la búsqueda y en el índice"""
+    song_id = add(db, "Menor", "Am   Bm7b5   E7   Am\nhola que tal\nDm   Bø7   E7\ncomo te va")
+    assert (11, 'm7b5') in [(root, quality) for root, quality, _ in chord_rows(db, song_id)]
+    assert db.find_songs_by_progression("iiø V7 i") == [(song_id, 1.0)]
+    assert db.find_songs_by_progression("iim7b5 V i") == [(song_id, 1.0)]
+    assert db.find_songs_by_progression("Dm7b5 G7 Cm") == [(song_id, 1.0)]
+    # Un ii menor común no es el mismo acorde
+    assert db.find_songs_by_progression("ii V i") == []
+
+
+def test_migration_of_old_database(temp_dir):
+    """Una base con el esquema original gana las columnas nuevas y se indexa al abrirla"""
+    path = os.path.join(temp_dir, "old.db")
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+        CREATE TABLE songs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            artist TEXT,
+            original_key TEXT,
+            lyrics_with_chords TEXT,
+            bpm INTEGER,
+            created_date TEXT
+        );
+        CREATE TABLE sets (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, created_date TEXT);
+        CREATE TABLE set_songs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            set_id INTEGER NOT NULL,
+            song_id INTEGER NOT NULL,
+            song_order INTEGER NOT NULL,
+            scroll_speed INTEGER DEFAULT 50,
+            transposition INTEGER DEFAULT 0
+        );
+    """)
+    connection.execute(
+        "INSERT INTO songs (title, artist, original_key, lyrics_with_chords, bpm) VALUES (?, ?, ?, ?, ?)",
+        ("Vieja", "Prueba", "C", SONG_C, 100)
+    )
+    connection.commit()
+    connection.close()
+
+    db = DatabaseManager(path)
+    try:
+        columns = {row['name'] for row in db.connection.execute("PRAGMA table_info(songs)")}
+        assert {"default_scroll_speed", "line_kinds", "notation", "analysis_version", "sections"} <= columns
+        assert "timing_map" in {row['name'] for row in db.connection.execute("PRAGMA table_info(set_songs)")}
+
+        (song,) = db.get_all_songs()
+        assert song.title == "Vieja" and song.chord_count == 8 and song.notation == "english"
+        assert chord_rows(db, song.id) == [(0, '', 2), (5, '', 2), (7, '', 2), (9, 'm', 2)]
+        assert db.find_songs_by_progression("I V vi IV") == [(song.id, 1.0)]
+    finally:
+        db.close()
+
+
+def test_outdated_analysis_is_reindexed(db):
+    """Las canciones con una versión de análisis vieja se vuelven a indexar al abrir la base"""
+    song_id = add(db, "Uno", SONG_C)
+    db.connection.execute("UPDATE songs SET analysis_version = ?, chord_count = 0 WHERE id = ?",
+                          (ANALYSIS_VERSION - 1, song_id))
+    db.connection.execute("DELETE FROM song_chords WHERE song_id = ?", (song_id,))
+    db.connection.execute("DELETE FROM song_progressions WHERE song_id = ?", (song_id,))
+    db.connection.commit()
+    db.close()
+
+    db = DatabaseManager(db.db_path)
+    try:
+        version = db.connection.execute(
+            "SELECT analysis_version FROM songs WHERE id = ?", (song_id,)
+        ).fetchone()[0]
+        assert version == ANALYSIS_VERSION
+        assert db.get_song(song_id).chord_count == 8
+        assert chord_rows(db, song_id) == [(0, '', 2), (5, '', 2), (7, '', 2), (9, 'm', 2)]
+        assert encode_ngram(parse_progression("I V vi")) in gram_rows(db, song_id)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
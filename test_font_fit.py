@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""Pruebas del ajuste del tamaño de letra al ancho (búsqueda binaria sobre la tabla de avances)"""
+
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import QApplication
+
+from src.ui.font_fit import FontMetricsTable, MAX_FONT_SIZE, MIN_FONT_SIZE
+from src.ui.lyrics_view import DOCUMENT_MARGIN
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class LinearTable(FontMetricsTable):
+    """Tabla con un avance exacto de 0.5 px por punto (sin depender de las fuentes instaladas)"""
+
+    def __init__(self):
+        super().__init__()
+        self.measured = []
+
+    def char_width(self, font, point_size):
+        self.measured.append(point_size)
+        return point_size / 2
+
+
+def width_for(widest, point_size):
+    """Ancho justo para que widest caracteres entren con point_size"""
+    return int(widest * point_size / 2) + 2 * DOCUMENT_MARGIN
+
+
+def test_exact_fit_boundaries():
+    table = LinearTable()
+    font = QFont()
+    for size in (MIN_FONT_SIZE, 20, 31, MAX_FONT_SIZE):
+        # Entra justo en ese tamaño, y con un píxel menos ya no
+        assert table.fit_point_size(font, 40, width_for(40, size)) == size
+        if size > MIN_FONT_SIZE:
+            assert table.fit_point_size(font, 40, width_for(40, size) - 1) == size - 1
+
+
+def test_limits():
+    table = LinearTable()
+    font = QFont()
+    # Ni el mínimo entra: se queda en el mínimo
+    assert table.fit_point_size(font, 40, width_for(40, MIN_FONT_SIZE) - 1) == MIN_FONT_SIZE
+    assert table.fit_point_size(font, 40, 0) == MIN_FONT_SIZE
+    # Sobra lugar: no pasa del máximo
+    assert table.fit_point_size(font, 40, 100_000) == MAX_FONT_SIZE
+    # Sin texto no hay nada que ajustar
+    assert table.fit_point_size(font, 0, 10) == MAX_FONT_SIZE
+    # Límites propios
+    assert table.fit_point_size(font, 40, 100_000, min_size=10, max_size=14) == 14
+    assert table.fit_point_size(font, 40, 0, min_size=10, max_size=14) == 10
+
+
+def test_binary_search_measures_few_sizes():
+    table = LinearTable()
+    table.fit_point_size(QFont(), 40, width_for(40, 27))
+    assert len(table.measured) <= 6
+
+
+def test_real_metrics_are_cached_and_grow_with_size():
+    table = FontMetricsTable()
+    font = QFont("Courier New")
+    small = table.char_width(font, 12)
+    large = table.char_width(font, 36)
+    assert 0 < small < large
+    assert table.char_width(font, 12) == small
+    assert len(table._advances) == 2
+
+    size = table.fit_point_size(font, 50, 800)
+    assert MIN_FONT_SIZE <= size <= MAX_FONT_SIZE
+    assert 50 * table.char_width(font, size) <= 800 - 2 * DOCUMENT_MARGIN or size == MIN_FONT_SIZE
+    if size < MAX_FONT_SIZE:
+        assert 50 * table.char_width(font, size + 1) > 800 - 2 * DOCUMENT_MARGIN
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"OK  {name}")
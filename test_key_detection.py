@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""Pruebas de la estimación de tonalidades en lote y de su guardado en la BD"""
+
+import sys
+
+import pytest
+
+from src.database.models import Song
+from src.utils.key_detection import MIN_SONGS_FOR_POOL, estimate_key_batch, estimate_keys, start_key_estimation
+from src.utils.song_analysis import analyze_lyrics, pack_line_kinds
+
+
+IN_G = "G      D      Em     C\nhola que tal como te va\nG      D      C      G\nadiós"
+IN_A_MINOR_LATIN = "Lam    Rem    Mi     Lam\nhola que tal\nLam    Fa     Mi     Lam\nadiós"
+
+
+def stored(song_id, text):
+    """(id, letra, line_kinds, notación) como los devuelve get_songs_missing_key"""
+    analysis = analyze_lyrics(text)
+    return song_id, text, analysis.line_kinds, analysis.notation
+
+
+def test_batch_uses_stored_analysis():
+    """El lote estima con la clasificación y la notación guardadas"""
+    results = estimate_key_batch([stored(1, IN_G), stored(2, IN_A_MINOR_LATIN), stored(3, "solo letra")])
+    assert [(song_id, key) for song_id, key, _ in results] == [(1, "G"), (2, "Lam")]
+    assert all(0 < confidence <= 1 for _, _, confidence in results)
+
+    # Si lo guardado dice que ninguna línea es de acordes, no se reclasifica la letra
+    no_chords = pack_line_kinds([False] * len(IN_G.split('\n')))
+    assert estimate_key_batch([(1, IN_G, no_chords, "english")]) == []
+    # Sin análisis guardado se clasifica la letra
+    assert estimate_key_batch([(1, IN_G, None, None)])[0][1] == "G"
+
+
+def test_min_confidence_filters_estimates():
+    songs = [stored(1, IN_G), stored(2, IN_A_MINOR_LATIN)]
+    assert len(estimate_keys(songs)) == 2
+    assert estimate_keys(songs, min_confidence=1.01) == []
+
+
+def test_pool_gives_same_results_as_single_process():
+    """Con muchas canciones se reparte en procesos y el resultado es el mismo"""
+    songs = [stored(i, IN_G if i % 2 else IN_A_MINOR_LATIN) for i in range(MIN_SONGS_FOR_POOL + 10)]
+    assert sorted(estimate_keys(songs, max_workers=2)) == sorted(estimate_key_batch(songs))
+
+
+def test_background_estimation_and_update(db):
+    """La estimación corre en otro hilo y update_estimated_keys completa solo las tonalidades vacías"""
+    song_g = db.add_song(Song(title="En Sol", artist="Prueba", lyrics_with_chords=IN_G))
+    song_am = db.add_song(Song(title="En La menor", artist="Prueba", lyrics_with_chords=IN_A_MINOR_LATIN))
+    db.add_song(Song(title="Sin acordes", artist="Prueba", lyrics_with_chords="solo letra"))
+    db.add_song(Song(title="Con tonalidad", artist="Prueba", original_key="D", lyrics_with_chords=IN_G))
+
+    songs = db.get_songs_missing_key()
+    assert sorted(song[0] for song in songs) == [song_g, song_am]
+    future = start_key_estimation(songs)
+
+    # Mientras corría, el usuario escribió la tonalidad de una de las canciones
+    song = db.get_song(song_am)
+    song.original_key = "Do"
+    db.update_song(song)
+
+    estimates = future.result(timeout=30)
+    assert db.update_estimated_keys(estimates) == 1
+    assert db.get_song(song_g).original_key == "G"
+    assert db.get_song(song_g).key_confidence > 0
+    assert db.get_song(song_am).original_key == "Do"
+    assert db.get_songs_missing_key() == []
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""Pruebas del optimizador de transposición y cejilla de un set"""
+
+from src.utils.key_optimizer import HARD_SHAPE_COST, SetKeyOptimizer
+
+
+# I IV V vi en Do y en Mi bemol (formas abiertas vs. todas con cejilla completa)
+IN_C = [(0, '', 4), (5, '', 2), (7, '', 2), (9, 'm', 1)]
+IN_E_FLAT = [(3, '', 4), (8, '', 2), (10, '', 2), (0, 'm', 1)]
+
+
+def test_stays_inside_vocal_range():
+    """La transposición propuesta nunca sale del rango, aunque fuera haya formas más fáciles"""
+    optimizer = SetKeyOptimizer(max_capo=0)
+    for low, high in ((2, 5), (-4, -1), (3, 3)):
+        proposal = optimizer.optimize({1: IN_C}, min_transposition=low, max_transposition=high)[1]
+        assert low <= proposal.transposition <= high
+    # Con el rango completo y la canción ya en formas abiertas (G C D Em), no se mueve
+    in_g = [(7, '', 3), (0, '', 2), (2, '', 2), (4, 'm', 1)]
+    assert optimizer.optimize({1: in_g})[1].transposition == 0
+
+
+def test_inverted_range_is_an_error():
+    try:
+        SetKeyOptimizer().optimize({1: IN_C}, min_transposition=3, max_transposition=-3)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Se esperaba ValueError")
+
+
+def test_capo_turns_hard_shapes_into_open_ones():
+    """Sin poder cambiar de tono, la cejilla convierte Mi bemol en formas abiertas"""
+    without_capo = SetKeyOptimizer(max_capo=0).optimize({1: IN_E_FLAT}, 0, 0)[1]
+    assert without_capo.capo == 0
+    assert without_capo.cost == HARD_SHAPE_COST
+    assert len(without_capo.hard_shapes) == 4
+
+    with_capo = SetKeyOptimizer(max_capo=5).optimize({1: IN_E_FLAT}, 0, 0)[1]
+    assert with_capo.transposition == 0
+    # Cejilla 1: D G A Bm, la más baja sin formas difíciles
+    assert with_capo.capo == 1
+    assert with_capo.hard_shapes == []
+    assert with_capo.cost < without_capo.cost
+
+
+def test_max_capo_is_clamped():
+    assert SetKeyOptimizer(max_capo=-3).max_capo == 0
+    assert SetKeyOptimizer(max_capo=20).max_capo == 11
+
+
+def test_songs_without_chords_get_no_proposal():
+    """Una canción sin acordes conserva la transposición que eligió el usuario"""
+    proposals = SetKeyOptimizer().optimize({1: IN_C, 2: []}, min_transposition=-3, max_transposition=3)
+    assert set(proposals) == {1}
+    assert SetKeyOptimizer().optimize({2: []}) == {}
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"OK  {name}")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""Pruebas del caché de maquetados del reproductor (sin pantalla, plataforma offscreen)"""
+
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import QApplication
+
+from src.database.models import Song
+from src.ui.lyrics_view import LayoutCache
+from src.ui.song_loader import SongLoader
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+TEXT = "C  G  Am  F\nhola que tal como te va"
+
+
+def test_widest_follows_layout_eviction():
+    """El largo de la línea más larga se desaloja junto con el último maquetado de su revisión"""
+    cache = LayoutCache(capacity=4)
+    font = QFont()
+    for revision in range(50):
+        cache.get(revision, TEXT, font, 800)
+        assert len(cache) <= 4
+        assert len(cache._widest) <= 4
+    assert set(cache._widest) == {46, 47, 48, 49}
+
+    # Con otro tamaño de fuente la misma revisión tiene varios maquetados: se conserva hasta el último
+    small, large = QFont(font), QFont(font)
+    small.setPointSize(10)
+    large.setPointSize(30)
+    cache = LayoutCache(capacity=2)
+    cache.get("a", TEXT, small, 800)
+    cache.get("a", TEXT, large, 800)
+    cache.get("b", TEXT, small, 800)
+    assert set(cache._widest) == {"a", "b"}
+    cache.get("b", TEXT, large, 800)
+    assert set(cache._widest) == {"b"}
+
+    cache.clear()
+    assert len(cache) == 0 and cache._widest == {}
+
+
+def test_discard_drops_every_layout_of_a_revision():
+    """discard quita los maquetados de la revisión con todas sus fuentes y anchos"""
+    cache = LayoutCache()
+    small, large = QFont(), QFont()
+    small.setPointSize(10)
+    large.setPointSize(30)
+    for font in (small, large):
+        cache.get("a", TEXT, font, 800)
+        cache.get("b", TEXT, font, 800)
+    cache.discard("a")
+    assert len(cache) == 2
+    assert set(cache._widest) == {"b"}
+    cache.discard("desconocida")
+    assert len(cache) == 2
+
+
+def test_released_songs_lose_their_layouts():
+    """Al liberar una canción lejos de la actual también se descartan sus maquetados"""
+    songs = {song_id: Song(id=song_id, title=f"Canción {song_id}", lyrics_with_chords=TEXT)
+             for song_id in range(1, 11)}
+    set_songs = [{'song_id': song_id} for song_id in songs]
+    cache = LayoutCache()
+    font = QFont()
+    released = []
+
+    def release(index):
+        released.append(index)
+        cache.discard(set_songs[index]['song'].id)
+
+    loader = SongLoader(set_songs, songs.get, radius=2, on_release=release)
+    for current in range(len(set_songs)):
+        for index in range(max(0, current - 2), min(len(set_songs), current + 3)):
+            song = loader.song(index)
+            cache.get(song.id, song.lyrics_with_chords, font, 800)
+        loader.retain(current)
+        assert loader.loaded() <= 5
+        assert set(cache._widest) == {config['song'].id for config in set_songs if 'song' in config}
+        assert len(cache) == loader.loaded()
+    # Cada canción se liberó una sola vez (las ya liberadas no se vuelven a avisar)
+    assert sorted(released) == list(range(len(set_songs) - 3))
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"OK  {name}")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""Pruebas del ajuste de línea que mantiene los acordes sobre su sílaba"""
+
+from src.utils.lyrics_wrap import wrap_line, wrap_lyrics_with_sources, wrap_pair
+
+
+def chord_columns(chords: str):
+    """Columna y nombre de cada acorde de una línea"""
+    columns, start = [], None
+    for column, char in enumerate(chords + ' '):
+        if char != ' ' and start is None:
+            start = column
+        elif char == ' ' and start is not None:
+            columns.append((start, chords[start:column]))
+            start = None
+    return columns
+
+
+def test_pair_that_fits_is_left_alone():
+    assert wrap_pair("C     G", "hola que tal", 20) == ["C     G", "hola que tal"]
+    assert wrap_pair("C     G", "hola que tal", 0) == ["C     G", "hola que tal"]
+
+
+def test_chords_stay_over_their_syllables():
+    """Cada acorde queda sobre la misma sílaba después de cortar"""
+    chords = "C        G            Am"
+    lyric = "hola que tal como te va mi amor"
+    pieces = wrap_pair(chords, lyric, 12)
+    assert pieces == ["C        G", "hola que tal", "como te", " Am", "va mi amor"]
+    for chord_piece, lyric_piece in ((pieces[0], pieces[1]), (pieces[3], pieces[4])):
+        for column, chord in chord_columns(chord_piece):
+            original = chords.index(chord)
+            # La sílaba debajo del acorde es la misma que en la línea sin cortar
+            assert lyric_piece[column:column + 2] == lyric[original:original + 2], chord
+
+
+def test_empty_chord_piece_is_omitted():
+    """Si un tramo de letra no tiene acordes encima, no queda una línea de acordes vacía"""
+    assert wrap_pair("           G", "hola que tal como te va", 10) == ["hola que", "  G", "tal como", "te va"]
+
+
+def test_chords_longer_than_the_lyric():
+    """Los acordes que siguen después del final de la letra se cortan entre acordes"""
+    assert wrap_pair("C       G       Am      F", "hola", 10) == ["C       G", "hola", "Am      F"]
+    # Acordes sin letra debajo
+    assert wrap_pair("C       G       Am      F", "", 10) == ["C       G", "Am      F"]
+
+
+def test_word_wider_than_the_width():
+    """Una palabra más ancha que la pantalla se corta igual (no hay espacio donde cortar)"""
+    assert wrap_line("supercalifragilistico es", 8) == ["supercal", "ifragili", "stico es"]
+    assert wrap_pair("C", "supercalifragilistico", 8) == ["C", "supercal", "ifragili", "stico"]
+
+
+def test_sources_point_at_the_first_piece_of_each_line():
+    text = "[Verso]\nC          G\nhola que tal como te va\nsin acordes pero larga de verdad\nfin"
+    lines, starts = wrap_lyrics_with_sources(text, 12)
+    assert lines == ["[Verso]", "C          G", "hola que tal", "como te va", "sin acordes", "pero larga", "de verdad", "fin"]
+    assert starts == [0, 1, 2, 4, 7]
+
+
+def test_sources_with_empty_first_chord_piece():
+    """La letra de un par cuyo primer tramo no tiene acordes empieza en la primera línea del par"""
+    text = "intro\n           G\nhola que tal como te va\nfin"
+    lines, starts = wrap_lyrics_with_sources(text, 10)
+    assert lines == ["intro", "hola que", "  G", "tal como", "te va", "fin"]
+    assert starts == [0, 1, 1, 5]
+    assert lines[starts[2]] == "hola que"
+
+
+def test_sources_with_chords_longer_than_the_lyric():
+    text = "C       G       Am      F\nhola\nchau"
+    lines, starts = wrap_lyrics_with_sources(text, 10)
+    assert lines == ["C       G", "hola", "Am      F", "chau"]
+    assert starts == [0, 1, 3]
+
+
+def test_sources_without_wrapping():
+    text = "C  G\nhola\n\nchau"
+    assert wrap_lyrics_with_sources(text, 40) == (text.split('\n'), [0, 1, 2, 3])
+    assert wrap_lyrics_with_sources(text, 0) == (text.split('\n'), [0, 1, 2, 3])
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"OK  {name}")
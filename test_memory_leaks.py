@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""
+Prueba de fugas: abrir y cerrar cada diálogo y el reproductor muchas veces
+no debe dejar widgets vivos ni hacer crecer la memoria (sin pantalla, plataforma offscreen)
+
+Usa un home temporal para no tocar la base de datos ni la configuración reales.
+"""
+
+import os
+import sys
+import tracemalloc
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QCoreApplication, QEvent
+from PyQt6.QtWidgets import QApplication, QDialog
+
+from src.database.models import Song, Set, SetSong
+from src.ui.main_window import MainWindow
+from src.utils.memory_profiler import MemoryProfiler
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+ROUNDS = 20
+# Crecimiento tolerado de la memoria de Python después de todas las vueltas
+MAX_GROWTH_BYTES = 512 * 1024
+
+
+def flush_deletes():
+    """Procesa los deleteLater pendientes (no hay event loop corriendo)"""
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+    app.processEvents()
+
+
+def make_window() -> MainWindow:
+    window = MainWindow()
+    song_id = window.db.add_song(Song(title="Prueba", artist="Nadie", lyrics_with_chords="[C]Hola [G]mundo\n" * 40))
+    set_id = window.db.add_set(Set(name="Set de prueba"))
+    window.db.add_song_to_set(SetSong(set_id=set_id, song_id=song_id, order=0))
+    window.load_data()
+    window.songs_list.setCurrentRow(0)
+    window.sets_list.setCurrentRow(0)
+    return window
+
+
+def open_everything(window: MainWindow):
+    """Una vuelta: cada diálogo (cancelado) y el reproductor"""
+    window.new_song()
+    window.edit_song()
+    window.preview_song()
+    window.new_set()
+    window.edit_set()
+    window.open_settings()
+    window.open_diagnostics()
+    window.play_set()
+    app.processEvents()
+    window.player_window.close()
+    flush_deletes()
+
+
+def test_dialogs_and_player_do_not_leak(user_settings, monkeypatch):
+    # Home temporal: base de datos, registros y configuración
+    monkeypatch.setenv("HOME", user_settings)
+    monkeypatch.setattr(QDialog, "exec", lambda dialog: QDialog.DialogCode.Rejected)
+    window = None
+    profiler = MemoryProfiler()
+    try:
+        window = make_window()
+        open_everything(window)  # Primera vuelta: cachés e imports perezosos
+        profiler.take_baseline()
+
+        for _ in range(ROUNDS):
+            open_everything(window)
+
+        diff = profiler.compare()
+        assert window.player_window is None
+        assert diff.widget_deltas == {}, diff.report()
+        assert diff.traced_delta < MAX_GROWTH_BYTES, diff.report()
+    finally:
+        profiler.reset()
+        if window is not None:
+            window.db.close()
+            window.deleteLater()
+        flush_deletes()
+
+
+def test_reset_stops_tracing():
+    """Descartar la línea base detiene tracemalloc, salvo que ya estuviera activo antes"""
+    assert not tracemalloc.is_tracing()
+    profiler = MemoryProfiler()
+    profiler.take_baseline()
+    assert tracemalloc.is_tracing() and profiler.has_baseline
+    profiler.reset()
+    assert not tracemalloc.is_tracing() and not profiler.has_baseline
+
+    tracemalloc.start()
+    try:
+        profiler.take_baseline()
+        profiler.reset()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
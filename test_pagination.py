@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""Pruebas de la paginación del modo de páginas"""
+
+from src.utils.chord_transposer import ChordTransposer
+from src.utils.pagination import paginate
+
+
+def stanza(pairs, chords="C     G     Am    F"):
+    """Estrofa de pairs pares acordes/letra"""
+    lines = []
+    for number in range(pairs):
+        lines += [chords, f"letra de la línea {number}"]
+    return lines
+
+
+def pages(lines, starts):
+    return [lines[start:end] for start, end in zip(starts, starts[1:] + [len(lines)])]
+
+
+def assert_valid(lines, starts, lines_per_page):
+    """Cada página entra, no arranca en blanco y no termina con acordes separados de su letra"""
+    assert starts[0] == 0 or not any(line.strip() for line in lines[:starts[0]])
+    assert starts == sorted(set(starts))
+    for page in pages(lines, starts):
+        assert len(page) <= lines_per_page
+        assert page[0].strip()
+        last = [line for line in page if line.strip()][-1]
+        assert not ChordTransposer.is_chord_line(last)
+
+
+def test_breaks_at_stanza_boundaries():
+    lines = stanza(3) + [""] + stanza(3) + [""] + stanza(3)
+    starts = paginate(lines, 10)
+    assert starts == [0, 7, 14]
+    assert_valid(lines, starts, 10)
+
+
+def test_short_stanza_does_not_leave_a_page_half_empty():
+    """Un límite de estrofa antes de la mitad de la página no se usa"""
+    lines = stanza(1) + [""] + stanza(5)
+    starts = paginate(lines, 10)
+    assert starts == [0, 9]  # Sin cortar en la línea 2; la 9 es un acorde y pasa con su letra
+    assert_valid(lines, starts, 10)
+
+
+def test_chord_line_stays_with_its_lyric():
+    """Sin estrofas, con un alto impar, la página se corta antes del acorde y no entre acorde y letra"""
+    lines = stanza(10)
+    for lines_per_page in (3, 5, 7, 9):
+        starts = paginate(lines, lines_per_page)
+        assert all(start % 2 == 0 for start in starts), (lines_per_page, starts)
+        assert_valid(lines, starts, lines_per_page)
+
+
+def test_stanza_taller_than_a_page():
+    """Una estrofa más alta que la página se reparte en varias, siempre avanzando"""
+    lines = stanza(2) + [""] + stanza(13) + [""] + stanza(2)
+    starts = paginate(lines, 9)
+    assert_valid(lines, starts, 9)
+    assert 5 in starts  # La estrofa larga empieza en una página nueva
+    assert len(starts) >= len(lines) // 9
+    # Una página de una sola línea no puede separar nada: se corta igual
+    assert paginate(stanza(2), 1) == [0, 1, 2, 3]
+
+
+def test_latin_chords_and_empty_text():
+    lines = stanza(10, chords="Do    Sol   Lam   Fa")
+    starts = paginate(lines, 5)
+    assert all(start % 2 == 0 for start in starts)
+    assert paginate([], 10) == [0]
+    assert paginate(["", "", ""], 10) == [0]
+    assert paginate(["", "hola"], 10) == [1]
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"OK  {name}")
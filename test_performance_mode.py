@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+"""Pruebas del modo rendimiento: GC congelado y trabajos en segundo plano en pausa"""
+
+import gc
+import os
+import sys
+import time
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QEventLoop
+from PyQt6.QtWidgets import QApplication, QWidget
+
+from src.ui.frame_hud import FrameHud, FrameStats
+from src.ui.key_estimation_task import KeyEstimationTask
+from src.utils.key_detection import CHUNK_SIZE, KeyEstimation, MIN_SONGS_FOR_POOL, estimate_keys
+from src.utils.performance_mode import DEFERRED_GEN2_THRESHOLD, BackgroundTasks, PerformanceMode
+from src.utils.stall_watchdog import StallWatchdog
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+IN_G = "G      D      Em     C\nhola que tal como te va\nG      D      C      G\nadiós"
+
+
+class FakeTask:
+    def __init__(self):
+        self.paused = False
+        self.resumes = 0
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+        self.resumes += 1
+
+
+def test_begin_and_end_pause_and_resume_tasks():
+    tasks = BackgroundTasks()
+    first, second = FakeTask(), FakeTask()
+    tasks.register(first)
+    mode = PerformanceMode(tasks)
+    mode.enabled = True
+
+    mode.begin()
+    assert mode.active and first.paused
+    # Lo que se registra durante la reproducción arranca pausado
+    tasks.register(second)
+    assert second.paused
+    mode.begin()  # Repetido: no hace nada
+
+    mode.end()
+    assert not mode.active
+    assert not first.paused and not second.paused
+    assert first.resumes == 1
+    mode.end()
+    assert first.resumes == 1
+
+    tasks.unregister(first)
+    mode.begin()
+    assert not first.paused and second.paused
+    mode.end()
+
+
+def process_for(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        QApplication.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 10)
+
+
+def test_gc_is_restored_after_end():
+    """El umbral de la generación 2 y el callback se deshacen al terminar; gc.freeze al liberar"""
+    thresholds = gc.get_threshold()
+    frozen = gc.get_freeze_count()
+    callbacks = len(gc.callbacks)
+    mode = PerformanceMode(BackgroundTasks())
+    mode.enabled = True
+
+    mode.begin()
+    try:
+        assert gc.get_freeze_count() > frozen
+        assert gc.get_threshold() == (thresholds[0], thresholds[1], DEFERRED_GEN2_THRESHOLD)
+        assert len(gc.callbacks) == callbacks + 1
+        gc.collect()
+        assert mode.gen2_collections == 1
+    finally:
+        mode.end()
+    assert gc.get_threshold() == thresholds
+    assert len(gc.callbacks) == callbacks
+    # Entre canciones los objetos siguen congelados; release los descongela
+    assert gc.get_freeze_count() > frozen
+    mode.release()
+    assert gc.get_freeze_count() == 0
+    mode.release()
+
+
+def test_full_collection_only_on_first_play():
+    """Pausar y volver a reproducir no repite la recolección completa ni el freeze"""
+    collect, freeze = gc.collect, gc.freeze
+    calls = []
+    gc.collect = lambda *args: calls.append("collect")
+    gc.freeze = lambda: (calls.append("freeze"), freeze())
+    mode = PerformanceMode(BackgroundTasks())
+    mode.enabled = True
+    try:
+        for _ in range(3):
+            mode.begin()
+            mode.begin()
+            mode.end()
+        assert calls == ["collect", "freeze"]
+        mode.release()
+        mode.begin()
+        assert calls == ["collect", "freeze"] * 2
+    finally:
+        gc.collect, gc.freeze = collect, freeze
+        mode.release()
+    assert gc.get_freeze_count() == 0
+
+
+def test_disabled_mode_touches_nothing():
+    tasks = BackgroundTasks()
+    task = FakeTask()
+    tasks.register(task)
+    thresholds = gc.get_threshold()
+    mode = PerformanceMode(tasks)
+    mode.begin()
+    assert not mode.active and not task.paused
+    assert gc.get_threshold() == thresholds and gc.get_freeze_count() == 0
+    mode.end()
+    assert task.resumes == 0
+
+
+def test_watchdog_and_hud_stop_their_timers_while_paused(temp_dir):
+    """El latido de la vigilancia de bloqueos y el refresco del HUD son trabajos pausables"""
+    watchdog = StallWatchdog(threshold_ms=200, directory=temp_dir)
+    parent = QWidget()
+    parent.show()
+    hud = FrameHud(FrameStats(), parent)
+    hud.show()
+    tasks = BackgroundTasks()
+    tasks.register(watchdog)
+    tasks.register(hud)
+    mode = PerformanceMode(tasks)
+    mode.enabled = True
+    watchdog.start()
+    try:
+        assert watchdog.heartbeat.isActive() and hud.timer.isActive()
+        mode.begin()
+        assert watchdog.paused and not watchdog.heartbeat.isActive()
+        assert hud.paused and not hud.timer.isActive()
+        mode.end()
+        assert not watchdog.paused and watchdog.heartbeat.isActive()
+        assert not hud.paused and hud.timer.isActive()
+    finally:
+        mode.end()
+        watchdog.stop()
+        parent.close()
+        parent.deleteLater()
+
+
+def test_key_estimation_waits_for_resume():
+    """Pausada, la estimación no consulta ni avisa (no se guarda ni se recarga) hasta reanudar"""
+    tasks = BackgroundTasks()
+    mode = PerformanceMode(tasks)
+    mode.enabled = True
+    mode.begin()
+    try:
+        task = KeyEstimationTask([(1, IN_G, None, None), (2, "solo letra", None, None)], tasks=tasks)
+        results = []
+        task.finished.connect(results.append)
+        assert task.paused and not task.timer.isActive()
+        process_for(0.3)
+        assert results == []
+    finally:
+        mode.end()
+    assert task.timer.isActive()
+    deadline = time.perf_counter() + 30
+    while not results and time.perf_counter() < deadline:
+        process_for(0.05)
+    assert results == [[(1, "G", results[0][0][2])]]
+    assert not task.timer.isActive()
+    # Terminada, ya no es un trabajo registrado
+    mode.begin()
+    assert not task.paused
+    mode.end()
+    mode.release()
+
+
+def test_paused_estimation_can_be_cancelled():
+    """Cancelar una estimación en pausa la termina (el hilo no queda esperando)"""
+    estimation = KeyEstimation([(1, IN_G, None, None)] * 10)
+    estimation.pause()
+    estimation.cancel()
+    assert isinstance(estimation.result(timeout=10), list)
+
+
+def test_pool_hands_out_chunks_only_while_allowed():
+    """Con el pool, cada lote se reparte recién cuando proceed lo permite"""
+    songs = [(song_id, IN_G, None, None) for song_id in range(max(MIN_SONGS_FOR_POOL, CHUNK_SIZE + 10))]
+    asked = []
+
+    def proceed():
+        asked.append(True)
+        return len(asked) == 1  # Solo el primer lote
+
+    results = estimate_keys(songs, max_workers=1, proceed=proceed)
+    assert len(asked) == 2
+    assert sorted(song_id for song_id, _, _ in results) == list(range(CHUNK_SIZE))
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+"""Pruebas del reproductor en un proceso separado (spawn, sin pantalla, plataforma offscreen)"""
+
+import os
+import sqlite3
+import sys
+import time
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QEventLoop
+from PyQt6.QtWidgets import QApplication
+
+from src.database.models import Set, SetSong, Song
+from src.ui.player_process import PlayerProcess, _SongReader, run_player
+from src.utils.timing_map import TimingMap
+
+FIRST = Song(title="Primera", artist="Prueba", lyrics_with_chords="C  G\nhola que tal\nAm  F\ncomo te va")
+SECOND = Song(title="Segunda", artist="Prueba", lyrics_with_chords="D  A\nchau")
+SCRIPTED_SPEED = 80
+TIMEOUT_S = 30
+
+
+def run_scripted_player(connection):
+    """
+    run_player con un guion: ya mostrada la ventana, verifica que la primera canción
+    llegó desde la base, cambia la velocidad, graba un mapa de tiempos y avanza.
+    El código de salida indica si la canción llegó bien.
+    """
+    from src.ui.player_window import PlayerWindow
+
+    arrived = []
+    show = PlayerWindow.show
+
+    def scripted_show(window):
+        show(window)
+        song = window.songs.song(0)
+        arrived.append((song.title, song.lyrics_with_chords) == (FIRST.title, FIRST.lyrics_with_chords))
+        window.speed_slider.setValue(SCRIPTED_SPEED)
+        window.flush_speed_change()
+        window.start_timing_recording()
+        window.tap_timing()
+        window.tap_timing()
+        window.finish_timing_recording()
+        window.next_song()
+
+    PlayerWindow.show = scripted_show
+    run_player(connection)
+    sys.exit(0 if arrived == [True] else 3)
+
+
+class ScriptedPlayerProcess(PlayerProcess):
+    entry_point = staticmethod(run_scripted_player)
+
+
+app = None
+
+
+def application():
+    """QApplication del proceso de la prueba (no se crea al importar: el hijo importa este módulo)"""
+    global app
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    return app
+
+
+def process_until(condition, timeout=TIMEOUT_S):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("El reproductor no respondió")
+        QApplication.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 20)
+
+
+@pytest.fixture
+def player_set(db, user_settings, monkeypatch):
+    """Set de dos canciones como lo arma play_set; el hijo usa la configuración temporal"""
+    application()
+    monkeypatch.setenv("HOME", user_settings)
+    monkeypatch.setenv("XDG_CONFIG_HOME", user_settings)
+    set_obj = Set(name="Ensayo")
+    set_obj.id = db.add_set(set_obj)
+    song_ids = [db.add_song(FIRST), db.add_song(SECOND)]
+    db.update_set(set_obj, [
+        SetSong(set_id=set_obj.id, song_id=song_id, order=order) for order, song_id in enumerate(song_ids)
+    ])
+    set_songs = [
+        {
+            'song_id': row['song_id'],
+            'title': row['title'],
+            'artist': row['artist'],
+            'scroll_speed': row['scroll_speed'],
+            'transposition': row['transposition'],
+            'set_song_id': row['set_song_id'],
+            'timing_map': TimingMap.decode(row['timing_map'])
+        }
+        for row in db.get_set_song_entries(set_obj.id)
+    ]
+    return set_songs, db.db_path
+
+
+def test_song_reader_is_read_only(db):
+    song_id = db.add_song(FIRST)
+    reader = _SongReader(db.db_path)
+    try:
+        song = reader.get_song(song_id)
+        assert song.title == FIRST.title and song.lyrics_with_chords == FIRST.lyrics_with_chords
+        assert reader.get_song(song_id + 100) is None
+        with pytest.raises(sqlite3.OperationalError):
+            reader.connection.execute("DELETE FROM songs")
+    finally:
+        reader.connection.close()
+
+
+def test_handoff_and_messages(player_set):
+    """El hijo recibe el set por el Pipe, lee la canción y devuelve velocidad, mapa y posición"""
+    set_songs, db_path = player_set
+    player = ScriptedPlayerProcess()
+    speeds, maps, positions, closed = [], [], [], []
+    player.speed_changed.connect(lambda set_song_id, speed: speeds.append((set_song_id, speed)))
+    player.timing_map_recorded.connect(lambda set_song_id, data: maps.append((set_song_id, data)))
+    player.song_changed.connect(positions.append)
+    player.closed.connect(lambda: closed.append(True))
+
+    player.start(set_songs, "Ensayo", db_path)
+    process = player.process
+    try:
+        process_until(lambda: 1 in positions)
+        first_id = set_songs[0]['set_song_id']
+        assert speeds == [(first_id, SCRIPTED_SPEED)]
+        ((set_song_id, data),) = maps
+        assert set_song_id == first_id and len(TimingMap.decode(data)) == 2
+        assert positions[-1] == 1
+        assert player.is_running()
+
+        started = time.perf_counter()
+        player.stop()
+        assert time.perf_counter() - started < 5
+    finally:
+        if process.is_alive():
+            process.kill()
+    assert closed == [True]
+    assert not player.is_running() and player.timer.isActive() is False
+    assert process.exitcode == 0  # La canción llegó desde la base
+
+
+def test_stop_and_poll_after_the_child_exited(player_set):
+    """Si el hijo ya terminó (sin avisar), poll y stop limpian sin colgarse"""
+    set_songs, db_path = player_set
+    for finish in ("poll", "stop"):
+        player = PlayerProcess()
+        closed = []
+        positions = []
+        player.closed.connect(lambda: closed.append(True))
+        player.song_changed.connect(positions.append)
+        player.start(set_songs, "Ensayo", db_path)
+        process = player.process
+        try:
+            process_until(lambda: positions)
+        finally:
+            process.kill()
+            process.join(TIMEOUT_S)
+
+        started = time.perf_counter()
+        getattr(player, finish)()
+        player.stop()  # Ya limpio: no hace nada
+        assert time.perf_counter() - started < 5
+        assert closed == [True], finish
+        assert player.process is None and player.connection is None
+        assert not player.timer.isActive()
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""Pruebas de las estadísticas por sentencia SQL y del registro de consultas lentas"""
+
+import logging
+import os
+import sqlite3
+import sys
+from logging.handlers import RotatingFileHandler
+
+import pytest
+
+from src.database.db_manager import DatabaseManager
+from src.database.query_stats import SLOW_QUERY_LOGGER, QueryStats, StatsConnection, normalize_sql
+
+
+def make_connection(slow_query_ms=float('inf')):
+    """Conexión en memoria con una tabla de 10 filas; las consultas lentas se guardan en una lista"""
+    connection = sqlite3.connect(":memory:", factory=StatsConnection)
+    connection.executescript("CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT)")
+    connection.executemany("INSERT INTO t (name) VALUES (?)", [(f"n{i}",) for i in range(10)])
+    stats = connection.query_stats
+    stats.reset()
+    stats.slow_query_ms = slow_query_ms
+    logged = []
+    stats.log_slow = lambda conn, sql, parameters, elapsed_ms: logged.append(
+        (normalize_sql(sql), parameters, QueryStats.explain(conn, sql, parameters))
+    )
+    return connection, stats, logged
+
+
+def test_normalization_groups_executions():
+    connection, stats, _ = make_connection()
+    connection.execute("SELECT * FROM t WHERE id = ?", (1,)).fetchall()
+    connection.execute("SELECT *\n    FROM t\n    WHERE id = ?", (2,)).fetchall()
+    connection.cursor().execute("  SELECT * FROM t  WHERE id = ? ", (3,)).fetchone()
+    assert list(stats.statements) == ["SELECT * FROM t WHERE id = ?"]
+    statement = stats.statements["SELECT * FROM t WHERE id = ?"]
+    assert statement.count == 3 and statement.rows == 3
+    assert statement.total_ms >= statement.max_ms > 0
+    assert statement.mean_ms == statement.total_ms / 3
+
+
+def test_rows_are_counted_however_they_are_read():
+    connection, stats, _ = make_connection()
+    select = "SELECT id FROM t"
+
+    assert len(connection.execute(select).fetchall()) == 10
+    assert len([row for row in connection.execute(select)]) == 10
+    cursor = connection.execute(select)
+    assert len(cursor.fetchmany(4)) == 4 and cursor.fetchone() is not None
+    assert stats.statements[select].rows == 25
+    assert stats.statements[select].count == 3
+
+    connection.execute("UPDATE t SET name = 'x' WHERE id <= 3")
+    connection.executemany("DELETE FROM t WHERE id = ?", [(9,), (10,)])
+    assert stats.statements["UPDATE t SET name = 'x' WHERE id <= 3"].rows == 3
+    assert stats.statements["DELETE FROM t WHERE id = ?"].rows == 2
+
+    stats.reset()
+    assert stats.statements == {} and stats.slow_count == 0
+
+
+def test_slow_log_covers_unread_and_iterated_queries():
+    """Una lectura lenta se registra aunque no se lean sus filas o se lean iterando, y una sola vez"""
+    connection, stats, logged = make_connection(slow_query_ms=0)
+    connection.execute("SELECT id FROM t WHERE name = ?", ("n1",))  # Nunca se leen las filas
+    for _ in connection.execute("SELECT name FROM t"):
+        pass
+    assert [sql for sql, _, _ in logged] == ["SELECT id FROM t WHERE name = ?", "SELECT name FROM t"]
+    assert logged[0][1] == ("n1",)
+    assert stats.statements["SELECT name FROM t"].max_ms > 0
+
+
+def test_slow_executemany_is_explained_with_its_first_parameters():
+    connection, stats, logged = make_connection(slow_query_ms=0)
+    connection.executemany("UPDATE t SET name = ? WHERE id = ?", ((f"m{i}", i) for i in range(3)))
+    ((sql, parameters, plan),) = logged
+    assert parameters == ("m0", 0)
+    assert "sin plan" not in plan and "t USING INTEGER PRIMARY KEY" in plan
+    assert stats.statements[sql].rows == 2  # La fila 0 no existe
+
+
+def test_fast_queries_are_not_logged():
+    connection, stats, logged = make_connection(slow_query_ms=10_000)
+    connection.execute("SELECT * FROM t").fetchall()
+    assert logged == []
+
+
+def test_slow_log_has_one_handler_for_every_connection(temp_dir, monkeypatch):
+    """Varias bases comparten el archivo de consultas lentas: un solo handler y una línea por consulta"""
+    monkeypatch.setenv("HOME", temp_dir)
+    logger = logging.getLogger(SLOW_QUERY_LOGGER)
+    before = list(logger.handlers)
+    databases = [DatabaseManager(os.path.join(temp_dir, f"db{i}.db")) for i in range(2)]
+    try:
+        for database in databases:
+            database.query_stats.slow_query_ms = 0
+            database.connection.execute("SELECT count(*) FROM songs").fetchall()
+        log_path = databases[0].query_stats.log_path
+        handlers = [handler for handler in logger.handlers
+                    if isinstance(handler, RotatingFileHandler) and handler.baseFilename == log_path]
+        assert len(handlers) == 1
+        handlers[0].flush()
+        with open(log_path, encoding='utf-8') as log:
+            assert log.read().count("SELECT count(*) FROM songs\n") == 2
+    finally:
+        for database in databases:
+            database.close()
+        for handler in logger.handlers:
+            if handler not in before:
+                logger.removeHandler(handler)
+                handler.close()
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
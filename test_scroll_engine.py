@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+"""Pruebas de precisión del motor de scroll (sin pantalla, plataforma offscreen)"""
+
+import math
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QEventLoop, QTimer
+from PyQt6.QtWidgets import QApplication, QScrollBar
+
+from src.ui.scroll_engine import ScrollEngine
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class FakeClock:
+    """Reloj manual en milisegundos"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_scrollbar(maximum=1_000_000):
+    scrollbar = QScrollBar()
+    scrollbar.setRange(0, maximum)
+    return scrollbar
+
+
+def test_irregular_ticks_do_not_drift():
+    """Ticks tardíos o perdidos no deben hacer que el scroll se atrase"""
+    clock = FakeClock()
+    scrollbar = make_scrollbar()
+    engine = ScrollEngine(scrollbar, clock=clock)
+    engine.set_speed(37)
+    engine.start()
+
+    rng = random.Random(1234)
+    # 6 minutos de canción con ticks entre 10 y 250 ms (jitter y ticks perdidos)
+    while clock.now < 360_000:
+        clock.now += rng.uniform(10, 250)
+        engine.tick()
+
+    expected = 37 * clock.now / 1000
+    assert abs(scrollbar.value() - expected) <= 1, (scrollbar.value(), expected)
+
+
+def test_slow_speed_accumulates_sub_pixels():
+    """A 5 px/s con ticks de 16 ms se deben recorrer exactamente 5 px por segundo"""
+    clock = FakeClock()
+    scrollbar = make_scrollbar()
+    engine = ScrollEngine(scrollbar, clock=clock)
+    engine.set_speed(5)
+    engine.start()
+    for _ in range(625):  # 10 segundos
+        clock.now += 16
+        engine.tick()
+    assert scrollbar.value() == 50
+
+
+def test_speed_change_keeps_position_continuous():
+    clock = FakeClock()
+    scrollbar = make_scrollbar()
+    engine = ScrollEngine(scrollbar, clock=clock)
+    engine.set_speed(100)
+    engine.start()
+    clock.now = 2_000
+    engine.tick()
+    engine.set_speed(20)
+    clock.now = 4_000
+    engine.tick()
+    assert scrollbar.value() == 240
+
+
+def test_pause_and_manual_scroll():
+    clock = FakeClock()
+    scrollbar = make_scrollbar()
+    engine = ScrollEngine(scrollbar, clock=clock)
+    engine.set_speed(50)
+    engine.start()
+    clock.now = 1_000
+    engine.tick()
+    engine.stop()
+    clock.now = 60_000  # Tiempo en pausa no cuenta
+    engine.start()
+    clock.now = 61_000
+    engine.tick()
+    assert scrollbar.value() == 100
+
+    scrollbar.setValue(500)  # El usuario mueve la barra
+    clock.now = 62_000
+    engine.tick()
+    clock.now = 63_000
+    engine.tick()
+    assert scrollbar.value() == 550
+
+
+def test_finishes_at_end():
+    clock = FakeClock()
+    scrollbar = make_scrollbar(maximum=100)
+    engine = ScrollEngine(scrollbar, clock=clock)
+    finished = []
+    engine.finished.connect(lambda: finished.append(True))
+    engine.set_speed(50)
+    engine.start()
+    clock.now = 3_000
+    engine.tick()
+    assert scrollbar.value() == 100
+    assert finished and not engine.is_running
+
+
+def test_real_timer_tracks_wall_clock():
+    """Con el event loop real y bloqueos de la UI, la posición sigue al reloj"""
+    scrollbar = make_scrollbar()
+    engine = ScrollEngine(scrollbar)
+    engine.set_speed(100)
+
+    # Bloquear el hilo de la UI de vez en cuando para que los ticks lleguen tarde
+    def stall():
+        time.sleep(0.12)
+
+    stall_timer = QTimer()
+    stall_timer.timeout.connect(stall)
+    stall_timer.start(200)
+
+    loop = QEventLoop()
+    QTimer.singleShot(1500, loop.quit)
+    start = time.perf_counter()
+    engine.start()
+    loop.exec()
+    engine.tick()
+    elapsed = time.perf_counter() - start
+    engine.stop()
+    stall_timer.stop()
+
+    expected = 100 * elapsed
+    assert abs(scrollbar.value() - expected) <= 3, (scrollbar.value(), expected)
+
+
+
+def test_slow_speed_wakes_once_per_pixel():
+    """A baja velocidad el timer debe despertar una vez por píxel, no cada cuadro"""
+    clock = FakeClock()
+    engine = ScrollEngine(make_scrollbar(), clock=clock)
+    engine.set_speed(5)
+    engine.start()
+    assert 195 <= engine.next_interval_ms <= 200
+
+    # Simular 10 segundos respetando los intervalos que programa el motor
+    while clock.now < 10_000:
+        clock.now += engine.next_interval_ms
+        engine.tick()
+    assert engine.total_wakeups <= 52
+    assert engine.wakeups_per_second <= 6
+    engine.stop()
+
+
+def test_fast_speed_is_capped_at_refresh_rate():
+    engine = ScrollEngine(make_scrollbar(), clock=FakeClock())
+    engine.set_speed(200)
+    engine.start()
+    assert engine.next_interval_ms >= engine._refresh_interval_ms()
+    engine.stop()
+
+
+def test_suspends_while_hidden():
+    from PyQt6.QtWidgets import QWidget
+
+    window = QWidget()
+    window.show()
+    clock = FakeClock()
+    scrollbar = make_scrollbar()
+    engine = ScrollEngine(scrollbar, clock=clock)
+    engine.watch_visibility(window)
+    engine.set_speed(100)
+    engine.start()
+
+    window.hide()
+    assert engine.is_suspended and not engine.timer.isActive()
+
+    # Al volver a mostrarse, la posición se pone al día con el tiempo transcurrido
+    clock.now = 3_000
+    window.show()
+    assert not engine.is_suspended and engine.timer.isActive()
+    assert scrollbar.value() == 300
+    engine.stop()
+
+
+def test_counts_late_ticks_as_janks():
+    """Un tick que llega más de un cuadro tarde cuenta como tirón; uno a horario no"""
+    clock = FakeClock()
+    engine = ScrollEngine(make_scrollbar(), clock=clock)
+    engine.set_speed(100)
+    engine.start()
+    clock.now += math.ceil(engine.next_interval_ms)
+    engine.tick()
+    assert engine.janks == 0
+
+    clock.now += math.ceil(engine.next_interval_ms) + 100  # Bloqueo de 100 ms
+    engine.tick()
+    assert engine.janks == 1
+    assert engine.diagnostics()['max_late_ms'] >= 100
+
+    # El primer tick después de pausar no cuenta: no había ninguno programado
+    engine.stop()
+    clock.now += 5_000
+    engine.start()
+    engine.tick()
+    assert engine.janks == 1
+    engine.stop()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"OK  {name}")
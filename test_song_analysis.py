@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+"""Pruebas de la detección de secciones del análisis de canciones"""
+
+from src.utils.song_analysis import analyze_lyrics, decode_sections, detect_sections, pack_line_kinds, Section
+
+
+LYRICS = """[Intro]
+C   G   Am   F
+Verso 1:
+C          G
+hola que tal
+[Am]
+(Coro)
+F     G     C
+como te va"""
+
+
+def test_fallback_matches_stored_sections():
+    """Sin análisis guardado se detectan las mismas secciones que guarda analyze_lyrics"""
+    analysis = analyze_lyrics(LYRICS)
+    expected = [Section("Intro", 0), Section("Verso 1", 2), Section("Coro", 6)]
+    assert decode_sections(analysis.sections) == expected
+    assert detect_sections(LYRICS) == expected
+    assert detect_sections(LYRICS, analysis.use_latin, analysis.line_kinds) == expected
+
+
+def test_stored_line_kinds_are_not_reclassified():
+    """Una línea marcada como de acordes en line_kinds nunca es una sección"""
+    lines = LYRICS.split('\n')
+    flags = [index == 2 for index in range(len(lines))]
+    assert detect_sections(LYRICS, False, pack_line_kinds(flags)) == [Section("Intro", 0), Section("Coro", 6)]
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"OK  {name}")
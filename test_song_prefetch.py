@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""Pruebas de la preparación anticipada: la canción mostrada se pinta antes de preparar las siguientes"""
+
+import os
+import sys
+import time
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QEvent, QEventLoop, QObject
+from PyQt6.QtWidgets import QApplication, QWidget
+
+from src.database.models import Song
+from src.ui.player_window import PlayerWindow
+from src.ui.song_prefetch import SongPrefetcher
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+TEXT = "C  G  Am  F\nhola que tal como te va\n" * 30
+
+
+class PaintLog(QObject):
+    """Anota en una lista cada paint de un widget"""
+
+    def __init__(self, widget, events):
+        super().__init__(widget)
+        self.events = events
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            self.events.append("paint")
+        return False
+
+
+def process_for(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        QApplication.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 10)
+
+
+def log_prepares(prefetcher, events):
+    """Anota cada _prepare_pending antes de ejecutarlo"""
+    prepare = prefetcher._prepare_pending
+
+    def logged():
+        events.append("prepare")
+        prepare()
+
+    prefetcher._prepare_pending = logged
+
+
+def test_next_song_is_painted_before_prefetch(user_settings):
+    """Al avanzar, el primer paint de la nueva canción llega antes de preparar la siguiente"""
+    set_songs = [
+        {'song': Song(id=song_id, title=f"Canción {song_id}", lyrics_with_chords=TEXT),
+         'scroll_speed': 50, 'transposition': 2}
+        for song_id in range(1, 6)
+    ]
+    player = PlayerWindow(None, set_songs, "Set")
+    try:
+        player.show()
+        process_for(0.3)
+        events = []
+        log_prepares(player.prefetcher, events)
+        PaintLog(player.lyrics_display.viewport(), events)
+
+        player.next_song()
+        process_for(0.3)
+        assert events and events[0] == "paint", events
+        assert "prepare" in events
+        # La siguiente quedó maquetada con la fuente y el ancho actuales
+        revision = player.song_revision(player.current_index + 1)
+        assert any(key[0] == revision for key in player.layout_cache._layouts)
+    finally:
+        player.close()
+        player.deleteLater()
+        process_for(0.05)
+
+
+def test_hidden_viewport_defers_prefetch():
+    """Si la vista no se pinta (ventana oculta), no se prepara nada hasta que se muestre"""
+    viewport = QWidget()
+    events = []
+    prefetcher = SongPrefetcher(viewport, lambda index: TEXT, lambda index: index, viewport=viewport)
+    log_prepares(prefetcher, events)
+    PaintLog(viewport, events)
+    prefetcher.configure(viewport.font(), 400, 300)
+    try:
+        prefetcher.schedule(0, 3)
+        process_for(0.1)
+        assert events == [] and not prefetcher.idle
+        prefetcher.pause()
+        prefetcher.resume()
+        process_for(0.1)
+        assert events == []
+
+        viewport.show()
+        process_for(0.2)
+        assert events[0] == "paint"
+        assert events.count("prepare") == 2
+        assert len(prefetcher.cache) == 2 and prefetcher.idle
+    finally:
+        viewport.close()
+        viewport.deleteLater()
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
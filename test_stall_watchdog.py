@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""Pruebas de la vigilancia de bloqueos del event loop (sin pantalla, plataforma offscreen)"""
+
+import os
+import sys
+import time
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QEventLoop
+from PyQt6.QtWidgets import QApplication
+
+from src.utils.settings import Settings
+from src.utils.stall_watchdog import StallWatchdog
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+THRESHOLD_MS = 150
+BLOCK_S = 0.6
+
+
+def process_for(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        QApplication.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 10)
+
+
+def block_event_loop():
+    """Bloquea el hilo de la interfaz bastante más que el umbral"""
+    time.sleep(BLOCK_S)
+
+
+def test_stall_is_recorded_with_its_call_site(temp_dir):
+    watchdog = StallWatchdog(threshold_ms=THRESHOLD_MS, directory=temp_dir)
+    watchdog.start()
+    try:
+        process_for(0.3)
+        assert watchdog.stall_count == 0
+
+        block_event_loop()
+        # El bloqueo se registra cuando el event loop vuelve a latir
+        deadline = time.perf_counter() + 5
+        while watchdog.stall_count == 0 and time.perf_counter() < deadline:
+            process_for(0.05)
+        assert watchdog.stall_count == 1
+    finally:
+        watchdog.stop()
+
+    sites = StallWatchdog.load_sites(watchdog.sites_path)
+    (site, entry), = sites.items()
+    assert site.endswith("in block_event_loop"), site
+    assert entry['count'] == 1
+    assert THRESHOLD_MS < entry['max_ms'] <= BLOCK_S * 1000 + 100
+    assert "block_event_loop" in entry['last_stack']
+    with open(os.path.join(temp_dir, "stalls.log"), encoding='utf-8') as f:
+        assert "block_event_loop" in f.read()
+
+
+def test_watchdog_is_off_by_default(user_settings):
+    """Sin configurar, la vigilancia no arranca (se activa desde Configuración > Diagnóstico)"""
+    assert Settings().get_stall_threshold_ms() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""Pruebas de los mapas de tiempos: codificación, línea de tiempo e invalidación al editar la letra"""
+
+import random
+import sys
+
+import pytest
+
+from src.database.models import Set, SetSong, Song
+from src.utils.timing_map import FORMAT_VERSION, PositionTimeline, TimingMap
+
+
+def test_encode_decode_round_trip():
+    """Deltas de tiempo grandes y saltos de línea hacia atrás sobreviven a la codificación"""
+    rng = random.Random(7)
+    for _ in range(200):
+        timing_map = TimingMap()
+        time_ms = 0
+        for _ in range(rng.randint(0, 60)):
+            time_ms += rng.choice((1, 127, 128, 16_383, 16_384, rng.randint(1, 10_000_000)))
+            timing_map.add(time_ms, rng.randint(0, 5_000))
+        decoded = TimingMap.decode(timing_map.encode())
+        assert decoded == timing_map
+
+    timing_map = TimingMap()
+    timing_map.add(500, 10)
+    timing_map.add(1_000, 2)
+    timing_map.add(1_000, 0)  # Tiempo repetido: se corre 1 ms para mantenerlos crecientes
+    assert timing_map.times_ms == [500, 1_000, 1_001]
+    assert TimingMap.decode(timing_map.encode()).lines == [10, 2, 0]
+
+
+def test_decode_rejects_invalid_data():
+    assert TimingMap.decode(None) is None
+    assert TimingMap.decode(b"") is None
+    assert TimingMap.decode(bytes([FORMAT_VERSION + 1, 0])) is None
+    encoded = TimingMap([100, 200_000], [1, 3]).encode()
+    assert TimingMap.decode(encoded[:-1]) is None  # Truncado
+    assert TimingMap.decode(bytes([FORMAT_VERSION, 0])) == TimingMap()
+
+
+def test_position_timeline():
+    """Interpolación entre marcas, la cola a velocidad constante y la inversa"""
+    timeline = PositionTimeline([1_000, 3_000, 3_000, 4_000, 6_000], [0, 200, 999, 200, 400])
+    # El tiempo repetido se ignora y la posición que vuelve atrás se aplana
+    assert timeline.times == [0.0, 1_000.0, 3_000.0, 4_000.0, 6_000.0]
+    assert timeline.positions == [0.0, 0.0, 200.0, 200.0, 400.0]
+    assert timeline.end_ms == 6_000
+
+    assert timeline.position_at(500) == 0
+    assert timeline.position_at(2_000) == 100
+    assert timeline.position_at(3_500) == 200
+    assert timeline.position_at(7_000, tail_speed=50) == 450
+
+    assert timeline.speed_at(2_000) == 100
+    assert timeline.speed_at(3_500) == 0
+    assert timeline.speed_at(9_000, tail_speed=50) == 50
+
+    assert timeline.next_change_ms(2_000) == 3_000
+    assert timeline.next_change_ms(6_000) is None
+
+    assert timeline.time_at(0) == 0
+    assert timeline.time_at(100) == 2_000
+    assert timeline.time_at(200) == 3_000  # El primer instante en que se llega
+    assert timeline.time_at(450, tail_speed=50) == 7_000
+    for time_ms in range(0, 6_000, 250):
+        position = timeline.position_at(time_ms)
+        assert timeline.position_at(timeline.time_at(position)) == position
+
+
+def test_editing_lyrics_clears_timing_maps(db):
+    """Los mapas se borran al cambiar la letra, no al cambiar otros datos de la canción"""
+    song_id = db.add_song(Song(title="Uno", artist="Prueba", lyrics_with_chords="C  G\nhola\nF  C\nchau"))
+    other_id = db.add_song(Song(title="Dos", artist="Prueba", lyrics_with_chords="D\nhola"))
+    set_obj = Set(name="Ensayo")
+    set_obj.id = db.add_set(set_obj)
+    encoded = TimingMap([0, 1_500], [0, 2]).encode()
+    db.update_set(set_obj, [
+        SetSong(set_id=set_obj.id, song_id=song_id, order=0, timing_map=encoded),
+        SetSong(set_id=set_obj.id, song_id=other_id, order=1, timing_map=encoded),
+    ])
+
+    def stored_maps():
+        return [row['timing_map'] for row in db.get_set_song_entries(set_obj.id)]
+
+    song = db.get_song(song_id)
+    song.title = "Uno (en vivo)"
+    song.bpm = 90
+    db.update_song(song)
+    assert stored_maps() == [encoded, encoded]
+
+    song.lyrics_with_chords += "\nG\notra línea"
+    db.update_song(song)
+    assert stored_maps() == [None, encoded]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
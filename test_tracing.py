@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+"""Pruebas de las trazas de la base de datos (en un proceso aparte, con GIMMELETTER_TRACE)"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SONG_COUNT = 30
+
+# Abre una base, agrega canciones y las lista; al salir se escribe la traza
+SCRIPT = f"""
+import sys
+from src.database.db_manager import DatabaseManager
+from src.database.models import Song
+
+db = DatabaseManager(sys.argv[1])
+for number in range({SONG_COUNT}):
+    db.add_song(Song(title=f"Canción {{number}}", artist="Prueba", lyrics_with_chords="C  G\\\\nhola"))
+assert len(db.get_all_songs()) > {SONG_COUNT}
+db.close()
+"""
+
+
+def test_database_spans_are_per_query_not_per_row(temp_dir):
+    trace_path = os.path.join(temp_dir, "trace.json")
+    environment = dict(os.environ, GIMMELETTER_TRACE=trace_path, HOME=temp_dir)
+    subprocess.run([sys.executable, "-c", SCRIPT, os.path.join(temp_dir, "test.db")],
+                   cwd=ROOT, env=environment, check=True, timeout=60)
+
+    with open(trace_path, encoding='utf-8') as f:
+        events = json.load(f)['traceEvents']
+    names = [event['name'] for event in events if event.get('cat') == 'db']
+    assert names.count("DatabaseManager.add_song") == SONG_COUNT + 1  # Más la canción de ejemplo
+    assert names.count("DatabaseManager.get_all_songs") == 1
+    assert "DatabaseManager.song_from_row" not in names
+    # Los métodos privados tampoco se trazan
+    assert not any(name.startswith("DatabaseManager._") and name != "DatabaseManager.__init__" for name in names)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))